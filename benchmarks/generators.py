@@ -0,0 +1,192 @@
+"""Throughput and peak memory of every signal and noise generator.
+
+Every generator is sampled on regular and irregular grids from TimeSampler
+with sizes from 10^3 to 10^7 points, through three paths:
+
+* `vectorized`: a single sample_vectorized call,
+* `next`: one sample_next call per point, as in the iterative loop of TimeSeries,
+* `timeseries`: TimeSeries.sample (MultiChannelTimeSeries for multichannel
+  generators), which picks the path itself; the chosen plan is recorded.
+
+Throughput is the number of points divided by the fastest of --repeat runs
+on fresh generators; peak memory is measured with tracemalloc in a separate
+run, so its overhead does not affect the timings. Generators with expensive
+paths are capped (see CASES and --max-next-points); cases above a cap, and
+paths a generator does not support, are skipped.
+
+Results can be written to JSON with --json, together with the versions of
+Python, numpy and scipy. Passing an earlier file with --compare reports the
+cases that became slower by more than --tolerance, e.g. after an upgrade,
+and exits with status 1 if there are any.
+
+Usage: PYTHONPATH=. python benchmarks/generators.py [--sizes N ...] [--generators NAME ...]
+                                                    [--json FILE] [--compare FILE]
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import scipy
+import timesynth as ts
+
+STOP_TIME = 100.
+GRIDS = ("regular", "irregular")
+PATHS = ("vectorized", "next", "timeseries")
+
+# name: (factory, maximum number of points, regular grids only, multichannel)
+CASES = {
+    "Sinusoidal": (lambda: ts.signals.Sinusoidal(frequency=0.25), None, False, False),
+    "PseudoPeriodic": (lambda: ts.signals.PseudoPeriodic(frequency=2., freqSD=0.01, ampSD=0.5), None, False, False),
+    "AutoRegressive": (lambda: ts.signals.AutoRegressive(ar_param=[1.5, -0.75]), None, True, False),
+    "CAR": (lambda: ts.signals.CAR(ar_param=0.9, sigma=0.01), None, False, False),
+    "NARMA": (lambda: ts.signals.NARMA(order=10), None, True, False),
+    "GaussianProcess[dense]": (lambda: ts.signals.GaussianProcess(kernel="SE", cache_size=0), 4000, False, False),
+    "GaussianProcess[state_space]": (lambda: ts.signals.GaussianProcess(kernel="Matern", nu=3./2,
+                                                                        method="state_space"), None, False, False),
+    "GaussianProcess[rff]": (lambda: ts.signals.GaussianProcess(kernel="SE", method="rff"), 10**5, False, False),
+    "MackeyGlass": (lambda: ts.signals.MackeyGlass(), 10**6, False, False),
+    "Lorenz": (lambda: ts.signals.Lorenz(), 10**6, False, False),
+    "Rossler": (lambda: ts.signals.Rossler(), 10**6, False, False),
+    "VanDerPol": (lambda: ts.signals.VanDerPol(), 10**6, False, False),
+    "VectorAutoRegressive": (lambda: ts.signals.VectorAutoRegressive([[0.5, 0.1], [0., 0.5]]), None, True, True),
+    "Constant": (lambda: ts.signals.Constant(1.), None, False, False),
+    "Sum": (lambda: ts.signals.Sum(ts.signals.Sinusoidal(), ts.signals.Sinusoidal(frequency=3.),
+                                   coefficients=(1., 0.5)), None, False, False),
+    "Product": (lambda: ts.signals.Product(ts.signals.Sinusoidal(), ts.signals.Sinusoidal(frequency=0.1)),
+                None, False, False),
+    "TimeWarp": (lambda: ts.signals.TimeWarp(ts.signals.Sinusoidal(), np.sqrt), None, False, False),
+    "Piecewise": (lambda: ts.signals.Piecewise([ts.signals.Sinusoidal(), ts.signals.Sinusoidal(frequency=3.)],
+                                               [STOP_TIME / 2]), None, False, False),
+    "GaussianNoise": (lambda: ts.noise.GaussianNoise(std=0.3), None, False, False),
+    "RedNoise": (lambda: ts.noise.RedNoise(std=0.3, tau=0.8), None, False, False),
+    "CorrelatedGaussianNoise": (lambda: ts.noise.CorrelatedGaussianNoise([[1., 0.5], [0.5, 1.]]),
+                                None, False, True),
+}
+
+
+def make_grid(grid, num_points, seed=0):
+    np.random.seed(seed)
+    time_sampler = ts.TimeSampler(stop_time=STOP_TIME)
+    if grid == "regular":
+        return time_sampler.sample_regular_time(num_points=num_points)
+    return time_sampler.sample_irregular_time(num_points=2 * num_points, keep_percentage=50)
+
+
+def sample_next(generator, time_vector):
+    return [generator.sample_next(t, None, None) for t in time_vector]
+
+
+def sample_timeseries(generator, time_vector, multichannel):
+    series_class = ts.MultiChannelTimeSeries if multichannel else ts.TimeSeries
+    if isinstance(generator, ts.noise.base_noise.BaseNoise):
+        timeseries = series_class(ts.signals.Constant(0.), generator)
+    else:
+        timeseries = series_class(generator)
+    timeseries.sample(time_vector)
+    return timeseries.execution_plan()
+
+
+def measure(function, factory, time_vector, repeat):
+    """Fastest wall time of function(generator, time_vector) over fresh generators, and its peak memory."""
+    times = []
+    for _ in range(repeat):
+        generator = factory()
+        start = time.perf_counter()
+        result = function(generator, time_vector)
+        times.append(time.perf_counter() - start)
+        del result
+
+    generator = factory()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    result = function(generator, time_vector)
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return min(times), peak, result
+
+
+def run(sizes, names, paths, grids, repeat=3, max_next_points=10**5):
+    results = []
+    for name in names:
+        factory, max_points, regular_only, multichannel = CASES[name]
+        functions = {"vectorized": lambda generator, time_vector: generator.sample_vectorized(time_vector),
+                     "next": sample_next,
+                     "timeseries": lambda generator, time_vector: sample_timeseries(generator, time_vector,
+                                                                                    multichannel)}
+        # Warm-up, e.g. for the compilation of MackeyGlass
+        factory().sample_vectorized(make_grid("regular", 100))
+        for grid in grids:
+            if regular_only and grid == "irregular":
+                continue
+            for num_points in sizes:
+                if max_points is not None and num_points > max_points:
+                    continue
+                time_vector = make_grid(grid, num_points)
+                for path in paths:
+                    if path == "next" and num_points > max_next_points:
+                        continue
+                    try:
+                        elapsed, peak, result = measure(functions[path], factory, time_vector, repeat)
+                    except NotImplementedError:
+                        continue
+                    results.append({"generator": name, "path": path, "grid": grid,
+                                    "num_points": len(time_vector), "time": elapsed,
+                                    "points_per_second": len(time_vector) / elapsed, "peak_memory": peak,
+                                    "plan": result if path == "timeseries" else None})
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Cases of results whose throughput dropped below baseline / tolerance."""
+    key = lambda result: (result["generator"], result["path"], result["grid"], result["num_points"])
+    previous = {key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        reference = previous.get(key(result))
+        if reference is not None and result["points_per_second"] * tolerance < reference["points_per_second"]:
+            regressions.append((result, reference))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10**3, 10**4, 10**5, 10**6, 10**7])
+    parser.add_argument("--generators", nargs="+", default=list(CASES), choices=list(CASES), metavar="NAME")
+    parser.add_argument("--paths", nargs="+", default=list(PATHS), choices=PATHS)
+    parser.add_argument("--grids", nargs="+", default=list(GRIDS), choices=GRIDS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-next-points", type=int, default=10**5,
+                        help="largest grid for the sample_next path")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="report regressions against results in this file")
+    parser.add_argument("--tolerance", type=float, default=1.25,
+                        help="slowdown factor reported as a regression")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.generators, args.paths, args.grids, args.repeat, args.max_next_points)
+    print("{:<30}{:<12}{:<11}{:>10}{:>14}{:>14}".format("generator", "path", "grid", "points", "points/s",
+                                                        "peak [MiB]"))
+    for result in results:
+        print("{generator:<30}{path:<12}{grid:<11}{num_points:>10}{points_per_second:>14.4g}".format(**result) +
+              "{:>14.2f}".format(result["peak_memory"] / 2**20))
+    if args.json:
+        metadata = {"python": platform.python_version(), "numpy": np.__version__, "scipy": scipy.__version__,
+                    "platform": platform.platform()}
+        with open(args.json, "w") as f:
+            json.dump({"metadata": metadata, "results": results}, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f)["results"], args.tolerance)
+        for result, reference in regressions:
+            print("Regression: {generator} {path} {grid} {num_points}: ".format(**result) +
+                  "{:.4g} -> {:.4g} points/s".format(reference["points_per_second"], result["points_per_second"]))
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Accuracy and speed of the approximate GaussianProcess samplers.
+
+Reports, for every kernel and number of components, the relative Frobenius
+error of the covariance implied by the `rff` and `nystrom` methods against the
+dense covariance, and the time per draw compared to the dense sampler.
+
+Usage: PYTHONPATH=. python benchmarks/gp_approximation.py [--num-points N] [--json FILE]
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+import timesynth as ts
+
+
+def run(num_points, components, kernels, seed=0):
+    np.random.seed(seed)
+    time_sampler = ts.TimeSampler(stop_time=num_points / 20.)
+    time_vector = time_sampler.sample_irregular_time(num_points=2 * num_points, keep_percentage=50)
+    results = []
+    for kernel in kernels:
+        dense = ts.signals.GaussianProcess(kernel=kernel, nu=3./2, cache_size=0)
+        start = time.perf_counter()
+        dense.sample_vectorized(time_vector)
+        dense_time = time.perf_counter() - start
+        for method in ("rff", "nystrom"):
+            for n_components in components:
+                gp = ts.signals.GaussianProcess(kernel=kernel, nu=3./2, method=method,
+                                                n_components=n_components, cache_size=0)
+                start = time.perf_counter()
+                gp.sample_vectorized(time_vector)
+                elapsed = time.perf_counter() - start
+                results.append({"kernel": kernel, "method": method, "n_components": n_components,
+                                "num_points": len(time_vector), "error": gp.approximation_error(time_vector),
+                                "time": elapsed, "dense_time": dense_time})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--num-points", type=int, default=2000)
+    parser.add_argument("--components", type=int, nargs="+", default=[25, 100, 400])
+    parser.add_argument("--kernels", nargs="+", default=["SE", "RQ", "Matern", "Exponential"])
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    results = run(args.num_points, args.components, args.kernels)
+    print("{:<12}{:<9}{:>6}{:>12}{:>12}{:>12}".format("kernel", "method", "M", "rel. error", "time [s]", "dense [s]"))
+    for result in results:
+        print("{kernel:<12}{method:<9}{n_components:>6}{error:>12.4f}{time:>12.4f}{dense_time:>12.4f}".format(**result))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
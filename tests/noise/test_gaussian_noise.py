@@ -15,3 +15,12 @@ def run_test():
 def test_gaussian_noise():
     wnoise_vec, wnoise_value = run_test()
     assert len(wnoise_vec) == 250
+
+
+def test_correlated_gaussian_noise():
+    time_sampler = ts.TimeSampler(stop_time=20)
+    regular_time_samples = time_sampler.sample_regular_time(num_points=50000)
+    covariance = [[1., 0.8, 0.], [0.8, 1., 0.], [0., 0., 0.25]]
+    noise = ts.noise.CorrelatedGaussianNoise(covariance, random_state=0).sample_vectorized(regular_time_samples)
+    assert noise.shape == (50000, 3)
+    assert abs(noise.T @ noise / 50000 - covariance).max() < 0.05
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+import timesynth as ts
+
+
+def run_test():
+    time_sampler = ts.TimeSampler(stop_time=20)
+    irregular_time_samples = time_sampler.sample_irregular_time(num_points=500, keep_percentage=50)
+
+    np.random.seed(0)
+    red_noise = ts.noise.RedNoise(std=0.3, tau=0.5)
+    iterative = np.hstack([red_noise.sample_next(t, None, None) for t in irregular_time_samples])
+
+    np.random.seed(0)
+    red_noise = ts.noise.RedNoise(std=0.3, tau=0.5)
+    vectorized = np.concatenate((red_noise.sample_vectorized(irregular_time_samples[:100]),
+                                 red_noise.sample_vectorized(irregular_time_samples[100:])))
+    return iterative, vectorized
+
+
+def test_red_noise():
+    iterative, vectorized = run_test()
+    assert len(vectorized) == 250
+    np.testing.assert_allclose(vectorized, iterative)
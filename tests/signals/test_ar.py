@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+import timesynth as ts
+
+
+def run_test():
+    time_sampler = ts.TimeSampler(stop_time=20)
+    regular_time_samples = time_sampler.sample_regular_time(num_points=500)
+
+    np.random.seed(0)
+    ar_iterative = ts.signals.AutoRegressive(ar_param=[0.5, -0.2], sigma=0.3)
+    iterative = np.array([ar_iterative.sample_next(t, None, None) for t in regular_time_samples]).ravel()
+
+    np.random.seed(0)
+    ar_vectorized = ts.signals.AutoRegressive(ar_param=[0.5, -0.2], sigma=0.3)
+    vectorized = np.concatenate((ar_vectorized.sample_vectorized(regular_time_samples[:200]),
+                                 ar_vectorized.sample_vectorized(regular_time_samples[200:])))
+    return iterative, vectorized
+
+
+def test_ar():
+    iterative, vectorized = run_test()
+    assert len(vectorized) == 500
+    np.testing.assert_allclose(vectorized, iterative)
+
+
+def test_ar_array_parameters():
+    time_sampler = ts.TimeSampler(stop_time=20)
+    regular_time_samples = time_sampler.sample_regular_time(num_points=500)
+    ar_param = [0.5, -0.2]
+
+    np.random.seed(0)
+    ar_channels = ts.signals.AutoRegressive(ar_param=[ar_param], sigma=[0.3])
+    channels = np.concatenate((ar_channels.sample_vectorized(regular_time_samples[:200]),
+                               ar_channels.sample_vectorized(regular_time_samples[200:])))
+    np.random.seed(0)
+    single = ts.signals.AutoRegressive(ar_param=ar_param, sigma=0.3).sample_vectorized(regular_time_samples)
+
+    assert ar_param == [0.5, -0.2]
+    assert channels.shape == (500, 1)
+    np.testing.assert_allclose(channels[:, 0], single)
+
+
+def test_ar_array_parameters_groups():
+    ar_param = np.array([[0.5, -0.2], [0.1, 0.3], [0.5, -0.2]])
+    ar_channels = ts.signals.AutoRegressive(ar_param=ar_param, sigma=0.3, start_value=[1., 2.], random_state=0)
+    channels = np.concatenate((ar_channels.sample_vectorized(np.arange(1.)),
+                               ar_channels.sample_vectorized(np.arange(1., 300.))))
+
+    noise = np.random.default_rng(0).normal(scale=0.3, size=(300, 3))
+    reference = np.zeros((302, 3))
+    reference[:2] = [[1.], [2.]]
+    for t in range(300):
+        reference[t + 2] = ar_param[:, 0] * reference[t + 1] + ar_param[:, 1] * reference[t] + noise[t]
+    np.testing.assert_allclose(channels, reference[2:])
+    assert ts.signals.AutoRegressive(ar_param=ar_param).sample_batch(np.arange(50.), 4).shape == (4, 50, 3)
+
+
+def test_ar_state_copied():
+    ar_param = np.array([[0.5, -0.2], [0.1, 0.3]])
+    ar_channels = ts.signals.AutoRegressive(ar_param=ar_param, random_state=0)
+    reference = ts.signals.AutoRegressive(ar_param=ar_param, random_state=0)
+    first = ar_channels.sample_vectorized(np.arange(50.))
+    reference.sample_vectorized(np.arange(50.))
+    # Changing the samples in place leaves the lags unchanged
+    first *= 10.
+    np.testing.assert_array_equal(ar_channels.sample_vectorized(np.arange(50.)),
+                                  reference.sample_vectorized(np.arange(50.)))
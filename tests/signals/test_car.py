@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+import timesynth as ts
+
+
+def run_test():
+    time_sampler = ts.TimeSampler(stop_time=20)
+    irregular_time_samples = time_sampler.sample_irregular_time(num_points=500, keep_percentage=50)
+
+    np.random.seed(0)
+    car_iterative = ts.signals.CAR(ar_param=0.9, sigma=0.1)
+    iterative = np.hstack([car_iterative.sample_next(t, None, None) for t in irregular_time_samples])
+
+    np.random.seed(0)
+    car_vectorized = ts.signals.CAR(ar_param=0.9, sigma=0.1)
+    vectorized = np.concatenate((car_vectorized.sample_vectorized(irregular_time_samples[:100]),
+                                 car_vectorized.sample_vectorized(irregular_time_samples[100:])))
+    return iterative, vectorized
+
+
+def test_car():
+    iterative, vectorized = run_test()
+    assert len(vectorized) == 250
+    np.testing.assert_allclose(vectorized, iterative)
+
+
+def test_car_state_copied():
+    time_vector = np.linspace(0, 10, 100)
+    car = ts.signals.CAR(ar_param=[0.9, 0.5], random_state=0)
+    reference = ts.signals.CAR(ar_param=[0.9, 0.5], random_state=0)
+    first = car.sample_vectorized(time_vector[:50])
+    reference.sample_vectorized(time_vector[:50])
+    # Changing the samples in place leaves the last values of the channels unchanged
+    first -= first.mean(axis=0)
+    np.testing.assert_array_equal(car.sample_vectorized(time_vector[50:]),
+                                  reference.sample_vectorized(time_vector[50:]))
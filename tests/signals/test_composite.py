@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+import timesynth as ts
+
+
+def run_test():
+    time_sampler = ts.TimeSampler(stop_time=10)
+    regular_time_samples = time_sampler.sample_regular_time(num_points=1001)
+    seasonality = ts.signals.Sinusoidal(frequency=0.5)
+    modulation = ts.signals.Sinusoidal(frequency=2., amplitude=0.3)
+    expression = (ts.signals.Constant(1.) + 2 * seasonality + modulation * seasonality - 0.5 +
+                  ts.signals.CAR(ar_param=0.9, random_state=0).time_warp(scale=2.))
+    composite = expression.sample_vectorized(regular_time_samples)
+
+    reference = (1. + 2 * seasonality.sample_vectorized(regular_time_samples) +
+                 modulation.sample_vectorized(regular_time_samples) * seasonality.sample_vectorized(regular_time_samples)
+                 - 0.5 + ts.signals.CAR(ar_param=0.9, random_state=0).sample_vectorized(2 * regular_time_samples))
+    return regular_time_samples, expression, composite, reference
+
+
+def test_composite():
+    regular_time_samples, expression, composite, reference = run_test()
+    assert isinstance(expression, ts.signals.Sum)
+    assert expression.stateful and expression.vectorizable
+    np.testing.assert_allclose(composite, reference)
+
+    # Shared subexpressions are sampled once
+    noise = ts.noise.GaussianNoise(random_state=1)
+    shared = (noise + noise * 0.5).sample_vectorized(regular_time_samples)
+    np.testing.assert_allclose(shared, 1.5 * ts.noise.GaussianNoise(random_state=1).sample_vectorized(regular_time_samples))
+
+    # Switching only samples each signal on its own segment
+    switched = ts.signals.Sinusoidal().switch(ts.signals.Constant(3.), 5.).sample_vectorized(regular_time_samples)
+    assert (switched[regular_time_samples >= 5] == 3.).all()
+    np.testing.assert_allclose(switched[regular_time_samples < 5], np.sin(2 * np.pi * regular_time_samples[regular_time_samples < 5]))
+
+    batch = (ts.signals.Sinusoidal() - ts.noise.GaussianNoise()).sample_batch(regular_time_samples, 3)
+    assert batch.shape == (3, 1001)
+    assert not np.allclose(batch[0], batch[1])
+    timeseries = ts.TimeSeries(ts.signals.Sinusoidal() * ts.signals.AutoRegressive(ar_param=[0.5]))
+    assert timeseries.execution_plan()['signal'] == 'chunked'
+    with pytest.raises(ValueError):
+        ts.signals.Piecewise([ts.signals.Sinusoidal()], [1.])
+
+
+def test_composite_random_state():
+    time_sampler = ts.TimeSampler(stop_time=20)
+    regular_time_samples = time_sampler.sample_regular_time(num_points=200)
+    samples = []
+    for seed in (0, 1):
+        np.random.seed(seed)
+        expression = ts.signals.CAR(ar_param=0.9) * ts.signals.Sinusoidal() + ts.noise.GaussianNoise(std=0.3)
+        samples.append(ts.TimeSeries(expression, random_state=0).sample(regular_time_samples)[0])
+    np.testing.assert_allclose(samples[0], samples[1])
@@ -1,5 +1,7 @@
+import numpy as np
 import pytest
 import timesynth as ts
+from timesynth.signals import dde as dde_module
 
 
 def run_test():
@@ -14,3 +16,45 @@ def run_test():
 def test_dde():
     samples, single_sample = run_test()
     assert len(samples) == 250
+
+
+def test_dde_cache():
+    time_sampler = ts.TimeSampler(stop_time=20)
+    regular_time_samples = time_sampler.sample_regular_time(num_points=100)
+    ts.signals.MackeyGlass.clear_cache()
+    dde = ts.signals.MackeyGlass(tau=20.)
+    other = ts.signals.MackeyGlass(beta=0.25)
+    state = dde.get_state()
+    cached = ts.signals.MackeyGlass(tau=20.)
+    restored = ts.signals.MackeyGlass(tau=20., state=state)
+
+    # Interleaved integration of instances with integrators from the same compiled module
+    samples = dde.sample_vectorized(regular_time_samples)
+    other.sample_vectorized(regular_time_samples)
+    assert (cached.sample_vectorized(regular_time_samples) == samples).all()
+    assert (restored.sample_vectorized(regular_time_samples) == samples).all()
+
+
+def test_dde_python_integrator(monkeypatch):
+    time_sampler = ts.TimeSampler(stop_time=20)
+    regular_time_samples = time_sampler.sample_regular_time(num_points=100)
+    compiled = ts.signals.MackeyGlass(tau=18.).sample_vectorized(regular_time_samples)
+    # Without a compiled module, every instance lambdifies its own integrator
+    monkeypatch.setattr(dde_module, '_compiled_module', False)
+    monkeypatch.setattr(dde_module, '_MAX_BURN_IN_STATES', 2)
+    ts.signals.MackeyGlass.clear_cache()
+    python = ts.signals.MackeyGlass(tau=18.)
+    ts.signals.MackeyGlass(tau=19.)
+    ts.signals.MackeyGlass(tau=20.)
+    np.testing.assert_allclose(python.sample_vectorized(regular_time_samples), compiled)
+    assert len(dde_module._burn_in_states) == 2
+
+
+def test_dde_dense_output():
+    time_sampler = ts.TimeSampler(stop_time=100)
+    irregular_time_samples = time_sampler.sample_irregular_time(num_points=500, keep_percentage=50)
+    stepwise = ts.signals.MackeyGlass(dense_output=False).sample_vectorized(irregular_time_samples)
+    dde = ts.signals.MackeyGlass()
+    dense = np.concatenate((dde.sample_vectorized(irregular_time_samples[:100]),
+                            dde.sample_vectorized(irregular_time_samples[100:])))
+    np.testing.assert_allclose(dense, stepwise)
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+import scipy.linalg
+import timesynth as ts
+
+
+KERNELS = ["Constant", "Exponential", "SE", "RQ", "Linear", "Matern", "Periodic"]
+
+
+def run_test(kernel):
+    time_sampler = ts.TimeSampler(stop_time=20)
+    irregular_time_samples = time_sampler.sample_irregular_time(num_points=100, keep_percentage=50)
+    gp = ts.signals.GaussianProcess(kernel=kernel, nu=3./2)
+    covariance_matrix = gp._covariance_matrix(irregular_time_samples)
+    elementwise = np.array([[gp.kernel_function(t1, t2) for t2 in irregular_time_samples]
+                            for t1 in irregular_time_samples])
+    samples = gp.sample_vectorized(irregular_time_samples)
+    return covariance_matrix, elementwise, samples
+
+
+@pytest.mark.parametrize("kernel", KERNELS)
+def test_gaussian_process(kernel):
+    covariance_matrix, elementwise, samples = run_test(kernel)
+    assert len(samples) == 50
+    np.testing.assert_allclose(covariance_matrix, elementwise, atol=1e-10)
+
+
+def test_gaussian_process_cache():
+    time_sampler = ts.TimeSampler(stop_time=20)
+    regular_time_samples = time_sampler.sample_regular_time(num_points=100)
+    gp = ts.signals.GaussianProcess(kernel="SE", cache_size=1)
+    factor = gp._covariance_factor(regular_time_samples)
+    assert gp._covariance_factor(regular_time_samples) is factor
+    gp.lengthscale = 2.
+    assert gp._covariance_factor(regular_time_samples) is not factor
+    assert len(gp._factor_cache) == 1
+    gp.clear_cache()
+    assert len(gp._factor_cache) == 0
+
+
+@pytest.mark.parametrize("kernel", ["Exponential", "SE", "RQ", "Matern"])
+def test_gaussian_process_circulant(kernel):
+    time_sampler = ts.TimeSampler(stop_time=20)
+    regular_time_samples = time_sampler.sample_regular_time(num_points=100)
+    gp = ts.signals.GaussianProcess(kernel=kernel, method="circulant")
+    eigenvalues = gp._circulant_eigenvalues(regular_time_samples)
+    embedded_covariances = np.fft.ifft(eigenvalues).real[:100]
+    np.testing.assert_allclose(embedded_covariances, gp._covariance_matrix(regular_time_samples)[0], atol=1e-10)
+    assert gp.sample_batch(regular_time_samples, 3).shape == (3, 100)
+
+    irregular_time_samples = time_sampler.sample_irregular_time(num_points=100, keep_percentage=50)
+    assert gp._circulant_eigenvalues(irregular_time_samples) is None
+    assert len(gp.sample_vectorized(irregular_time_samples)) == 50
+
+
+@pytest.mark.parametrize("method", ["rff", "nystrom"])
+def test_gaussian_process_approximate(method):
+    time_sampler = ts.TimeSampler(stop_time=20)
+    irregular_time_samples = time_sampler.sample_irregular_time(num_points=400, keep_percentage=50)
+    gp = ts.signals.GaussianProcess(kernel="SE", method=method, n_components=400)
+    assert gp.sample_batch(irregular_time_samples, 3).shape == (3, 200)
+    assert gp.approximation_error(irregular_time_samples) < 0.2
+
+
+@pytest.mark.parametrize("nu", [1./2, 3./2, 5./2])
+def test_gaussian_process_state_space(nu):
+    time_sampler = ts.TimeSampler(stop_time=20)
+    irregular_time_samples = time_sampler.sample_irregular_time(num_points=100, keep_percentage=50)
+    gp = ts.signals.GaussianProcess(kernel="Matern", nu=nu, method="state_space")
+    feedback, stationary_covariance = gp._state_space_model()
+    for time_diff in [0., 0.5, 2.]:
+        covariance = (scipy.linalg.expm(feedback * time_diff) @ stationary_covariance)[0, 0]
+        np.testing.assert_allclose(covariance, gp.kernel_function(0., time_diff))
+
+    samples = gp.sample_vectorized(irregular_time_samples[:20])
+    samples = np.concatenate((samples, gp.sample_vectorized(irregular_time_samples[20:])))
+    single_sample = gp.sample_next(irregular_time_samples[-1] + 1., None, None)
+    assert len(samples) == 50 and np.isfinite(single_sample)
+    assert ts.TimeSeries(gp).execution_plan()['signal'] == 'chunked'
+
+
+def test_gaussian_process_float32_large_times():
+    time_vector = 1e6 + 0.01 * np.arange(5)
+    single = ts.signals.GaussianProcess(kernel='SE', lengthscale=0.02, dtype=np.float32)
+    double = ts.signals.GaussianProcess(kernel='SE', lengthscale=0.02)
+    covariance = single._covariance_matrix(time_vector)
+    assert covariance.dtype == np.float32
+    np.testing.assert_allclose(covariance, double._covariance_matrix(time_vector), rtol=1e-5)
+    np.testing.assert_allclose(single.kernel_function(time_vector[0], time_vector[1]), np.exp(-0.125), rtol=1e-5)
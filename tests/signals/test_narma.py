@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+import timesynth as ts
+from timesynth.signals.narma import _narma_batch
+
+
+def run_test():
+    time_sampler = ts.TimeSampler(stop_time=200)
+    regular_time_samples = time_sampler.sample_regular_time(resolution=1.)
+    narma = ts.signals.NARMA(order=10, seed=3)
+    samples = narma.sample_vectorized(regular_time_samples)
+
+    # Reference recursion with an explicit window sum
+    a = narma.coefficients
+    rands = np.concatenate((narma.error_initial_condition, narma.errors))
+    values = np.zeros(210)
+    for t in range(10, 210):
+        values[t] = a[0] * values[t-1] + a[1] * values[t-1] * np.sum(values[t-10:t]) + \
+            a[2] * rands[t-10] * rands[t] + a[3]
+
+    fallback = np.zeros((1, 210))
+    _narma_batch(fallback, rands[None, :], 10, a)
+    batch = ts.signals.NARMA(order=10).sample_batch(regular_time_samples, 2, seeds=[3, 4])
+    return samples, values[10:], fallback[0, 10:], batch
+
+
+def test_narma():
+    samples, reference, fallback, batch = run_test()
+    assert len(samples) == 200
+    np.testing.assert_allclose(samples, reference)
+    np.testing.assert_allclose(fallback, reference)
+    np.testing.assert_allclose(batch[0], reference)
+    assert batch.shape == (2, 200)
+
+
+def test_narma_batch_seeds():
+    time_samples = np.arange(100.)
+    error_initial_condition = np.full(5, 0.25)
+    narma = ts.signals.NARMA(order=5, error_initial_condition=error_initial_condition)
+    batch = narma.sample_batch(time_samples, 2, seeds=[1, 2])
+    assert narma.errors is None and narma.previous_values is None
+    for k, seed in enumerate([1, 2]):
+        reference = ts.signals.NARMA(order=5, error_initial_condition=error_initial_condition, seed=seed)
+        np.testing.assert_allclose(batch[k], reference.sample_vectorized(time_samples))
+    with pytest.raises(ValueError):
+        narma.sample_batch(time_samples, 5, seeds=[1, 2])
+
+
+def test_narma_state_copied():
+    time_samples = np.arange(100.)
+    narma = ts.signals.NARMA(order=5, seed=1)
+    reference = ts.signals.NARMA(order=5, seed=1)
+    first = narma.sample_vectorized(time_samples)
+    reference.sample_vectorized(time_samples)
+    # Normalizing the output in place leaves the continuation unchanged
+    first -= first.mean()
+    first /= first.std()
+    np.testing.assert_array_equal(narma.sample_vectorized(time_samples), reference.sample_vectorized(time_samples))
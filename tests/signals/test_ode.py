@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+import timesynth as ts
+
+
+def run_test(ode_class):
+    time_sampler = ts.TimeSampler(stop_time=5)
+    irregular_time_samples = time_sampler.sample_irregular_time(num_points=500, keep_percentage=50)
+
+    ode = ode_class(burn_in=1.)
+    dense = np.concatenate((ode.sample_vectorized(irregular_time_samples[:100]),
+                            ode.sample_vectorized(irregular_time_samples[100:])))
+    rk4 = ode_class(burn_in=1., method='rk4', step=0.001).sample_vectorized(irregular_time_samples)
+
+    initial_conditions = ode.initial_condition + np.linspace(0, 0.1, 4)[:, None]
+    batch = ode_class(burn_in=1., method='rk4', step=0.001).sample_batch(irregular_time_samples, 4,
+                                                                         initial_conditions=initial_conditions)
+    return dense, rk4, batch
+
+
+@pytest.mark.parametrize('ode_class', [ts.signals.Lorenz, ts.signals.Rossler, ts.signals.VanDerPol])
+def test_ode(ode_class):
+    dense, rk4, batch = run_test(ode_class)
+    assert len(dense) == 250
+    np.testing.assert_allclose(rk4, dense, rtol=1e-3, atol=1e-3)
+    assert batch.shape == (4, 250)
+    np.testing.assert_allclose(batch[0], rk4)
+    assert not np.allclose(batch[1], batch[0])
+
+
+def test_ode_component():
+    time_vector = np.linspace(0, 2, 50)
+    lorenz = ts.signals.Lorenz(component=2)
+    assert lorenz.sample_batch(time_vector, 2).shape == (2, 50)
+    timeseries = ts.TimeSeries(lorenz)
+    samples, signals, errors = timeseries.sample(time_vector, chunk_size=7)
+    np.testing.assert_allclose(samples, ts.signals.Lorenz(component=2).sample_vectorized(time_vector),
+                               rtol=1e-4, atol=1e-4)
+    with pytest.raises(ValueError):
+        ts.signals.Lorenz(method='euler')
+    with pytest.raises(ValueError):
+        lorenz.sample_batch(time_vector, 3, initial_conditions=np.ones((2, 3)))
+    with pytest.raises(ValueError):
+        lorenz.sample_batch(time_vector, 2, initial_conditions=np.ones(3))
+
+
+def test_ode_state_copied():
+    time_vector = np.linspace(0, 2, 50)
+    lorenz = ts.signals.Lorenz(component=0)
+    reference = ts.signals.Lorenz(component=0)
+    first = lorenz.sample_vectorized(time_vector[:25])
+    reference.sample_vectorized(time_vector[:25])
+    # Changing a chunk in place does not move the trajectory of the next chunk
+    first[:] = 0.
+    np.testing.assert_array_equal(lorenz.sample_vectorized(time_vector[25:]),
+                                  reference.sample_vectorized(time_vector[25:]))
@@ -0,0 +1,15 @@
+import pytest
+import timesynth as ts
+
+
+def run_test():
+    time_sampler = ts.TimeSampler(stop_time=20)
+    regular_time_samples = time_sampler.sample_regular_time(num_points=100)
+    pseudo_periodic = ts.signals.PseudoPeriodic(frequency=2., freqSD=0.01, ampSD=0.5, random_state=0)
+    return [pseudo_periodic.sample_next(t, None, None) for t in regular_time_samples]
+
+
+def test_pseudoperiodic():
+    samples = run_test()
+    assert len(samples) == 100
+    assert all(isinstance(sample, float) for sample in samples)
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+import timesynth as ts
+
+
+def run_test(ar_param, n_samples):
+    order, n_channels = ar_param.shape[:2]
+    regular_time_samples = np.arange(float(n_samples))
+    var = ts.signals.VectorAutoRegressive(ar_param, covariance=0.5, random_state=0)
+    vectorized = np.concatenate((var.sample_vectorized(regular_time_samples[:n_samples // 2]),
+                                 var.sample_vectorized(regular_time_samples[n_samples // 2:])))
+
+    # Reference recursion with the same innovations
+    rng = np.random.default_rng(0)
+    innovations = np.sqrt(0.5) * np.concatenate((rng.normal(size=(n_samples // 2, n_channels)),
+                                                 rng.normal(size=(n_samples - n_samples // 2, n_channels))))
+    values = np.zeros((order + n_samples, n_channels))
+    for t in range(n_samples):
+        values[order + t] = sum(ar_param[i] @ values[order + t - 1 - i] for i in range(order)) + innovations[t]
+    return vectorized, values[order:]
+
+
+@pytest.mark.parametrize('order, n_channels', [(1, 2), (2, 2), (2, 10)])
+def test_var(order, n_channels):
+    ar_param = np.random.default_rng(1).normal(scale=0.3 / n_channels, size=(order, n_channels, n_channels))
+    vectorized, reference = run_test(ar_param, 200)
+    assert vectorized.shape == (200, n_channels)
+    np.testing.assert_allclose(vectorized, reference, atol=1e-12)
+    batch = ts.signals.VectorAutoRegressive(ar_param).sample_batch(np.arange(50.), 3)
+    assert batch.shape == (3, 50, n_channels)
+    with pytest.raises(ValueError):
+        ts.signals.VectorAutoRegressive(np.zeros((2, 3)))
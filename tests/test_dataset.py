@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+import timesynth as ts
+
+
+def run_test(tmp_path):
+    time_sampler = ts.TimeSampler(stop_time=20)
+    regular_time_samples = time_sampler.sample_regular_time(num_points=200)
+    spec = dict(signal=('CAR', {'ar_param': 0.9}), noise=(ts.noise.GaussianNoise, {'std': 0.1}),
+                random_state=0, series_per_task=25)
+    parallel = ts.build_dataset(regular_time_samples, 100, n_workers=2, **spec)
+    serial = ts.build_dataset(regular_time_samples, 100, n_workers=1, **spec)
+    memmapped = ts.build_dataset(regular_time_samples, 100, n_workers=2, filename=str(tmp_path / 'car.npy'), **spec)
+    mackey_glass = ts.build_dataset(regular_time_samples, 4, 'MackeyGlass', n_workers=2, series_per_task=2)
+    return parallel, serial, memmapped, mackey_glass
+
+
+def test_build_dataset(tmp_path):
+    parallel, serial, memmapped, mackey_glass = run_test(tmp_path)
+    assert parallel.shape == (100, 200)
+    assert (parallel == serial).all()
+    assert (np.load(tmp_path / 'car.npy') == parallel).all()
+    assert isinstance(memmapped, np.memmap)
+    # Tasks draw from independent streams
+    assert not np.allclose(parallel[0], parallel[25])
+    np.testing.assert_allclose(mackey_glass[1:], np.tile(mackey_glass[0], (3, 1)))
+    with pytest.raises(ValueError):
+        ts.build_dataset(np.arange(10.), 2, 'Unknown')
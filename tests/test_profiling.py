@@ -0,0 +1,92 @@
+import logging
+import threading
+import tracemalloc
+import numpy as np
+import pytest
+import timesynth as ts
+
+
+def run_test():
+    time_sampler = ts.TimeSampler(stop_time=20)
+    regular_time_samples = time_sampler.sample_regular_time(num_points=500)
+    signal = ts.signals.Sinusoidal(frequency=0.25)
+    signal.vectorizable = False
+    iterative = ts.TimeSeries(signal, ts.noise.GaussianNoise(std=0.3))
+    gaussian_process = ts.TimeSeries(ts.signals.GaussianProcess(kernel='SE'), ts.noise.RedNoise(std=0.3))
+
+    callback_records = []
+    with ts.Profiler(callback=callback_records.append, trace_memory=True) as profiler:
+        iterative.sample(regular_time_samples)
+        gaussian_process.sample(regular_time_samples)
+    gaussian_process.sample(regular_time_samples)
+    return profiler, callback_records
+
+
+def test_profiler():
+    profiler, callback_records = run_test()
+    stages = [(record['stage'], record['generator'], record['path']) for record in profiler.records]
+    assert stages == [('noise', 'GaussianNoise', 'vectorized'), ('iterative', 'Sinusoidal', 'iterative'),
+                      ('sample', None, None), ('covariance', 'GaussianProcess', 'dense'),
+                      ('signal', 'GaussianProcess', 'vectorized'), ('noise', 'RedNoise', 'chunked'),
+                      ('sample', None, None)]
+    assert callback_records == profiler.records
+    assert all(record['n_points'] == 500 for record in profiler.records)
+    # The dense covariance matrix alone takes 500 * 500 doubles
+    assert profiler.records[3]['bytes'] >= 500 * 500 * 8
+    assert profiler.records[4]['bytes'] >= profiler.records[3]['bytes']
+
+    summary = profiler.to_dict()
+    assert summary['stages']['sample']['calls'] == 2
+    assert summary['stages']['noise']['n_points'] == 1000
+
+
+def test_profiler_log(caplog):
+    time_sampler = ts.TimeSampler(stop_time=20)
+    regular_time_samples = time_sampler.sample_regular_time(num_points=100)
+    with ts.Profiler() as profiler:
+        ts.TimeSeries(ts.signals.Sinusoidal()).sample_batch(regular_time_samples, 4)
+    with caplog.at_level(logging.INFO, logger='timesynth.profiling'):
+        profiler.log()
+    assert [record['bytes'] for record in profiler.records] == [None, None]
+    assert len(caplog.records) == 2
+    assert 'sample_batch' in caplog.records[1].getMessage()
+
+
+def test_profiler_threads():
+    time_sampler = ts.TimeSampler(stop_time=20)
+    regular_time_samples = time_sampler.sample_regular_time(num_points=100)
+    profilers = [None, None]
+    barrier = threading.Barrier(2)
+
+    def profile(k):
+        timeseries = ts.TimeSeries(ts.signals.Sinusoidal(), ts.noise.GaussianNoise(std=0.3))
+        with ts.Profiler() as profiler:
+            for _ in range(50):
+                barrier.wait()
+                timeseries.sample(regular_time_samples)
+        profilers[k] = profiler
+
+    threads = [threading.Thread(target=profile, args=(k,)) for k in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for profiler in profilers:
+        assert [record['depth'] for record in profiler.records] == [1, 1, 0] * 50
+
+
+def test_profiler_external_tracing():
+    time_sampler = ts.TimeSampler(stop_time=20)
+    regular_time_samples = time_sampler.sample_regular_time(num_points=100)
+    tracemalloc.start()
+    try:
+        peak_data = np.ones(10**6)
+        del peak_data
+        with ts.Profiler(trace_memory=True) as profiler:
+            ts.TimeSeries(ts.signals.Sinusoidal()).sample(regular_time_samples)
+        # The caller's peak survives profiling
+        assert tracemalloc.get_traced_memory()[1] >= 8 * 10**6
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+    assert [record['bytes'] for record in profiler.records] == [None, None]
@@ -0,0 +1,41 @@
+import os
+import numpy as np
+import pytest
+import timesynth as ts
+
+
+def run_test(tmp_path):
+    time_sampler = ts.TimeSampler(stop_time=100)
+    regular_time_samples = time_sampler.sample_regular_time(resolution=0.1)
+
+    def timeseries():
+        return ts.TimeSeries(ts.signals.CAR(ar_param=0.9), noise_generator=ts.noise.RedNoise(std=0.1),
+                             random_state=0)
+
+    samples, signals, errors = timeseries().sample(regular_time_samples)
+    memmap = ts.storage.open_npy(str(tmp_path / 'samples.npy'), len(regular_time_samples))
+    store = ts.storage.ChunkedStore(str(tmp_path / 'errors'), len(regular_time_samples), chunk_length=300)
+    timeseries().write(regular_time_samples, (memmap, None, store), chunk_size=128)
+    memmap.flush()
+
+    batch = timeseries().sample_batch(regular_time_samples, 10)[0]
+    batch_store = ts.storage.ChunkedStore(str(tmp_path / 'batch'), batch.shape, chunk_length=4)
+    timeseries().write_batch(regular_time_samples, 10, batch_store, series_per_chunk=3)
+    return samples, errors, batch, tmp_path
+
+
+def test_storage(tmp_path):
+    samples, errors, batch, tmp_path = run_test(tmp_path)
+    np.testing.assert_allclose(np.load(tmp_path / 'samples.npy'), samples)
+    store = ts.storage.ChunkedStore(str(tmp_path / 'errors'))
+    assert store.n_chunks == 4
+    assert sorted(os.listdir(tmp_path / 'errors')) == ['0.npy', '1.npy', '2.npy', '3.npy', 'metadata.json']
+    np.testing.assert_allclose(np.asarray(store), errors)
+    np.testing.assert_allclose(store[250:650], errors[250:650])
+
+    batch_store = ts.storage.ChunkedStore(str(tmp_path / 'batch'))
+    assert batch_store.shape == batch.shape
+    assert np.asarray(batch_store).shape == batch.shape
+    assert not np.allclose(batch_store[0:1], batch_store[3:4])
+    with pytest.raises(ValueError):
+        batch_store[::2]
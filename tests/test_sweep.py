@@ -0,0 +1,38 @@
+import itertools
+import numpy as np
+import pytest
+import timesynth as ts
+
+
+def run_test():
+    time_sampler = ts.TimeSampler(stop_time=20)
+    regular_time_samples = time_sampler.sample_regular_time(num_points=500)
+    amplitudes, frequencies = [1., 2.], [0.1, 0.5, 1.]
+    samples = ts.parameter_sweep(regular_time_samples, 'Sinusoidal',
+                                 {'amplitude': amplitudes, 'frequency': frequencies}, grid=True)
+    expected = np.array([ts.signals.Sinusoidal(amplitude=amplitude, frequency=frequency).sample_vectorized(
+        regular_time_samples) for amplitude, frequency in itertools.product(amplitudes, frequencies)])
+    return samples, expected
+
+
+def test_parameter_sweep():
+    samples, expected = run_test()
+    assert samples.shape == (6, 500)
+    np.testing.assert_allclose(samples, expected)
+
+
+def test_parameter_sweep_random():
+    time_sampler = ts.TimeSampler(stop_time=20)
+    regular_time_samples = time_sampler.sample_regular_time(num_points=20000)
+    stds = [0.1, 1., 10.]
+    noise = ts.parameter_sweep(regular_time_samples, ('GaussianNoise', {'random_state': 0}), {'std': stds})
+    np.testing.assert_allclose(noise.std(axis=1), stds, rtol=0.05)
+
+    unit_time_samples = ts.TimeSampler(stop_time=20000).sample_regular_time(resolution=1.)
+    car = ts.parameter_sweep(unit_time_samples, (ts.signals.CAR, {'random_state': 0}),
+                             {'ar_param': [0.5, 0.9], 'sigma': [1., 2.]})
+    assert car.shape == (2, 20000)
+    np.testing.assert_allclose(car.std(axis=1), [1. / np.sqrt(1.5), 2. / np.sqrt(1.9)], rtol=0.1)
+
+    with pytest.raises(ValueError):
+        ts.parameter_sweep(regular_time_samples, 'AutoRegressive', {'ar_param': [[0.5], [0.9]], 'sigma': [1.]})
@@ -0,0 +1,179 @@
+import numpy as np
+import pytest
+import timesynth as ts
+
+
+class _IterativeNoise(ts.noise.RedNoise):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.vectorizable = False
+
+
+def run_test():
+    time_sampler = ts.TimeSampler(stop_time=20)
+    regular_time_samples = time_sampler.sample_regular_time(num_points=500)
+    sinusoid = ts.signals.Sinusoidal(frequency=0.25)
+
+    np.random.seed(0)
+    vectorized = ts.TimeSeries(sinusoid, noise_generator=ts.noise.RedNoise(std=0.3)).sample(regular_time_samples)
+    np.random.seed(0)
+    mixed = ts.TimeSeries(sinusoid, noise_generator=_IterativeNoise(std=0.3)).sample(regular_time_samples)
+    return vectorized, mixed
+
+
+def test_timeseries():
+    vectorized, mixed = run_test()
+    for vectorized_output, mixed_output in zip(vectorized, mixed):
+        np.testing.assert_allclose(vectorized_output, mixed_output)
+    np.testing.assert_allclose(vectorized[0], vectorized[1] + vectorized[2])
+
+
+def test_timeseries_plan():
+    time_sampler = ts.TimeSampler(stop_time=20)
+    regular_time_samples = time_sampler.sample_regular_time(num_points=500)
+    timeseries = ts.TimeSeries(ts.signals.AutoRegressive(ar_param=[0.9]), noise_generator=_IterativeNoise(std=0.3))
+    assert timeseries.execution_plan() == {'signal': 'chunked', 'noise': 'iterative'}
+
+    out = tuple(np.empty(500) for _ in range(3))
+    np.random.seed(0)
+    samples, signals, errors = timeseries.sample(regular_time_samples, out=out, chunk_size=64)
+    assert samples is out[0] and signals is out[1] and errors is out[2]
+    np.testing.assert_allclose(samples, signals + errors)
+
+
+def test_timeseries_batch():
+    time_sampler = ts.TimeSampler(stop_time=20)
+    irregular_time_samples = time_sampler.sample_irregular_time(num_points=200, keep_percentage=50)
+    generators = [(ts.signals.Sinusoidal(), ts.noise.GaussianNoise()),
+                  (ts.signals.PseudoPeriodic(), ts.noise.RedNoise()),
+                  (ts.signals.CAR(ar_param=0.9), None),
+                  (ts.signals.AutoRegressive(ar_param=[0.5]), _IterativeNoise()),
+                  (ts.signals.GaussianProcess(kernel='Matern', nu=3./2), None)]
+    for signal_generator, noise_generator in generators:
+        timeseries = ts.TimeSeries(signal_generator, noise_generator=noise_generator)
+        samples, signals, errors = timeseries.sample_batch(irregular_time_samples, 8)
+        assert samples.shape == signals.shape == errors.shape == (8, 100)
+        np.testing.assert_allclose(samples, signals + errors)
+
+
+def test_timeseries_stream():
+    time_sampler = ts.TimeSampler(stop_time=100)
+    regular_time_samples = time_sampler.sample_regular_time(resolution=0.5)
+    # One random component per series, as both components draw from the global random state
+    generators = [lambda: (ts.signals.AutoRegressive(ar_param=[1.5, -0.75]), None),
+                  lambda: (ts.signals.Sinusoidal(), ts.noise.RedNoise(std=0.3)),
+                  lambda: (ts.signals.Sinusoidal(), _IterativeNoise(std=0.3)),
+                  lambda: (ts.signals.CAR(ar_param=0.9), None),
+                  lambda: (ts.signals.NARMA(order=5), None),
+                  lambda: (ts.signals.GaussianProcess(kernel="Matern", nu=3./2, method="state_space"), None)]
+    for generator in generators:
+        np.random.seed(0)
+        full = ts.TimeSeries(*generator()).sample(regular_time_samples)
+        np.random.seed(0)
+        chunks = list(ts.TimeSeries(*generator()).stream(regular_time_samples, chunk_size=37))
+        assert max(len(chunk[0]) for chunk in chunks) == 37
+        for full_output, streamed_output in zip(full, zip(*chunks)):
+            np.testing.assert_allclose(np.concatenate(streamed_output), full_output)
+
+    with pytest.raises(ValueError):
+        ts.TimeSeries(ts.signals.GaussianProcess()).stream(regular_time_samples, chunk_size=37)
+
+
+def test_timeseries_random_state():
+    time_sampler = ts.TimeSampler(stop_time=20, random_state=1)
+    irregular_time_samples = time_sampler.sample_irregular_time(num_points=500, keep_percentage=50)
+    assert (ts.TimeSampler(stop_time=20, random_state=1).sample_irregular_time(
+        num_points=500, keep_percentage=50) == irregular_time_samples).all()
+
+    def sample(random_state):
+        timeseries = ts.TimeSeries(ts.signals.CAR(ar_param=0.9), noise_generator=ts.noise.GaussianNoise(std=0.3),
+                                   random_state=random_state)
+        return timeseries.sample(irregular_time_samples)
+
+    np.random.seed(0)
+    first = sample(3)
+    np.random.seed(1)
+    second = sample(3)
+    for first_output, second_output in zip(first, second):
+        assert (first_output == second_output).all()
+    assert not np.allclose(sample(4)[0], first[0])
+
+    streams = ts.spawn_random_states(5, 3)
+    assert len(streams) == 3
+    assert streams[0].normal() == ts.spawn_random_states(5, 3)[0].normal()
+    assert streams[1].normal() != ts.spawn_random_states(5, 3)[0].normal()
+    np.random.seed(0)
+    global_streams = ts.spawn_random_states(None, 2)
+    np.random.seed(0)
+    assert global_streams[0].normal() == ts.spawn_random_states(None, 2)[0].normal()
+
+
+def test_multichannel_timeseries():
+    time_sampler = ts.TimeSampler(stop_time=20)
+    regular_time_samples = time_sampler.sample_regular_time(num_points=500)
+    frequencies = np.array([0.25, 0.5, 1.])
+    timeseries = ts.MultiChannelTimeSeries(ts.signals.Sinusoidal(frequency=frequencies),
+                                           ts.noise.CorrelatedGaussianNoise(np.eye(3) * 0.01), random_state=0)
+    samples, signals, errors = timeseries.sample(regular_time_samples)
+    assert samples.shape == (500, 3)
+    np.testing.assert_allclose(signals, np.sin(2 * np.pi * regular_time_samples[:, None] * frequencies))
+    np.testing.assert_allclose(samples, signals + errors)
+
+    # A single-channel signal is broadcast to all channels, and stateful channels can be streamed
+    var = ts.signals.VectorAutoRegressive(np.eye(2) * 0.5, random_state=0)
+    chunks = list(ts.MultiChannelTimeSeries(var, ts.noise.GaussianNoise(std=0.)).stream(regular_time_samples, 128))
+    streamed = np.concatenate([chunk[0] for chunk in chunks])
+    full = ts.MultiChannelTimeSeries(ts.signals.VectorAutoRegressive(np.eye(2) * 0.5, random_state=0)).sample(
+        regular_time_samples)[0]
+    np.testing.assert_allclose(streamed, full)
+    with pytest.raises(ValueError):
+        ts.MultiChannelTimeSeries(ts.signals.Sinusoidal(), _IterativeNoise())
+
+
+def test_multichannel_timeseries_batch():
+    time_sampler = ts.TimeSampler(stop_time=20)
+    regular_time_samples = time_sampler.sample_regular_time(num_points=200)
+    var = ts.signals.VectorAutoRegressive([[0.5, 0.1], [0., 0.5]])
+    timeseries = ts.MultiChannelTimeSeries(var, ts.noise.GaussianNoise(std=0.1), random_state=0)
+    samples, signals, errors = timeseries.sample_batch(regular_time_samples, 3)
+    assert samples.shape == signals.shape == errors.shape == (3, 200, 2)
+    np.testing.assert_allclose(samples, signals + errors)
+    assert not np.allclose(signals[0], signals[1])
+
+    # Chunked sampling continues the state of VectorAutoRegressive
+    chunked = ts.MultiChannelTimeSeries(ts.signals.VectorAutoRegressive(np.eye(2) * 0.5, random_state=0))
+    full = ts.MultiChannelTimeSeries(ts.signals.VectorAutoRegressive(np.eye(2) * 0.5, random_state=0))
+    samples, signals, errors = chunked.sample(regular_time_samples, chunk_size=64)
+    assert samples is signals and not errors.any()
+    np.testing.assert_allclose(samples, full.sample(regular_time_samples)[0])
+
+    store = np.zeros((5, 200, 3))
+    ts.MultiChannelTimeSeries(ts.signals.Sinusoidal(), ts.noise.CorrelatedGaussianNoise(np.eye(3)),
+                              random_state=0).write_batch(regular_time_samples, 5, store, series_per_chunk=2)
+    assert np.all(store.std(axis=1) > 0.5)
+
+
+def test_multichannel_timeseries_inplace():
+    time_vector = np.linspace(0, 10, 100)
+    timeseries = ts.MultiChannelTimeSeries(ts.signals.CAR(ar_param=[0.9, 0.5]), random_state=0)
+    reference = ts.MultiChannelTimeSeries(ts.signals.CAR(ar_param=[0.9, 0.5]), random_state=0)
+    samples = timeseries.sample(time_vector[:50])[0]
+    reference.sample(time_vector[:50])
+    # Samples are handed out without copying, but changing them leaves the series unchanged
+    samples -= samples.mean(axis=0)
+    np.testing.assert_array_equal(timeseries.sample(time_vector[50:])[0], reference.sample(time_vector[50:])[0])
+
+
+def test_timeseries_batch_iterative():
+    time_sampler = ts.TimeSampler(stop_time=20)
+    irregular_time_samples = time_sampler.sample_irregular_time(num_points=200, keep_percentage=50)
+    signal = ts.signals.CAR(ar_param=0.9, start_value=5., random_state=0)
+    signal.vectorizable = False
+    timeseries = ts.TimeSeries(signal, noise_generator=_IterativeNoise(std=0.3, random_state=1))
+    samples, signals, errors = timeseries.sample_batch(irregular_time_samples, 4)
+    assert np.isfinite(samples).all()
+    np.testing.assert_allclose(signals[:, 0], 5.)
+    np.testing.assert_allclose(errors[:, 0], 0.)
+    # Rows are independent draws, and the generators keep their state
+    assert len(np.unique(signals[:, 1])) == 4 and len(np.unique(errors[:, 1])) == 4
+    assert signal.previous_value is None
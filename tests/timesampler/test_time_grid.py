@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+import timesynth as ts
+
+
+def run_test():
+    time_sampler = ts.TimeSampler(stop_time=20)
+    grid = time_sampler.sample_regular_time(resolution=0.1, lazy=True)
+    regular_time_samples = time_sampler.sample_regular_time(resolution=0.1)
+    linspace_grid = time_sampler.sample_regular_time(num_points=50, lazy=True)
+    linspace_time_samples = time_sampler.sample_regular_time(num_points=50)
+    return grid, regular_time_samples, linspace_grid, linspace_time_samples
+
+
+def test_time_grid():
+    grid, regular_time_samples, linspace_grid, linspace_time_samples = run_test()
+    assert len(grid) == len(regular_time_samples)
+    np.testing.assert_allclose(grid, regular_time_samples)
+    np.testing.assert_allclose(linspace_grid, linspace_time_samples)
+
+    # Slicing and scalar arithmetic stay lazy
+    assert isinstance(grid[10:100:3], ts.TimeGrid)
+    assert isinstance(2 * np.pi * grid - 1, ts.TimeGrid)
+    np.testing.assert_allclose(grid[10:100:3], regular_time_samples[10:100:3])
+    np.testing.assert_allclose(grid[::-1], regular_time_samples[::-1])
+    np.testing.assert_allclose(2 * np.pi * grid - 1, 2 * np.pi * regular_time_samples - 1)
+    assert grid[-1] == pytest.approx(regular_time_samples[-1])
+    np.testing.assert_allclose(grid[:, None], regular_time_samples[:, None])
+    np.testing.assert_allclose(np.sin(grid), np.sin(regular_time_samples))
+    np.testing.assert_allclose(np.concatenate(list(grid.chunks(33))), regular_time_samples)
+    with pytest.raises(IndexError):
+        grid[len(grid)]
+
+
+def test_time_grid_timeseries():
+    grid, regular_time_samples, _, _ = run_test()
+    timeseries = ts.TimeSeries(ts.signals.Sinusoidal(frequency=0.25))
+    np.testing.assert_allclose(timeseries.sample(grid)[0], timeseries.sample(regular_time_samples)[0])
+
+    np.random.seed(0)
+    streamed = [chunk[0] for chunk in ts.TimeSeries(ts.signals.CAR()).stream(grid, chunk_size=64)]
+    np.random.seed(0)
+    np.testing.assert_allclose(np.concatenate(streamed), ts.TimeSeries(ts.signals.CAR()).sample(regular_time_samples)[0])
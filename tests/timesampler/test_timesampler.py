@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+import timesynth as ts
+
+
+def run_test():
+    time_sampler = ts.TimeSampler(stop_time=1000)
+    np.random.seed(0)
+    bernoulli = time_sampler.sample_bernoulli_time(resolution=0.1, keep_percentage=30, jitter=1.)
+    poisson = time_sampler.sample_poisson_time(rate=5.)
+    burst = time_sampler.sample_burst_time(rate=10., burst_length=2., gap_length=3.)
+    chunks = list(time_sampler.sample_bernoulli_time(num_points=10000, keep_percentage=50, chunk_size=100))
+    burst_chunks = list(time_sampler.sample_burst_time(rate=10., burst_length=2., gap_length=3., chunk_size=100))
+    return bernoulli, poisson, burst, chunks, burst_chunks
+
+
+def test_irregular_samplers():
+    bernoulli, poisson, burst, chunks, burst_chunks = run_test()
+    for time_vector in (bernoulli, poisson, burst, np.concatenate(chunks), np.concatenate(burst_chunks)):
+        assert np.all(np.diff(time_vector) > 0)
+        assert time_vector[-1] < 1000
+    assert abs(len(bernoulli) - 3000) < 200
+    assert abs(len(poisson) - 5000) < 300
+    assert abs(len(burst) - 4000) < 1000
+    # Gaps between bursts are much longer than the spacing within bursts
+    assert np.diff(burst).max() > 10 * 0.1
+    assert all(len(chunk) == 100 for chunk in chunks[:-1])
+    assert abs(sum(len(chunk) for chunk in chunks) - 5000) < 300
+
+    # Without jitter, points lie on the grid
+    grid_points = ts.TimeSampler(stop_time=10).sample_bernoulli_time(resolution=0.5, keep_percentage=50)
+    np.testing.assert_allclose(grid_points / 0.5, np.round(grid_points / 0.5))
+    assert len(ts.TimeSampler().sample_bernoulli_time(num_points=10, keep_percentage=0)) == 0
+    assert len(ts.TimeSampler().sample_bernoulli_time(num_points=10)) == 10
+    with pytest.raises(ValueError):
+        ts.TimeSampler().sample_bernoulli_time(num_points=10, jitter=2.)
+
+    # Jittered points stay within [start_time, stop_time]
+    time_sampler = ts.TimeSampler(start_time=1, stop_time=2, random_state=0)
+    jittered = np.stack([time_sampler.sample_bernoulli_time(num_points=3, jitter=1.) for _ in range(200)])
+    assert jittered.min() >= 1 and jittered.max() <= 2
+    assert np.all(np.diff(jittered, axis=1) >= 0)
@@ -1,7 +1,12 @@
-from .timeseries import TimeSeries
+from .timeseries import TimeSeries, MultiChannelTimeSeries
 from . import signals
 from . import noise
-from .timesampler import TimeSampler
+from .timesampler import TimeSampler, TimeGrid
+from ._utils import spawn_random_states
+from .dataset import build_dataset
+from .sweep import parameter_sweep
+from .profiling import Profiler
+from . import storage
 
 name = "timesynth"
 
@@ -0,0 +1,188 @@
+import numbers
+import numpy as np
+
+
+def linear_recurrence(decay, increment, initial_value):
+    """Solves x[k] = decay[k] * x[k-1] + increment[k] along the last axis.
+
+    Uses a recursive doubling scan over affine maps, so the recurrence is
+    solved in log2(n) vectorized passes without dividing by cumulative
+    products (which would underflow for strong decay).
+
+    Parameters
+    ----------
+    decay : numpy array
+        multiplicative coefficients
+    increment : numpy array
+        additive terms, broadcastable against decay
+    initial_value : float or numpy array
+        value of x[-1], broadcastable against decay[..., 0]
+
+    Returns
+    -------
+    numpy array
+        x[0], ..., x[n-1]
+
+    """
+    decay, increment = np.broadcast_arrays(np.asarray(decay, dtype=float),
+                                           np.asarray(increment, dtype=float))
+    decay = decay.copy()
+    increment = increment.copy()
+    n_samples = decay.shape[-1]
+    shift = 1
+    while shift < n_samples:
+        increment[..., shift:] += decay[..., shift:] * increment[..., :-shift]
+        decay[..., shift:] *= decay[..., :-shift]
+        shift *= 2
+    return decay * np.expand_dims(initial_value, -1) + increment
+
+
+def matrix_linear_recurrence(transition, increment, initial_state):
+    """Solves x[k] = transition[k] @ x[k-1] + increment[k] for vector states.
+
+    The matrix counterpart of linear_recurrence, solved with the same
+    recursive doubling scan over the step axis.
+
+    Parameters
+    ----------
+    transition : numpy array
+        transition matrices of shape (..., n, d, d)
+    increment : numpy array
+        additive terms of shape (..., n, d)
+    initial_state : numpy array
+        state x[-1] of shape (..., d)
+
+    Returns
+    -------
+    numpy array
+        states x[0], ..., x[n-1] of shape (..., n, d)
+
+    """
+    increment = np.array(increment, dtype=float)
+    transition = np.array(np.broadcast_to(transition, increment.shape + increment.shape[-1:]), dtype=float)
+    n_samples = increment.shape[-2]
+    shift = 1
+    while shift < n_samples:
+        increment[..., shift:, :] += np.einsum('...ij,...j->...i', transition[..., shift:, :, :],
+                                               increment[..., :-shift, :])
+        transition[..., shift:, :, :] = transition[..., shift:, :, :] @ transition[..., :-shift, :, :]
+        shift *= 2
+    initial_state = np.expand_dims(initial_state, -2)
+    return np.einsum('...ij,...j->...i', transition, initial_state) + increment
+
+
+def as_parameter(value):
+    """Returns numbers unchanged and turns sequences into float arrays, for array-valued parameters."""
+    return value if np.isscalar(value) else np.asarray(value, dtype=float)
+
+
+def broadcast_time(time_vector, *parameters):
+    """Shapes time_vector to broadcast against array-valued parameters.
+
+    Parameters that are arrays (e.g. one value per channel) add trailing
+    axes to the output, so samples have shape (len(time_vector), *channels).
+
+    Parameters
+    ----------
+    time_vector : array-like
+        Timestamps
+    *parameters : numbers or array-likes
+        Parameters of a generator, broadcastable against each other
+
+    Returns
+    -------
+    array-like
+        time_vector unchanged if all parameters are scalars, otherwise an array
+        of shape (len(time_vector), 1, ..., 1)
+
+    """
+    n_dims = np.broadcast(*parameters).ndim if parameters else 0
+    if n_dims == 0:
+        return time_vector
+    return np.asarray(time_vector).reshape((-1,) + (1,) * n_dims)
+
+
+def covariance_factor(covariance, n_channels):
+    """Factorizes a covariance as L @ L.T.
+
+    Uses the Cholesky decomposition, or an eigendecomposition if the
+    covariance is only positive semidefinite.
+
+    Parameters
+    ----------
+    covariance : number or array-like
+        A variance for all channels, one variance per channel, or a full
+        (n_channels, n_channels) matrix
+    n_channels : int
+        Number of channels
+
+    Returns
+    -------
+    numpy array
+        L of shape (n_channels, n_channels)
+
+    """
+    covariance = np.asarray(covariance, dtype=float)
+    if covariance.ndim < 2:
+        return np.diag(np.sqrt(np.broadcast_to(covariance, (n_channels,))))
+    try:
+        return np.linalg.cholesky(covariance)
+    except np.linalg.LinAlgError:
+        # Positive semidefinite covariances
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        return eigenvectors * np.sqrt(np.clip(eigenvalues, 0, None))
+
+
+def check_random_state(random_state):
+    """Turns random_state into a random number generator.
+
+    Parameters
+    ----------
+    random_state : None, int, numpy SeedSequence, Generator or RandomState
+        - None. The global RandomState of np.random, so np.random.seed applies.
+        - int or SeedSequence. A new Generator seeded with it.
+        - Generator or RandomState. Used as is.
+
+    Returns
+    -------
+    numpy Generator or RandomState
+
+    """
+    if random_state is None:
+        return np.random.mtrand._rand
+    if isinstance(random_state, (np.random.Generator, np.random.RandomState)):
+        return random_state
+    if isinstance(random_state, (numbers.Integral, np.random.SeedSequence)):
+        return np.random.default_rng(random_state)
+    raise ValueError("{!r} cannot be used as a random state".format(random_state))
+
+
+def spawn_random_states(random_state, n_streams):
+    """Derives independent random number generators with SeedSequence.spawn.
+
+    The streams are reproducible from random_state and statistically
+    independent of each other, e.g. for batches or worker processes.
+
+    Parameters
+    ----------
+    random_state : None, int, numpy SeedSequence, Generator or RandomState
+        Source of the streams. For None and RandomState, the root seed is drawn
+        from that generator, so the streams follow np.random.seed.
+    n_streams : int
+        Number of streams
+
+    Returns
+    -------
+    list of numpy Generator
+
+    """
+    if isinstance(random_state, np.random.SeedSequence):
+        seed_sequence = random_state
+    elif isinstance(random_state, numbers.Integral):
+        seed_sequence = np.random.SeedSequence(random_state)
+    elif isinstance(random_state, np.random.Generator):
+        return list(random_state.spawn(n_streams))
+    else:
+        entropy = check_random_state(random_state).randint(0, 2**32, size=4)
+        seed_sequence = np.random.SeedSequence([int(value) for value in entropy])
+    return [np.random.default_rng(child) for child in seed_sequence.spawn(n_streams)]
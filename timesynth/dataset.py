@@ -0,0 +1,128 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from . import signals as _signals, noise as _noise
+from .timeseries import TimeSeries
+from ._utils import spawn_random_states
+from .storage import open_npy
+
+__all__ = ['build_dataset']
+
+# Output array of the current worker process, and the (signal, noise, time_vector) its tasks sample,
+# set by _initialize_worker
+_worker_output = None
+_worker_job = None
+
+
+def build_dataset(time_vector, n_series, signal, noise=None, random_state=None, n_workers=None,
+                  filename=None, series_per_task=64):
+    """Samples a dataset of independent series in parallel processes.
+
+    Generators are described by compact specs and constructed in the
+    workers, so objects that cannot be pickled (such as MackeyGlass) are
+    supported. The series are split into tasks of series_per_task series;
+    every task samples its block with TimeSeries.sample_batch from its own
+    random stream and writes it straight into a shared output array, so no
+    samples are sent back to the parent. The specs and time_vector are sent
+    to every worker once, and tasks only carry their rows and random stream. The result only depends on
+    random_state and series_per_task, not on the number of workers.
+
+    Parameters
+    ----------
+    time_vector : numpy array or TimeGrid
+        Times at which to generate a sample
+    n_series : int
+        Number of series
+    signal : str, class or tuple
+        Spec of the signal generator: a class from timesynth.signals, its name,
+        or a (class or name, keyword arguments) tuple
+    noise : str, class, tuple or None (default None)
+        Spec of the noise generator, looked up in timesynth.noise
+    random_state : None, int, SeedSequence, Generator or RandomState (default None)
+        Source of the random streams of the tasks (see spawn_random_states)
+    n_workers : int or None (default None)
+        Number of processes; os.cpu_count() if None. With 1, the dataset is
+        built in the calling process.
+    filename : str or None (default None)
+        If given, the dataset is written to this .npy file and returned as a
+        memory map. Otherwise it is kept in shared memory.
+    series_per_task : int (default 64)
+        Number of series sampled per task
+
+    Returns
+    -------
+    numpy array
+        samples of shape (n_series, len(time_vector))
+
+    """
+    signal = _normalize_spec(signal, _signals)
+    noise = _normalize_spec(noise, _noise)
+    shape = (n_series, len(time_vector))
+    if filename is not None:
+        output = open_npy(filename, shape)
+        target = ('memmap', filename)
+    else:
+        buffer = multiprocessing.RawArray('d', max(n_series * shape[1], 1))
+        output = np.frombuffer(buffer, dtype=float, count=n_series * shape[1]).reshape(shape)
+        target = ('shared', buffer, shape)
+
+    starts = range(0, n_series, series_per_task)
+    streams = spawn_random_states(random_state, len(starts))
+    tasks = [(start, min(start + series_per_task, n_series), stream) for start, stream in zip(starts, streams)]
+    job = (signal, noise, time_vector)
+
+    n_workers = os.cpu_count() if n_workers is None else n_workers
+    if n_workers == 1 or len(tasks) <= 1:
+        global _worker_output, _worker_job
+        _worker_output, _worker_job = output, job
+        try:
+            for task in tasks:
+                _sample_block(*task)
+        finally:
+            _worker_output, _worker_job = None, None
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(tasks)), initializer=_initialize_worker,
+                                 initargs=(target, job)) as executor:
+            for future in [executor.submit(_sample_block, *task) for task in tasks]:
+                future.result()
+
+    if filename is not None:
+        output.flush()
+    return output
+
+
+def _normalize_spec(spec, module):
+    """Internal function turning a generator spec into a (class, keyword arguments) tuple."""
+    if spec is None:
+        return None
+    if isinstance(spec, tuple):
+        generator_class, kwargs = spec
+    else:
+        generator_class, kwargs = spec, {}
+    if isinstance(generator_class, str):
+        if generator_class.startswith('_') or not isinstance(getattr(module, generator_class, None), type):
+            raise ValueError("Unknown generator: {}".format(generator_class))
+        generator_class = getattr(module, generator_class)
+    return generator_class, dict(kwargs)
+
+
+def _initialize_worker(target, job):
+    """Internal function attaching a worker process to the output array and the job of its tasks."""
+    global _worker_output, _worker_job
+    _worker_job = job
+    if target[0] == 'memmap':
+        _worker_output = np.load(target[1], mmap_mode='r+')
+    else:
+        _, buffer, shape = target
+        _worker_output = np.frombuffer(buffer, dtype=float, count=shape[0] * shape[1]).reshape(shape)
+
+
+def _sample_block(start, stop, random_state):
+    """Internal function sampling the series start to stop into the output array."""
+    signal, noise, time_vector = _worker_job
+    signal_generator = signal[0](**signal[1])
+    noise_generator = None if noise is None else noise[0](**noise[1])
+    timeseries = TimeSeries(signal_generator, noise_generator, random_state=random_state)
+    samples, _, _ = timeseries.sample_batch(time_vector, stop - start)
+    _worker_output[start:stop] = samples
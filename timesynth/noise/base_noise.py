@@ -1,13 +1,31 @@
+import numpy as np
+from ..signals.base_signal import _Algebra
+
 __all__ = []
 
 
-class BaseNoise:
+class BaseNoise(_Algebra):
     """BaseNoise class
 
-    Signature for all noise classes.
+    Signature for all noise classes. Noises can be combined with signals
+    into expressions (see timesynth.signals.composite).
+
+    Attributes
+    ----------
+    vectorizable : bool
+        whether the noise can be sampled for a whole time vector at once
+    stateful : bool
+        whether consecutive calls to sample_vectorized continue a single series,
+        so that the noise can be sampled in chunks
+    streamable : bool
+        whether consecutive chunks sampled with sample_vectorized form a
+        single series, so that the noise can be streamed
 
     """
 
+    stateful = False
+    streamable = True
+
     def __init__(self):
         raise NotImplementedError
 
@@ -30,3 +48,44 @@ class BaseNoise:
 
         """
         raise NotImplementedError
+
+    def sample_vectorized(self, time_vector):
+        """Samples for all time points in input
+
+        Implementations return a new array, which the generator must not keep
+        (e.g. as a view for its state): callers, such as MultiChannelTimeSeries,
+        hand it on without copying.
+
+        Parameters
+        ----------
+        time_vector : array like
+            all time stamps to be sampled
+
+        Returns
+        -------
+        numpy array
+            sampled errors for time vector
+
+        """
+        raise NotImplementedError
+
+    def sample_batch(self, time_vector, n_series):
+        """Samples independent series for all time points in input
+
+        Generators override this to draw all series at once; the default
+        calls sample_vectorized once per series.
+
+        Parameters
+        ----------
+        time_vector : array like
+            all time stamps to be sampled
+        n_series : int
+            number of independent series
+
+        Returns
+        -------
+        numpy array
+            sampled errors of shape (n_series, len(time_vector))
+
+        """
+        return np.stack([self.sample_vectorized(time_vector) for _ in range(n_series)]).reshape(n_series, -1)
@@ -1,8 +1,9 @@
 import numpy as np
 from .base_noise import BaseNoise
+from .._utils import as_parameter, check_random_state, covariance_factor
 
 
-__all__ = ['GaussianNoise']
+__all__ = ['GaussianNoise', 'CorrelatedGaussianNoise']
 
 
 class GaussianNoise(BaseNoise):
@@ -11,21 +12,73 @@ class GaussianNoise(BaseNoise):
 
     Attributes
     ----------
-    mean : float
+    mean : float or array-like
         mean for the noise
-    std : float
+    std : float or array-like
         standard deviation for the noise
+    random_state : None, int, Generator or RandomState (default None)
+        Source of random numbers; None uses the global np.random state
+
+    Array-valued mean and std are broadcast against each other, and samples
+    get shape (len(time_vector), *channels).
 
     """
 
-    def __init__(self, mean=0, std=1.):
+    def __init__(self, mean=0, std=1., random_state=None):
         self.vectorizable = True
-        self.mean = mean
-        self.std = std
+        self.mean = as_parameter(mean)
+        self.std = as_parameter(std)
+        self.random_state = check_random_state(random_state)
 
     def sample_next(self, t, samples, errors):
-        return np.random.normal(loc=self.mean, scale=self.std, size=1)
+        return self.random_state.normal(loc=self.mean, scale=self.std, size=self._channels() or 1)
 
     def sample_vectorized(self, time_vector):
         n_samples = len(time_vector)
-        return np.random.normal(loc=self.mean, scale=self.std, size=n_samples)
+        return self.random_state.normal(loc=self.mean, scale=self.std, size=(n_samples,) + self._channels())
+
+    def sample_batch(self, time_vector, n_series):
+        n_samples = len(time_vector)
+        return self.random_state.normal(loc=self.mean, scale=self.std,
+                                        size=(n_series, n_samples) + self._channels())
+
+    def _channels(self):
+        """Internal method returning the shape of the channels, () for a single channel."""
+        return np.broadcast(self.mean, self.std).shape
+
+
+class CorrelatedGaussianNoise(BaseNoise):
+    """Gaussian noise generator for several channels.
+    This class adds white noise that is correlated across channels; samples
+    have shape (len(time_vector), n_channels).
+
+    Attributes
+    ----------
+    covariance : array-like
+        covariance between the channels, factorized once
+    mean : float or array-like
+        mean for the noise, per channel if an array
+    random_state : None, int, Generator or RandomState (default None)
+        Source of random numbers; None uses the global np.random state
+
+    """
+
+    def __init__(self, covariance, mean=0., random_state=None):
+        self.vectorizable = True
+        self.covariance = np.asarray(covariance, dtype=float)
+        if self.covariance.ndim != 2 or self.covariance.shape[0] != self.covariance.shape[1]:
+            raise ValueError("covariance must be a square matrix")
+        self.n_channels = self.covariance.shape[0]
+        self.covariance_factor = covariance_factor(self.covariance, self.n_channels)
+        self.mean = mean
+        self.random_state = check_random_state(random_state)
+
+    def sample_next(self, t, samples, errors):
+        return self.sample_vectorized(np.array([t]))[0]
+
+    def sample_vectorized(self, time_vector):
+        return self.sample_batch(time_vector, 1)[0]
+
+    def sample_batch(self, time_vector, n_series):
+        size = (n_series, len(time_vector), self.n_channels)
+        return self.random_state.normal(size=size) @ self.covariance_factor.T + self.mean
@@ -1,5 +1,6 @@
 import numpy as np
 from .base_noise import BaseNoise
+from .._utils import check_random_state, linear_recurrence
 
 
 __all__ = ['RedNoise']
@@ -16,17 +17,22 @@ class RedNoise(BaseNoise):
     std : float
         standard deviation for the noise
     tau : float
-        ?
+        correlation time of the noise
     start_value : float
-        ?
+        value of the noise at the first time stamp
+    random_state : None, int, Generator or RandomState (default None)
+        Source of random numbers; None uses the global np.random state
 
     """
 
-    def __init__(self, mean=0, std=1., tau=0.2, start_value=0):
-        self.vectorizable = False
+    stateful = True
+
+    def __init__(self, mean=0, std=1., tau=0.2, start_value=0, random_state=None):
+        self.vectorizable = True
+        self.random_state = check_random_state(random_state)
         self.mean = mean
         self.std = std
-        self.start_value = 0
+        self.start_value = start_value
         self.tau = tau
         self.previous_value = None
         self.previous_time = None
@@ -36,9 +42,83 @@ class RedNoise(BaseNoise):
             red_noise = self.start_value
         else:
             time_diff = t - self.previous_time
-            wnoise = np.random.normal(loc=self.mean, scale=self.std, size=1)
+            wnoise = self.random_state.normal(loc=self.mean, scale=self.std, size=1)
             red_noise = ((self.tau/(self.tau + time_diff)) *
                          (time_diff*wnoise + self.previous_value))
         self.previous_time = t
         self.previous_value =red_noise
         return red_noise
+
+    def sample_vectorized(self, time_vector):
+        """Samples noise for all time points in input
+
+        The recurrence of sample_next is solved for all time differences at
+        once. The last time and value are stored, so later calls continue
+        the series.
+
+        Parameters
+        ----------
+        time_vector : array-like
+            Timestamps for noise generation
+
+        Returns
+        -------
+        numpy array
+            sampled noise for time vector
+
+        """
+        time_vector = np.asarray(time_vector, dtype=float)
+        if len(time_vector) == 0:
+            return np.zeros(0)
+
+        if self.previous_time is None:
+            previous_time = time_vector[0]
+            previous_value = self.start_value
+            step_times = time_vector[1:]
+        else:
+            previous_time = self.previous_time
+            previous_value = float(np.ravel(self.previous_value)[0])
+            step_times = time_vector
+
+        time_diff = np.diff(step_times, prepend=previous_time)
+        wnoise = self.random_state.normal(loc=self.mean, scale=self.std, size=len(step_times))
+        decay = self.tau/(self.tau + time_diff)
+        red_noise = linear_recurrence(decay, decay*time_diff*wnoise, previous_value)
+        if len(step_times) < len(time_vector):
+            red_noise = np.concatenate(([previous_value], red_noise))
+
+        self.previous_time = time_vector[-1]
+        self.previous_value = red_noise[-1]
+        return red_noise
+
+    def sample_batch(self, time_vector, n_series):
+        """Samples independent noise series for all time points in input
+
+        Every series starts from start_value and the recurrence is solved
+        across the batch dimension at once. The state used by sample_next and
+        sample_vectorized is left untouched.
+
+        Parameters
+        ----------
+        time_vector : array-like
+            Timestamps for noise generation
+        n_series : int
+            Number of series
+
+        Returns
+        -------
+        numpy array
+            sampled noise of shape (n_series, len(time_vector))
+
+        """
+        time_vector = np.asarray(time_vector, dtype=float)
+        red_noise = np.empty((n_series, len(time_vector)))
+        if len(time_vector) == 0:
+            return red_noise
+
+        time_diff = np.diff(time_vector)
+        wnoise = self.random_state.normal(loc=self.mean, scale=self.std, size=(n_series, len(time_vector) - 1))
+        decay = self.tau/(self.tau + time_diff)
+        red_noise[:, 0] = self.start_value
+        red_noise[:, 1:] = linear_recurrence(decay, decay*time_diff*wnoise, red_noise[:, 0])
+        return red_noise
@@ -0,0 +1,198 @@
+import contextvars
+import logging
+import time
+import tracemalloc
+
+__all__ = ['Profiler']
+
+# Active profilers, and the stages currently being timed (innermost last), of
+# the current thread or asyncio task
+_profilers = contextvars.ContextVar('timesynth_profilers', default=())
+_stages = contextvars.ContextVar('timesynth_stages', default=())
+
+
+class Profiler:
+    """Records where the time of sampling calls goes, while it is active.
+
+    Used as a context manager, the profiler records one entry per stage of
+    every TimeSeries.sample and TimeSeries.sample_batch call made inside the
+    with block: the whole call ('sample' or 'sample_batch'), the vectorized
+    or chunked sampling of the signal and of the noise ('signal', 'noise'),
+    the step-by-step loop over iterative generators ('iterative'), and the
+    construction of covariances in GaussianProcess ('covariance'). Without an
+    active profiler, the stages cost one lookup each.
+
+    Profilers are tied to the thread (or asyncio task) that enters them and
+    only record the sampling calls made there, so series can be profiled
+    concurrently in several threads.
+
+    Every record is a dict with the keys
+
+    * stage: name of the stage
+    * generator: class name of the generator, or None
+    * path: execution path ('vectorized', 'chunked', 'iterative') or, for
+      'covariance', the GaussianProcess method; None for whole calls
+    * n_points: number of time points
+    * time: wall time in seconds
+    * bytes: peak memory allocated during the stage, or None unless
+      trace_memory is set
+    * depth: nesting level, 0 for the outermost stage
+
+    Records are appended when their stage ends, so nested stages come before
+    the stage that contains them.
+
+    Parameters
+    ----------
+    callback : callable or None (default None)
+        Called with every record as it is made
+    trace_memory : bool (default False)
+        Measure allocations with tracemalloc, which slows down sampling
+        considerably. Tracing is started and stopped with the profiler, and
+        the tracemalloc peak is reset at the start of every stage. If tracing
+        was already running, the caller's peak is left untouched and 'bytes'
+        is None. Allocations are traced for the whole process, so they include
+        those of other threads sampling at the same time.
+
+    """
+
+    def __init__(self, callback=None, trace_memory=False):
+        self.callback = callback
+        self.trace_memory = trace_memory
+        self.records = []
+        self._started_tracing = False
+
+    def __enter__(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        _profilers.set(_profilers.get() + (self,))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _profilers.set(tuple(profiler for profiler in _profilers.get() if profiler is not self))
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return False
+
+    def to_dict(self):
+        """Records and per-stage totals
+
+        Returns
+        -------
+        dict
+            'records' is the list of records, 'stages' maps every stage to its
+            number of calls, total time and total number of points
+
+        """
+        stages = {}
+        for record in self.records:
+            total = stages.setdefault(record['stage'], {'calls': 0, 'time': 0., 'n_points': 0})
+            total['calls'] += 1
+            total['time'] += record['time']
+            total['n_points'] += record['n_points']
+        return {'records': list(self.records), 'stages': stages}
+
+    def log(self, logger=None, level=logging.INFO):
+        """Logs every record on its own line
+
+        Parameters
+        ----------
+        logger : logging.Logger or None (default None)
+            Logger to write to, the 'timesynth.profiling' logger if None
+        level : int (default logging.INFO)
+            Logging level of the messages
+
+        """
+        logger = logging.getLogger(__name__) if logger is None else logger
+        for record in self.records:
+            logger.log(level, "%s%s generator=%s path=%s n_points=%d time=%.6fs bytes=%s",
+                       '  ' * record['depth'], record['stage'], record['generator'], record['path'],
+                       record['n_points'], record['time'], record['bytes'])
+
+    def _record(self, record):
+        """Internal method storing a record and passing it to the callback."""
+        self.records.append(record)
+        if self.callback is not None:
+            self.callback(record)
+
+
+class _NullStage:
+    """Internal context manager doing nothing, used while no profiler is active."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """Internal context manager timing one stage for the active profilers."""
+
+    def __init__(self, name, n_points, path, generator, profilers):
+        self.name = name
+        self.n_points = n_points
+        self.path = path
+        self.generator = generator
+        self.profilers = profilers
+
+    def __enter__(self):
+        stages = _stages.get()
+        self.depth = len(stages)
+        self.parent = stages[-1] if stages else None
+        self.token = _stages.set(stages + (self,))
+        # Peak memory of nested stages, which reset the tracemalloc peak. The
+        # peak is only reset while tracing was started by a profiler.
+        self.peak = 0
+        self.memory = None
+        if tracemalloc.is_tracing() and any(profiler._started_tracing for profiler in self.profilers):
+            self.memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        elapsed = time.perf_counter() - self.start
+        _stages.reset(self.token)
+        allocated = None
+        if self.memory is not None and tracemalloc.is_tracing():
+            peak = max(tracemalloc.get_traced_memory()[1], self.peak)
+            allocated = peak - self.memory
+            if self.parent is not None:
+                self.parent.peak = max(self.parent.peak, peak)
+        record = {'stage': self.name,
+                  'generator': None if self.generator is None else type(self.generator).__name__,
+                  'path': self.path, 'n_points': self.n_points, 'time': elapsed, 'bytes': allocated,
+                  'depth': self.depth}
+        for profiler in self.profilers:
+            profiler._record(dict(record))
+        return False
+
+
+def stage(name, n_points, path=None, generator=None):
+    """Context manager recording a stage for the active profilers (see Profiler).
+
+    Parameters
+    ----------
+    name : str
+        Name of the stage
+    n_points : int
+        Number of time points
+    path : str or None (default None)
+        Execution path of the stage
+    generator : Signal or Noise object or None (default None)
+        Generator sampled in the stage
+
+    Returns
+    -------
+    context manager
+
+    """
+    profilers = _profilers.get()
+    if not profilers:
+        return _NULL_STAGE
+    return _Stage(name, n_points, path, generator, profilers)
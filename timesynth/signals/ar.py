@@ -1,5 +1,7 @@
 import numpy as np
+import scipy.signal
 from .base_signal import BaseSignal
+from .._utils import as_parameter, check_random_state
 
 __all__ = ['AutoRegressive']
 
@@ -12,29 +14,42 @@ class AutoRegressive(BaseSignal):
     
     Parameters
     ----------
-    ar_param : list (default [None])
+    ar_param : list or array-like (default [None])
         Parameter of the AR(p) process
-        [phi_1, phi_2, phi_3, .... phi_p]
-    sigma : float (default 1.0)
+        [phi_1, phi_2, phi_3, .... phi_p], or an array of shape (*channels, p)
+        with one set of parameters per channel
+    sigma : float or array-like (default 1.0)
         Standard deviation of the signal
     start_value : list (default [None])
         Starting value of the AR(p) process
+    random_state : None, int, Generator or RandomState (default None)
+        Source of random numbers; None uses the global np.random state
+
+    Array-valued parameters are broadcast against each other, and samples get
+    shape (len(time_vector), *channels).
         
     """
+
+    stateful = True
     
-    def __init__(self, ar_param=[None], sigma=0.5, start_value=[None]):
-        self.vectorizable = False
-        ar_param.reverse()
-        self.ar_param = ar_param
-        self.sigma = sigma
+    def __init__(self, ar_param=[None], sigma=0.5, start_value=[None], random_state=None):
+        self.vectorizable = True
+        self.random_state = check_random_state(random_state)
+        self.sigma = as_parameter(sigma)
+        # Parameters are stored in reverse, matching the lags from oldest to newest
+        if np.ndim(ar_param) > 1 or np.ndim(sigma) > 0:
+            self.ar_param = np.asarray(ar_param, dtype=float)[..., ::-1]
+        else:
+            self.ar_param = list(ar_param)[::-1]
+        order = np.shape(self.ar_param)[-1]
         if start_value[0] is None:
-            self.start_value = [0 for i in range(len(ar_param))]
+            self.start_value = [0 for i in range(order)]
         else:
-            if len(start_value) != len(ar_param):
+            if len(start_value) != order:
                 raise ValueError("AR parameters do not match starting value")
             else:
-                self.start_value = start_value
-        self.previous_value = self.start_value
+                self.start_value = list(start_value)
+        self.previous_value = self._start_lags() if self._channels() else self.start_value
 
     def sample_next(self, time, samples, errors):
         """Sample a single time point
@@ -49,8 +64,131 @@ class AutoRegressive(BaseSignal):
         ar_value : float
             sampled signal for time t
         """
+        if self._channels():
+            return self.sample_vectorized(np.array([time]))[0]
         ar_value = [self.previous_value[i] * self.ar_param[i] for i in range(len(self.ar_param))]
-        noise = np.random.normal(loc=0.0, scale=self.sigma, size=1)
+        noise = self.random_state.normal(loc=0.0, scale=self.sigma, size=1)
         ar_value = np.sum(ar_value) + noise
-        self.previous_value = self.previous_value[1:]+[ar_value]
+        self.previous_value = self.previous_value[1:]+[float(ar_value[0])]
         return ar_value
+
+    def sample_vectorized(self, time_vector):
+        """Samples for all time points in input
+
+        All innovations are drawn in a single call and the recursion is run as
+        one IIR filter pass, seeded with the current lags. The last p values
+        are stored, so later calls continue the series.
+
+        Parameters
+        ----------
+        time_vector : array like
+            all time stamps to be sampled
+
+        Returns
+        -------
+        numpy array
+            samples for times provided in time_vector
+
+        """
+        n_samples = len(time_vector)
+        channels = self._channels()
+        if channels:
+            noise = self.random_state.normal(loc=0.0, scale=self.sigma, size=(n_samples,) + channels)
+            # The recursion runs with time on the last axis, so every channel is contiguous
+            noise = np.ascontiguousarray(noise.reshape(n_samples, -1).T)
+            ar_values = self._recursion(noise[None], self.previous_value)[0]
+            # Keep the last p values of every channel as its lags
+            order = self.previous_value.shape[-1]
+            if n_samples < order:
+                ar_values = np.concatenate((self.previous_value.reshape(-1, order), ar_values), axis=-1)
+            self.previous_value = ar_values[:, -order:].reshape(channels + (order,)).copy()
+            return ar_values[:, -n_samples:].T.reshape((n_samples,) + channels)
+
+        order = len(self.ar_param)
+        noise = self.random_state.normal(loc=0.0, scale=self.sigma, size=n_samples)
+
+        # y[k] - phi_1 y[k-1] - ... - phi_p y[k-p] = noise[k]
+        denominator = np.concatenate(([1.], -np.array(self.ar_param[::-1], dtype=float)))
+        previous_value = np.ravel(self.previous_value).astype(float)
+        initial_state = scipy.signal.lfiltic([1.], denominator, y=previous_value[::-1])
+        ar_values, _ = scipy.signal.lfilter([1.], denominator, noise, zi=initial_state)
+
+        history = np.concatenate((previous_value, ar_values))
+        self.previous_value = list(history[len(history) - order:])
+        return ar_values
+
+    def sample_batch(self, time_vector, n_series):
+        """Samples independent series for all time points in input
+
+        Every series starts from start_value and the recursion runs across
+        the batch dimension in one filter pass. The state used by
+        sample_next and sample_vectorized is left untouched.
+
+        Parameters
+        ----------
+        time_vector : array like
+            all time stamps to be sampled
+        n_series : int
+            number of independent series
+
+        Returns
+        -------
+        numpy array
+            samples of shape (n_series, len(time_vector), *channels)
+
+        """
+        if self._channels():
+            size = (n_series, len(time_vector)) + self._channels()
+            noise = self.random_state.normal(loc=0.0, scale=self.sigma, size=size)
+            noise = np.ascontiguousarray(np.swapaxes(noise.reshape(n_series, len(time_vector), -1), 1, 2))
+            return np.swapaxes(self._recursion(noise, self._start_lags()), 1, 2).reshape(size)
+
+        noise = self.random_state.normal(loc=0.0, scale=self.sigma, size=(n_series, len(time_vector)))
+        denominator = np.concatenate(([1.], -np.array(self.ar_param[::-1], dtype=float)))
+        start_value = np.ravel(self.start_value).astype(float)
+        initial_state = scipy.signal.lfiltic([1.], denominator, y=start_value[::-1])
+        ar_values, _ = scipy.signal.lfilter([1.], denominator, noise, axis=-1,
+                                            zi=np.tile(initial_state, (n_series, 1)))
+        return ar_values
+
+    def _channels(self):
+        """Internal method returning the shape of the channels, () for a single channel."""
+        if isinstance(self.ar_param, list):
+            return ()
+        return np.broadcast_shapes(self.ar_param.shape[:-1], np.shape(self.sigma))
+
+    def _start_lags(self):
+        """Internal method returning start_value as lags of shape (*channels, p)."""
+        return np.broadcast_to(np.asarray(self.start_value, dtype=float),
+                               self._channels() + (len(self.start_value),))
+
+    def _recursion(self, noise, previous_value):
+        """Internal method solving the AR recursion for array-valued parameters.
+
+        Solves along the last axis of noise, of shape (n_series, n_channels, n_samples),
+        starting from the lags previous_value of shape (*channels, p). Channels
+        are grouped by their coefficients and every group is solved with one IIR
+        filter pass, so the number of Python calls grows with the number of
+        distinct coefficient sets, not with the number of points.
+        """
+        order = self.ar_param.shape[-1]
+        channels = self._channels()
+        coefficients = np.broadcast_to(self.ar_param, channels + (order,)).reshape(-1, order)
+        # Lags of every channel, most recent first as expected by the filter
+        lags = np.broadcast_to(previous_value, channels + (order,)).reshape(-1, order)[:, ::-1]
+
+        unique_coefficients, group = np.unique(coefficients, axis=0, return_inverse=True)
+        group = group.ravel()
+        values = np.empty_like(noise)
+        for index, phi in enumerate(unique_coefficients):
+            members = slice(None) if len(unique_coefficients) == 1 else group == index
+            # y[k] - phi_1 y[k-1] - ... - phi_p y[k-p] = noise[k]
+            denominator = np.concatenate(([1.], -phi[::-1]))
+            # Filter state for the given past outputs (as scipy.signal.lfiltic, for all channels at once)
+            initial_state = np.zeros((lags[members].shape[0], order))
+            for m in range(order):
+                initial_state[:, m] = -lags[members, :order - m] @ denominator[m + 1:]
+            initial_state = np.broadcast_to(initial_state, (noise.shape[0],) + initial_state.shape)
+            values[:, members], _ = scipy.signal.lfilter([1.], denominator, noise[:, members], axis=-1,
+                                                         zi=initial_state)
+        return values
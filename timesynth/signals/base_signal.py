@@ -1,13 +1,114 @@
+import numpy as np
+
 __all__ = []
 
 
-class BaseSignal:
+class _Algebra:
+    """Operators that combine signals and noises into expressions.
+
+    The expression nodes live in timesynth.signals.composite, which is
+    imported lazily as it depends on BaseSignal.
+    """
+
+    # Let numpy scalars and arrays defer to the reflected operators
+    __array_ufunc__ = None
+
+    def __add__(self, other):
+        from .composite import _add
+        return _add(self, other)
+
+    def __radd__(self, other):
+        from .composite import _add
+        return _add(other, self)
+
+    def __sub__(self, other):
+        from .composite import _add
+        return _add(self, other, -1.)
+
+    def __rsub__(self, other):
+        from .composite import _add
+        return _add(other, self, -1.)
+
+    def __mul__(self, other):
+        from .composite import _multiply
+        return _multiply(self, other)
+
+    def __rmul__(self, other):
+        from .composite import _multiply
+        return _multiply(other, self)
+
+    def __neg__(self):
+        from .composite import Sum
+        return Sum(self, coefficients=(-1.,))
+
+    def time_warp(self, function=None, scale=1., shift=0.):
+        """Signal evaluated at transformed times (see composite.TimeWarp)
+
+        Parameters
+        ----------
+        function : callable or None (default None)
+            Vectorized, increasing warp of the time vector; scale * t + shift if None
+        scale : number (default 1.0)
+            Time scale of the affine warp
+        shift : number (default 0.0)
+            Time shift of the affine warp
+
+        Returns
+        -------
+        TimeWarp
+
+        """
+        from .composite import TimeWarp
+        return TimeWarp(self, function=function, scale=scale, shift=shift)
+
+    def switch(self, other, time):
+        """Switches to another signal at the given time (see composite.Piecewise)
+
+        Parameters
+        ----------
+        other : Signal or Noise object
+            Signal used from time on
+        time : number
+            Switching time
+
+        Returns
+        -------
+        Piecewise
+
+        """
+        from .composite import Piecewise
+        return Piecewise((self, other), (time,))
+
+    def _evaluate(self, context):
+        """Internal method to sample a leaf of an expression (see composite.evaluate)."""
+        if context.n_series is None:
+            return self.sample_vectorized(context.time_vector)
+        return self.sample_batch(context.time_vector, context.n_series)
+
+
+class BaseSignal(_Algebra):
     """BaseSignal class
 
-    Signature for all signal classes.
+    Signature for all signal classes. Signals and noises can be combined with
+    +, -, * and the time_warp and switch methods into expressions that are
+    evaluated in a single pass (see timesynth.signals.composite).
+
+    Attributes
+    ----------
+    vectorizable : bool
+        whether the signal can be sampled for a whole time vector at once
+    stateful : bool
+        whether consecutive calls to sample_vectorized continue a single series,
+        so that the signal can be sampled in chunks
+    streamable : bool
+        whether consecutive chunks sampled with sample_vectorized form a
+        single series, so that the signal can be streamed
 
     """
 
+    stateful = False
+    streamable = True
+
     def __init__(self):
         raise NotImplementedError
 
@@ -34,6 +135,10 @@ class BaseSignal:
     def sample_vectorized(self, time_vector):
         """Samples for all time points in input
 
+        Implementations return a new array, which the generator must not keep
+        (e.g. as a view for its state): callers, such as MultiChannelTimeSeries,
+        hand it on without copying.
+
         Parameters
         ----------
         time_vector : array like
@@ -46,3 +151,24 @@ class BaseSignal:
 
         """
         raise NotImplementedError
+
+    def sample_batch(self, time_vector, n_series):
+        """Samples independent series for all time points in input
+
+        Generators override this to draw all series at once; the default
+        calls sample_vectorized once per series.
+
+        Parameters
+        ----------
+        time_vector : array like
+            all time stamps to be sampled
+        n_series : int
+            number of independent series
+
+        Returns
+        -------
+        numpy array
+            sampled signals of shape (n_series, len(time_vector))
+
+        """
+        return np.stack([self.sample_vectorized(time_vector) for _ in range(n_series)]).reshape(n_series, -1)
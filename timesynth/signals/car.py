@@ -1,5 +1,6 @@
 import numpy as np
 from .base_signal import BaseSignal
+from .._utils import as_parameter, check_random_state, linear_recurrence
 
 __all__ = ['CAR']
 
@@ -7,22 +8,33 @@ __all__ = ['CAR']
 class CAR(BaseSignal):
     """Signal generatpr for continuously autoregressive (CAR) signals.
 
+    Supports irregularly sampled time vectors: the decay between two samples
+    is ar_param to the power of their time difference.
+
     Parameters
     ----------
-    ar_param : number (default 1.0)
+    ar_param : number or array-like (default 1.0)
         Parameter of the AR(1) process
-    sigma : number (default 1.0)
+    sigma : number or array-like (default 1.0)
         Standard deviation of the signal
-    start_value : number (default 0.0)
+    start_value : number or array-like (default 0.0)
         Starting value of the AR process
+    random_state : None, int, Generator or RandomState (default None)
+        Source of random numbers; None uses the global np.random state
+
+    Array-valued parameters are broadcast against each other, and samples get
+    shape (len(time_vector), *channels).
         
     """
 
-    def __init__(self, ar_param=1.0, sigma=0.5, start_value=0.01):
-        self.vectorizable = False
-        self.ar_param = ar_param
-        self.sigma = sigma
-        self.start_value = start_value
+    stateful = True
+
+    def __init__(self, ar_param=1.0, sigma=0.5, start_value=0.01, random_state=None):
+        self.vectorizable = True
+        self.random_state = check_random_state(random_state)
+        self.ar_param = as_parameter(ar_param)
+        self.sigma = as_parameter(sigma)
+        self.start_value = as_parameter(start_value)
         self.previous_value = None
         self.previous_time = None
 
@@ -40,13 +52,97 @@ class CAR(BaseSignal):
             sampled signal for time t
 
         """
+        if self._channels():
+            return self.sample_vectorized(np.array([time]))[0]
         if self.previous_value is None:
             output = self.start_value
         else:
             time_diff = time - self.previous_time
-            noise = np.random.normal(loc=0.0, scale=1.0, size=1)
+            noise = self.random_state.normal(loc=0.0, scale=1.0, size=1)
             output = (np.power(self.ar_param, time_diff))*self.previous_value+\
                 self.sigma*np.sqrt(1-np.power(self.ar_param, time_diff))*noise
         self.previous_time = time
         self.previous_value = output
         return output
+
+    def sample_vectorized(self, time_vector):
+        """Sample entire series based off of time vector
+
+        Decay factors for all time differences are computed in one pass and
+        the resulting linear recurrence is solved with a vectorized scan.
+        The last time and value are stored, so later calls continue the series.
+
+        Parameters
+        ----------
+        time_vector : array-like
+            Timestamps for signal generation, possibly irregularly spaced
+
+        Returns
+        -------
+        array-like
+            sampled signal for time vector
+
+        """
+        time_vector = np.asarray(time_vector, dtype=float)
+        channels = self._channels()
+        if len(time_vector) == 0:
+            return np.zeros((0,) + channels)
+
+        if self.previous_value is None:
+            # The first sample is the starting value itself
+            previous_time = time_vector[0]
+            previous_value = np.broadcast_to(self.start_value, channels)
+            step_times = time_vector[1:]
+        else:
+            previous_time = self.previous_time
+            previous_value = np.reshape(self.previous_value, channels)
+            step_times = time_vector
+
+        # Samples are computed with time on the last axis and moved to the front
+        time_diff = np.diff(step_times, prepend=previous_time)
+        decay = np.power(np.expand_dims(self.ar_param, -1), time_diff)
+        noise = self.random_state.normal(loc=0.0, scale=1.0, size=channels + (len(step_times),))
+        values = linear_recurrence(decay, np.expand_dims(self.sigma, -1)*np.sqrt(1-decay)*noise, previous_value)
+        if len(step_times) < len(time_vector):
+            values = np.concatenate((np.expand_dims(previous_value, -1), values), axis=-1)
+
+        self.previous_time = time_vector[-1]
+        self.previous_value = values[..., -1].copy()
+        return np.moveaxis(values, -1, 0)
+
+    def sample_batch(self, time_vector, n_series):
+        """Sample independent series based off of time vector
+
+        Every series starts from start_value and the recurrence is solved
+        across the batch dimension at once. The state used by sample_next and
+        sample_vectorized is left untouched.
+
+        Parameters
+        ----------
+        time_vector : array-like
+            Timestamps for signal generation
+        n_series : int
+            Number of series
+
+        Returns
+        -------
+        array-like
+            sampled signals of shape (n_series, len(time_vector), *channels)
+
+        """
+        time_vector = np.asarray(time_vector, dtype=float)
+        channels = self._channels()
+        values = np.empty((n_series, len(time_vector)) + channels)
+        if len(time_vector) == 0:
+            return values
+
+        decay = np.power(np.expand_dims(self.ar_param, -1), np.diff(time_vector))
+        noise = self.random_state.normal(loc=0.0, scale=1.0, size=(n_series,) + channels + (len(time_vector) - 1,))
+        values[:, 0] = self.start_value
+        steps = linear_recurrence(decay, np.expand_dims(self.sigma, -1)*np.sqrt(1-decay)*noise, values[:, 0])
+        values[:, 1:] = np.moveaxis(steps, -1, 1)
+        return values
+
+    def _channels(self):
+        """Internal method returning the shape of the channels, () for a single channel."""
+        return np.broadcast(self.ar_param, self.sigma, self.start_value).shape
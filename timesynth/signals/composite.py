@@ -0,0 +1,363 @@
+import numbers
+import numpy as np
+from .base_signal import BaseSignal
+
+__all__ = ['Constant', 'Sum', 'Product', 'TimeWarp', 'Piecewise', 'evaluate']
+
+
+def evaluate(expression, time_vector, n_series=None):
+    """Evaluates an expression of signals and noises in a single pass.
+
+    Every node of the expression tree is evaluated once per call, even if it
+    occurs several times, and sums and products accumulate in place into one
+    buffer per node. Derived time arrays such as 2*pi*t are computed once and
+    shared between the leaves (see Sinusoidal).
+
+    Parameters
+    ----------
+    expression : Signal or Noise object
+        Root of the expression tree, usually built with +, -, * and the
+        time_warp and switch methods of signals and noises
+    time_vector : array-like
+        Timestamps for signal generation
+    n_series : int or None (default None)
+        If given, samples n_series independent series with sample_batch
+
+    Returns
+    -------
+    numpy array
+        samples of shape (len(time_vector),) or (n_series, len(time_vector))
+
+    """
+    counts = {}
+    _count_references(expression, counts)
+    context = _Context(time_vector, n_series, counts)
+    value = context.evaluate(expression)
+    if np.shape(value) != context.shape:
+        value = np.broadcast_to(value, context.shape).astype(float)
+    return value
+
+
+def _count_references(node, counts):
+    """Internal function counting how often every node occurs in an expression tree."""
+    counts[id(node)] = counts.get(id(node), 0) + 1
+    if counts[id(node)] == 1 and isinstance(node, Composite):
+        for child in node.children:
+            _count_references(child, counts)
+
+
+class _Context:
+    """Internal state of one evaluation over one time vector."""
+
+    def __init__(self, time_vector, n_series, counts):
+        self.time_vector = time_vector
+        self.n_series = n_series
+        self.shape = (len(time_vector),) if n_series is None else (n_series, len(time_vector))
+        self.counts = counts
+        self._results = {}
+        self._derived = {}
+
+    def evaluate(self, node):
+        """Value of node, computed once for nodes that occur several times."""
+        key = id(node)
+        if key in self._results:
+            return self._results[key]
+        value = node._evaluate(self)
+        if self.counts.get(key, 0) > 1:
+            self._results[key] = value
+        return value
+
+    def owns(self, node):
+        """Whether the value of node is a buffer that the caller may overwrite."""
+        return isinstance(node, (Sum, Product, Piecewise)) and self.counts.get(id(node), 0) == 1
+
+    def derived(self, name, function):
+        """Array function(time_vector), computed once per name."""
+        if name not in self._derived:
+            self._derived[name] = np.asarray(function(self.time_vector), dtype=float)
+        return self._derived[name]
+
+    def child(self, time_vector):
+        """Context for the evaluation of subtrees over another time vector."""
+        return _Context(time_vector, self.n_series, self.counts)
+
+
+class Composite(BaseSignal):
+    """Base class for the nodes of signal expressions.
+
+    A node is vectorizable if all of its children are, stateful if any of them
+    is, and streamable if all of them are.
+
+    Parameters
+    ----------
+    children : iterable of Signal or Noise objects
+        Operands of the node
+
+    """
+
+    def __init__(self, children):
+        self.children = tuple(children)
+        self.vectorizable = all(child.vectorizable for child in self.children)
+
+    @property
+    def stateful(self):
+        return any(child.stateful for child in self.children)
+
+    @property
+    def streamable(self):
+        return all(child.streamable for child in self.children)
+
+    def sample_vectorized(self, time_vector):
+        """Sample the expression for all time points in input (see evaluate)
+
+        Parameters
+        ----------
+        time_vector : array-like
+            Timestamps for signal generation
+
+        Returns
+        -------
+        array-like
+            sampled signal for time vector
+
+        """
+        return evaluate(self, time_vector)
+
+    def sample_batch(self, time_vector, n_series):
+        """Sample independent series of the expression (see evaluate)
+
+        Parameters
+        ----------
+        time_vector : array-like
+            Timestamps for signal generation
+        n_series : int
+            Number of series
+
+        Returns
+        -------
+        array-like
+            sampled signals of shape (n_series, len(time_vector))
+
+        """
+        return evaluate(self, time_vector, n_series)
+
+    def _evaluate(self, context):
+        raise NotImplementedError
+
+
+class Constant(Composite):
+    """Constant signal.
+
+    Parameters
+    ----------
+    value : number
+        Value of the signal
+
+    """
+
+    def __init__(self, value):
+        super().__init__(())
+        self.value = value
+
+    def sample_next(self, time, samples, errors):
+        return self.value
+
+    def _evaluate(self, context):
+        return self.value
+
+
+class Sum(Composite):
+    """Weighted sum of signals and noises.
+
+    Parameters
+    ----------
+    *terms : Signal or Noise objects
+        Terms of the sum; nested sums are flattened
+    coefficients : iterable of numbers or None (default None)
+        Weight of each term, 1 for all terms if None
+
+    """
+
+    def __init__(self, *terms, coefficients=None):
+        if coefficients is None:
+            coefficients = [1.] * len(terms)
+        flat_terms, flat_coefficients = [], []
+        for term, coefficient in zip(terms, coefficients):
+            if isinstance(term, Sum):
+                flat_terms.extend(term.children)
+                flat_coefficients.extend(coefficient * c for c in term.coefficients)
+            else:
+                flat_terms.append(term)
+                flat_coefficients.append(coefficient)
+        super().__init__(flat_terms)
+        self.coefficients = tuple(flat_coefficients)
+
+    def sample_next(self, time, samples, errors):
+        return sum(coefficient * term.sample_next(time, samples, errors)
+                   for coefficient, term in zip(self.coefficients, self.children))
+
+    def _evaluate(self, context):
+        output = None
+        for coefficient, term in zip(self.coefficients, self.children):
+            value = context.evaluate(term)
+            if output is None:
+                if context.owns(term) and np.shape(value) == context.shape:
+                    output = value
+                    if coefficient != 1:
+                        output *= coefficient
+                else:
+                    output = np.empty(context.shape)
+                    np.multiply(value, coefficient, out=output)
+            elif coefficient == 1:
+                output += value
+            elif context.owns(term):
+                value *= coefficient
+                output += value
+            else:
+                output += coefficient * value
+        if output is None:
+            output = np.zeros(context.shape)
+        return output
+
+
+class Product(Composite):
+    """Pointwise product of signals and noises, e.g. for amplitude modulation.
+
+    Parameters
+    ----------
+    *factors : Signal or Noise objects
+        Factors of the product; nested products are flattened
+
+    """
+
+    def __init__(self, *factors):
+        flat_factors = []
+        for factor in factors:
+            flat_factors.extend(factor.children if isinstance(factor, Product) else (factor,))
+        super().__init__(flat_factors)
+
+    def sample_next(self, time, samples, errors):
+        value = 1.
+        for factor in self.children:
+            value = value * factor.sample_next(time, samples, errors)
+        return value
+
+    def _evaluate(self, context):
+        output = None
+        for factor in self.children:
+            value = context.evaluate(factor)
+            if output is None:
+                if context.owns(factor) and np.shape(value) == context.shape:
+                    output = value
+                else:
+                    output = np.empty(context.shape)
+                    output[...] = value
+            else:
+                output *= value
+        if output is None:
+            output = np.ones(context.shape)
+        return output
+
+
+class TimeWarp(Composite):
+    """Signal evaluated at transformed times, f(t) = signal(warp(t)).
+
+    Parameters
+    ----------
+    signal : Signal or Noise object
+        Signal to warp
+    function : callable or None (default None)
+        Vectorized, increasing warp of the time vector. If None, the affine
+        warp scale * t + shift is used.
+    scale : number (default 1.0)
+        Time scale of the affine warp
+    shift : number (default 0.0)
+        Time shift of the affine warp
+
+    """
+
+    def __init__(self, signal, function=None, scale=1., shift=0.):
+        super().__init__((signal,))
+        self.function = function
+        self.scale = scale
+        self.shift = shift
+
+    def warp(self, time_vector):
+        """Transformed times"""
+        if self.function is not None:
+            return self.function(time_vector)
+        return self.scale * time_vector + self.shift
+
+    def sample_next(self, time, samples, errors):
+        return self.children[0].sample_next(self.warp(time), samples, errors)
+
+    def _evaluate(self, context):
+        return context.child(self.warp(context.time_vector)).evaluate(self.children[0])
+
+
+class Piecewise(Composite):
+    """Switches between signals at given times.
+
+    Signal i is used for breakpoints[i-1] <= t < breakpoints[i], and is only
+    sampled at these times.
+
+    Parameters
+    ----------
+    signals : iterable of Signal or Noise objects
+        Signals of the segments
+    breakpoints : iterable of numbers
+        Increasing switching times, one less than signals
+
+    """
+
+    def __init__(self, signals, breakpoints):
+        signals = tuple(signals)
+        breakpoints = np.asarray(breakpoints, dtype=float)
+        if len(breakpoints) != len(signals) - 1:
+            raise ValueError("Piecewise needs one breakpoint less than signals")
+        super().__init__(signals)
+        self.breakpoints = breakpoints
+
+    def sample_next(self, time, samples, errors):
+        segment = int(np.searchsorted(self.breakpoints, time, side='right'))
+        return self.children[segment].sample_next(time, samples, errors)
+
+    def _evaluate(self, context):
+        time_vector = np.asarray(context.time_vector)
+        segments = np.searchsorted(self.breakpoints, time_vector, side='right')
+        output = np.empty(context.shape)
+        for segment, signal in enumerate(self.children):
+            mask = segments == segment
+            if mask.any():
+                output[..., mask] = context.child(time_vector[mask]).evaluate(signal)
+        return output
+
+
+def _as_node(operand):
+    """Internal function wrapping numbers as Constant signals, or None for unsupported operands."""
+    if isinstance(operand, numbers.Number):
+        return Constant(operand)
+    if hasattr(operand, '_evaluate'):
+        return operand
+    return None
+
+
+def _add(left, right, sign=1.):
+    """Internal function building left + sign * right, or NotImplemented."""
+    left, right = _as_node(left), _as_node(right)
+    if left is None or right is None:
+        return NotImplemented
+    return Sum(left, right, coefficients=(1., sign))
+
+
+def _multiply(left, right):
+    """Internal function building left * right, or NotImplemented."""
+    if isinstance(right, numbers.Number):
+        left, right = right, left
+    if isinstance(left, numbers.Number):
+        node = _as_node(right)
+        return NotImplemented if node is None else Sum(node, coefficients=(left,))
+    left, right = _as_node(left), _as_node(right)
+    if left is None or right is None:
+        return NotImplemented
+    return Product(left, right)
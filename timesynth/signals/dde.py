@@ -1,5 +1,11 @@
+import atexit
+import collections
+import os
+import shutil
+import tempfile
 import warnings
 import numpy as np
+import symengine
 from .base_signal import BaseSignal
 with warnings.catch_warnings():
     warnings.simplefilter("ignore")
@@ -8,6 +14,18 @@ with warnings.catch_warnings():
 
 __all__ = ['MackeyGlass']
 
+# The Mackey-Glass system with its parameters as symbolic control parameters, so that it is lambdified only once
+_control_pars = symengine.symbols("tau n beta gamma")
+_tau, _n, _beta, _gamma = _control_pars
+_equations = [- _gamma * y(0) + _beta * y(0, t-_tau) / (1.0 + y(0, t-_tau) ** _n)]
+
+# Location of the system compiled to C, which serves all values of the control parameters; None until it is
+# compiled and False if it cannot be, in which case every instance lambdifies the system for the Python core
+_compiled_module = None
+# States after burn-in keyed by (tau, n, beta, gamma, initial_condition, burn_in), least recently used first
+_burn_in_states = collections.OrderedDict()
+_MAX_BURN_IN_STATES = 256
+
 
 class MackeyGlass(BaseSignal):
     """Signal generator for the Mackey-Glass delay differential equation (DDE).
@@ -37,15 +55,55 @@ class MackeyGlass(BaseSignal):
         will be used.
     burn_in : float (default 500)
         Amount of time after which samples will be taken and returned
+    state : list or None (default None)
+        A state returned by get_state, from which integration continues
+        instead of running the burn-in. Its times must be on the clock of an
+        instance with the same burn_in.
+    dense_output : bool (default True)
+        If True, sample_vectorized integrates once up to the last requested
+        time and evaluates the solver's cubic Hermite interpolant at all times
+        at once. If False, the integrator is called once per time stamp.
+
+    Notes
+    -----
+    The system of equations is compiled to C once, with tau, n, beta and gamma
+    as control parameters, and every instance loads its own integrator from
+    the compiled module; the states after burn-in of the most recently used
+    configurations are cached. Constructing further instances is therefore
+    nearly free. Without a C compiler, every instance falls back to a
+    lambdified Python integrator. Use MackeyGlass.clear_cache to release the
+    burn-in states.
 
     """
 
-    def __init__(self, tau=17., n=10., beta=0.2, gamma=0.1, initial_condition=None, burn_in=500):
+    stateful = True
+
+    def __init__(self, tau=17., n=10., beta=0.2, gamma=0.1, initial_condition=None, burn_in=500, state=None,
+                 dense_output=True):
         self.vectorizable = True
+        self.burn_in = burn_in
+        self.dense_output = dense_output
+        self.parameters = (tau, n, beta, gamma)
 
-        # Set system of equations
-        f = [- gamma * y(0) + beta * y(0, t-tau) / (1.0 + y(0, t-tau) ** n)]
-        self.dde = jitcdde(f)
+        # Set system of equations, from the compiled module if possible
+        module = _compile_module()
+        if module:
+            self.dde = jitcdde(n=len(_equations), control_pars=_control_pars, max_delay=tau,
+                               module_location=module, verbose=False)
+        else:
+            self.dde = jitcdde(_equations, control_pars=_control_pars, max_delay=tau, verbose=False)
+
+        # Restore a saved or cached state after burn-in if possible
+        if initial_condition is not None:
+            initial_condition = tuple(tuple(condition) for condition in initial_condition)
+        burn_in_key = self.parameters + (initial_condition, burn_in)
+        if state is None and burn_in_key in _burn_in_states:
+            _burn_in_states.move_to_end(burn_in_key)
+            state = _burn_in_states[burn_in_key]
+        if state is not None:
+            self.dde.add_past_points(_copy_anchors(state))
+            self._prepare_integrator()
+            return
 
         # Set initial condition
         if initial_condition is None:
@@ -60,12 +118,37 @@ class MackeyGlass(BaseSignal):
                 self.dde.add_past_point(time, np.array([value]), np.array([derivative]))
 
         # Prepare DDE
-        self.dde.generate_lambdas()
-        self.dde.set_integration_parameters()
+        self._prepare_integrator()
 
         # Run burn_in
-        self.burn_in = burn_in
         self.dde.integrate_blindly(self.burn_in)
+        _burn_in_states[burn_in_key] = self.get_state()
+        if len(_burn_in_states) > _MAX_BURN_IN_STATES:
+            _burn_in_states.popitem(last=False)
+
+    def get_state(self):
+        """Current state of the DDE integrator
+
+        Returns
+        -------
+        list
+            Anchors (time, value, derivative) of the past that defines the
+            current state, to be passed as `state` to a new instance.
+
+        """
+        return _copy_anchors(self.dde.get_state())
+
+    @staticmethod
+    def clear_cache():
+        """Remove all cached burn-in states."""
+        _burn_in_states.clear()
+
+    def _prepare_integrator(self):
+        """Internal method to set up the integrator of this instance."""
+        if not _compiled_module:
+            self.dde.generate_lambdas()
+        self.dde.set_parameters(*self.parameters)
+        self.dde.set_integration_parameters()
 
     def sample_next(self, time, samples, errors):
         """Samples next point based on history of samples and errors
@@ -101,7 +184,84 @@ class MackeyGlass(BaseSignal):
             samples for times provided in time_vector
 
         """
+        if self.dense_output:
+            return self._sample_dense(self.burn_in + np.asarray(time_vector, dtype=float))
         samples = []
         for t in time_vector:
             samples.append(self.dde.integrate(self.burn_in + t))
         return np.array(samples).reshape(-1,)
+
+    def _sample_dense(self, times):
+        """Internal method to integrate once over all times and interpolate the solution.
+
+        The integrator keeps the past only as far back as the delay, so the delay
+        it uses for forgetting is extended over the integration span meanwhile.
+        """
+        if len(times) == 0:
+            return np.zeros(0)
+        max_delay = self.dde.max_delay
+        self.dde.max_delay = max_delay + max(times.max() - self.dde.t, 0.)
+        try:
+            self.dde.integrate(times.max())
+            anchors = self.dde.get_state()
+        finally:
+            self.dde.max_delay = max_delay
+
+        anchor_times = np.array([anchor[0] for anchor in anchors])
+        values = np.array([anchor[1][0] for anchor in anchors])
+        derivatives = np.array([anchor[2][0] for anchor in anchors])
+        index = np.clip(np.searchsorted(anchor_times, times, side='right') - 1, 0, len(anchors) - 2)
+
+        # Cubic Hermite interpolation between neighbouring anchors, as in jitcdde
+        step = anchor_times[index + 1] - anchor_times[index]
+        x = (times - anchor_times[index]) / step
+        a = values[index]
+        b = derivatives[index] * step
+        c = values[index + 1]
+        d = derivatives[index + 1] * step
+        return (1-x) * ((1-x) * (b*x + (a-c)*(2*x+1)) - d*x**2) + c
+
+    def sample_batch(self, time_vector, n_series):
+        """Samples series for all time points in input
+
+        The DDE is deterministic, so it is integrated once and all series are
+        identical.
+
+        Parameters
+        ----------
+        time_vector : array like
+            all time stamps to be sampled
+        n_series : int
+            number of series
+
+        Returns
+        -------
+        numpy array
+            samples of shape (n_series, len(time_vector))
+
+        """
+        return np.tile(self.sample_vectorized(time_vector), (n_series, 1))
+
+
+def _copy_anchors(anchors):
+    """Internal function to copy a list of (time, state, derivative) anchors."""
+    return [(time, np.array(state, dtype=float), np.array(derivative, dtype=float))
+            for time, state, derivative in anchors]
+
+
+def _compile_module():
+    """Internal function compiling the system to C once, returning the location of the module or False."""
+    global _compiled_module
+    if _compiled_module is None:
+        directory = tempfile.mkdtemp(prefix='timesynth_mackey_glass_')
+        atexit.register(shutil.rmtree, directory, ignore_errors=True)
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                dde = jitcdde(_equations, control_pars=_control_pars, verbose=False)
+                dde.compile_C(verbose=False)
+                _compiled_module = dde.save_compiled(os.path.join(directory, 'mackey_glass.so'))
+        except Exception as error:
+            warnings.warn("MackeyGlass could not be compiled ({}), using the Python integrator".format(error))
+            _compiled_module = False
+    return _compiled_module
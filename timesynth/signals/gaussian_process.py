@@ -1,6 +1,11 @@
+import hashlib
+from collections import OrderedDict
 import numpy as np
+import scipy.linalg
 import scipy.special
 from .base_signal import BaseSignal
+from .._utils import check_random_state, matrix_linear_recurrence
+from ..profiling import stage
 
 __all__ = ['GaussianProcess']
 
@@ -29,6 +34,33 @@ class GaussianProcess(BaseSignal):
         the output variance of the gaussian process (sigma^2)
     lengthscale : float
             the characteristic lengthscale used to generate the covariance matrix
+    method : {'dense', 'circulant', 'rff', 'nystrom', 'state_space'} (default 'dense')
+        the sampling method:
+
+        - `dense`. Exact sampling from a factorization of the full covariance matrix, O(N^3)
+        - `circulant`. Exact sampling by FFT circulant embedding, O(N log N). Only applies to
+          stationary kernels on regular grids; falls back to `dense` for irregular grids, the
+          `Linear` kernel, or when the embedding is not positive semidefinite.
+        - `rff`. Approximate sampling with `n_components` random Fourier features, O(N M). Only
+          for the `SE`, `RQ`, `Matern` and `Exponential` (with gamma=1) kernels.
+        - `nystrom`. Approximate sampling with `n_components` evenly spaced inducing points, O(N M).
+        - `state_space`. Exact sampling from the equivalent linear stochastic differential equation,
+          O(N) with constant memory. Only for the `Exponential` (with gamma=1) and `Matern` (with
+          nu in 1/2, 3/2, 5/2) kernels. Consecutive calls continue the same series, which makes
+          the process stateful and streamable. `sample_next` uses this form for these kernels
+          regardless of the method.
+
+    n_components : int (default 100)
+        number of random features or inducing points (M) of the approximate methods;
+        larger values are more accurate
+
+    dtype : {np.float64, np.float32} (default np.float64)
+        floating point type of the covariance matrix; float32 halves its memory
+    cache_size : int (default 4)
+        number of covariance factorizations kept in a least-recently-used cache,
+        keyed by the time vector and the kernel parameters. Set to 0 to disable.
+    random_state : None, int, Generator or RandomState (default None)
+        Source of random numbers; None uses the global np.random state
     
     References
     ----------
@@ -37,20 +69,107 @@ class GaussianProcess(BaseSignal):
 
     """
 
-    def __init__(self, kernel="SE", lengthscale=1., mean=0., variance=1., c=1., gamma=1., alpha=1., offset=0., nu=5./2, p=1.):
+    def __init__(self, kernel="SE", lengthscale=1., mean=0., variance=1., c=1., gamma=1., alpha=1., offset=0., nu=5./2, p=1.,
+                 method="dense", n_components=100, dtype=np.float64, cache_size=4,
+                 random_state=None):
+        if kernel not in ("Constant", "Exponential", "SE", "RQ", "Linear", "Matern", "Periodic"):
+            raise ValueError("Unknown kernel: {}".format(kernel))
+        if method not in ("dense", "circulant", "rff", "nystrom", "state_space"):
+            raise ValueError("Unknown sampling method: {}".format(method))
+        if method == "rff" and (kernel not in ("SE", "RQ", "Matern", "Exponential") or
+                                (kernel == "Exponential" and gamma != 1)):
+            raise ValueError("Random Fourier features are not available for this kernel")
+        if method == "state_space" and not self._has_state_space(kernel, gamma, nu):
+            raise ValueError("No state-space form is available for this kernel")
         self.vectorizable = True
         self.lengthscale = lengthscale
         self.mean = mean
         self.variance = variance
         self.kernel = kernel
-        self.kernel_function = {"Constant": lambda x1, x2: variance,
-                                "Exponential": lambda x1, x2: variance * np.exp(-np.power(np.abs(x1 - x2) / lengthscale, gamma)),
-                                "SE": lambda x1, x2: variance * np.exp(- np.square(x1 - x2) / (2 * np.square(lengthscale))),
-                                "RQ": lambda x1, x2: variance * np.power((1 + np.square(x1 - x2) / (2 * alpha * np.square(lengthscale))), -alpha),
-                                "Linear": lambda x1, x2: variance * (x1 - c) * (x2 - c) + offset,
-                                "Matern": lambda x1, x2: variance if x1 - x2 == 0. else variance * (np.power(2, 1 - nu) / scipy.special.gamma(nu)) * np.power(np.sqrt(2 * nu) * np.abs(x1 - x2) / lengthscale, nu) * scipy.special.kv(nu, np.sqrt(2 * nu) * np.abs(x1 - x2) / lengthscale),
-                                "Periodic":lambda x1, x2: variance * np.exp(- 2 * np.square(np.sin(np.pi * np.abs(x1 - x2) / p))),
-                                }[kernel]
+        self.c = c
+        self.gamma = gamma
+        self.alpha = alpha
+        self.offset = offset
+        self.nu = nu
+        self.p = p
+        self.method = method
+        self.n_components = n_components
+        self.dtype = dtype
+        self.cache_size = cache_size
+        self.random_state = check_random_state(random_state)
+        self._factor_cache = OrderedDict()
+        self.previous_time = None
+        self.previous_state = None
+
+    @property
+    def stateful(self):
+        return self.method == "state_space"
+
+    @property
+    def streamable(self):
+        return self.method == "state_space"
+
+    def kernel_function(self, x1, x2):
+        """Evaluate the kernel for (broadcastable arrays of) time stamps
+
+        Parameters
+        ----------
+        x1, x2 : number or array-like
+            Time stamps; arrays are broadcast against each other
+
+        Returns
+        -------
+        number or array-like
+            covariance between x1 and x2
+
+        """
+        if self.kernel == "Linear":
+            return self.variance * (np.subtract(x1, self.c)) * (np.subtract(x2, self.c)) + self.offset
+        # Differences are taken in float64 before casting to dtype
+        distance = np.array(np.subtract(np.asarray(x1, dtype=float), np.asarray(x2, dtype=float)),
+                            dtype=self.dtype, ndmin=1)
+        covariance = self._stationary_kernel(distance)
+        return covariance if np.ndim(x1) or np.ndim(x2) else covariance[0]
+
+    def _stationary_kernel(self, distance):
+        """Internal method to evaluate a stationary kernel in place on an array of time differences."""
+        d = distance
+        if self.kernel == "Constant":
+            d.fill(self.variance)
+            return d
+
+        np.abs(d, out=d)
+        if self.kernel == "Exponential":
+            d /= self.lengthscale
+            np.power(d, self.gamma, out=d)
+            np.negative(d, out=d)
+            np.exp(d, out=d)
+        elif self.kernel == "SE":
+            np.square(d, out=d)
+            d *= -1. / (2 * np.square(self.lengthscale))
+            np.exp(d, out=d)
+        elif self.kernel == "RQ":
+            np.square(d, out=d)
+            d /= 2 * self.alpha * np.square(self.lengthscale)
+            d += 1
+            np.power(d, -self.alpha, out=d)
+        elif self.kernel == "Matern":
+            d *= np.sqrt(2 * self.nu) / self.lengthscale
+            zero = d == 0.
+            d[zero] = 1.  # The limit at zero distance is the variance, set below
+            bessel = scipy.special.kv(self.nu, d)
+            np.power(d, self.nu, out=d)
+            d *= bessel
+            d *= np.power(2, 1 - self.nu) / scipy.special.gamma(self.nu)
+            d[zero] = 1.
+        elif self.kernel == "Periodic":
+            d *= np.pi / self.p
+            np.sin(d, out=d)
+            np.square(d, out=d)
+            d *= -2
+            np.exp(d, out=d)
+        d *= self.variance
+        return d
 
     def sample_next(self, time, samples, errors):
         """Sample a single time point
@@ -66,7 +185,13 @@ class GaussianProcess(BaseSignal):
             sampled signal for time t
 
         """
-        raise NotImplementedError
+        if not self._has_state_space(self.kernel, self.gamma, self.nu):
+            raise NotImplementedError("Only Exponential (gamma=1) and Matern (nu=1/2, 3/2, 5/2) kernels "
+                                      "can be sampled point by point.")
+        samples, self.previous_state = self._sample_state_space(np.array([time], dtype=float), self.previous_state,
+                                                                self.previous_time)
+        self.previous_time = time
+        return self.mean + samples[0, 0]
 
     def sample_vectorized(self, time_vector):
         """Sample entire series based off of time vector
@@ -82,7 +207,321 @@ class GaussianProcess(BaseSignal):
             sampled signal for time vector
 
         """
-        cartesian_time = np.dstack(np.meshgrid(time_vector, time_vector)).reshape(-1, 2)
-        covariance_matrix = (np.vectorize(self.kernel_function)(cartesian_time[:, 0], cartesian_time[:, 1])).reshape(-1, time_vector.shape[0])
+        if self.method == "state_space":
+            # Continue the series from the last sampled state
+            samples, self.previous_state = self._sample_state_space(np.asarray(time_vector, dtype=float),
+                                                                    self.previous_state, self.previous_time)
+            if len(time_vector):
+                self.previous_time = time_vector[-1]
+            return self.mean + samples[0]
+        return self._sample(time_vector, 1)[0]
+
+    def clear_cache(self):
+        """Remove all cached covariance factorizations."""
+        self._factor_cache.clear()
+
+    def sample_batch(self, time_vector, n_series):
+        """Sample independent series based off of time vector
+
+        The covariance matrix is factorized once (or its circulant embedding
+        is diagonalized once) and all series are drawn together.
+
+        Parameters
+        ----------
+        time_vector : array-like
+            Timestamps for signal generation
+        n_series : int
+            Number of series
+
+        Returns
+        -------
+        array-like
+            sampled signals of shape (n_series, len(time_vector))
+
+        """
+        return self._sample(time_vector, n_series)
+
+    def _sample(self, time_vector, n_series):
+        """Internal method to draw n_series samples with the configured method."""
+        time_vector = np.asarray(time_vector, dtype=float)
+        if self.method == "state_space":
+            return self.mean + self._sample_state_space(time_vector, None, None, n_series)[0]
+        if self.method == "circulant":
+            eigenvalues = self._circulant_eigenvalues(time_vector)
+            if eigenvalues is not None:
+                return self.mean + self._sample_circulant(eigenvalues, len(time_vector), n_series)
+
+        features = self._features(time_vector)
+        noise = self.random_state.normal(size=(n_series, features.shape[1]))
+        return self.mean + noise @ features.T
+
+    def approximation_error(self, time_vector):
+        """Relative error of the covariance implied by the sampling method
+
+        Compares the covariance of the configured method against the dense
+        covariance matrix in the Frobenius norm. This builds the dense N x N
+        matrix and is meant for benchmarking.
+
+        Parameters
+        ----------
+        time_vector : array-like
+            Timestamps for signal generation
+
+        Returns
+        -------
+        float
+            ||K_method - K|| / ||K||
+
+        """
+        covariance_matrix = self._covariance_matrix(time_vector)
+        if self.method == "circulant" and self._circulant_eigenvalues(time_vector) is not None:
+            embedded_covariances = np.fft.ifft(self._circulant_eigenvalues(time_vector)).real
+            lags = np.abs(np.subtract.outer(np.arange(len(time_vector)), np.arange(len(time_vector))))
+            approximation = embedded_covariances[lags]
+        else:
+            features = self._features(time_vector)
+            approximation = features @ features.T
+        return np.linalg.norm(approximation - covariance_matrix) / np.linalg.norm(covariance_matrix)
+
+    def _features(self, time_vector):
+        """Internal method returning a matrix F with samples given by F @ z, z ~ N(0, I)."""
+        if self.method == "rff":
+            return self._fourier_features(time_vector)
+        if self.method == "nystrom":
+            return self._nystrom_features(time_vector)
+        return self._covariance_factor(time_vector)
+
+    def _fourier_features(self, time_vector):
+        """Internal method to draw M random Fourier features from the kernel's spectral density.
+
+        Uses cosine and sine pairs, so the returned matrix has 2M columns.
+        """
+        time_vector = np.asarray(time_vector, dtype=float)
+        if self.kernel == "SE":
+            frequencies = self.random_state.normal(size=self.n_components) / self.lengthscale
+        elif self.kernel == "Exponential":
+            frequencies = self.random_state.standard_cauchy(size=self.n_components) / self.lengthscale
+        elif self.kernel == "Matern":
+            frequencies = self.random_state.standard_t(2 * self.nu, size=self.n_components) / self.lengthscale
+        else:
+            # RQ is a gamma mixture of SE kernels over the inverse squared lengthscale
+            precisions = self.random_state.gamma(shape=self.alpha, scale=1. / (self.alpha * np.square(self.lengthscale)),
+                                         size=self.n_components)
+            frequencies = self.random_state.normal(size=self.n_components) * np.sqrt(precisions)
+        phases = np.multiply.outer(time_vector, frequencies)
+        features = np.concatenate((np.cos(phases), np.sin(phases)), axis=1)
+        features *= np.sqrt(self.variance / self.n_components)
+        return features
+
+    def _nystrom_features(self, time_vector):
+        """Internal method to build Nystrom features from evenly spaced inducing points.
+
+        The features are K_nm V diag(lambda)^(-1/2) with K_mm = V diag(lambda) V.T, so their
+        implied covariance is K_nm K_mm^-1 K_mn. Features are cached like the dense factors.
+        """
+        time_vector = np.ascontiguousarray(time_vector, dtype=float)
+        key = ("nystrom", self.n_components, self._kernel_parameters(), time_vector.shape,
+               hashlib.sha1(time_vector.tobytes()).hexdigest())
+        features = self._cache_get(key)
+        if features is not None:
+            return features
+
+        with stage('covariance', len(time_vector), 'nystrom', self):
+            inducing_points = np.linspace(time_vector.min(), time_vector.max(), self.n_components)
+            eigenvalues, eigenvectors = np.linalg.eigh(self._covariance_matrix(inducing_points))
+            keep = eigenvalues > 1e-10 * eigenvalues.max()
+            projection = eigenvectors[:, keep] / np.sqrt(eigenvalues[keep])
+            features = np.asarray(self.kernel_function(time_vector[:, None], inducing_points[None, :]),
+                                  dtype=float) @ projection
+        self._cache_put(key, features)
+        return features
+
+    @staticmethod
+    def _has_state_space(kernel, gamma, nu):
+        """Internal method to check whether a kernel has a finite state-space form."""
+        if kernel == "Exponential":
+            return gamma == 1
+        return kernel == "Matern" and any(np.isclose(nu, [0.5, 1.5, 2.5]))
+
+    def _state_space_model(self):
+        """Internal method returning the feedback matrix F and stationary covariance P of the kernel's SDE.
+
+        The process is the first state component; see Hartikainen and Sarkka (2010),
+        Kalman filtering and smoothing solutions to temporal Gaussian process regression models.
+        """
+        variance = self.variance
+        if self.kernel == "Exponential" or np.isclose(self.nu, 0.5):
+            rate = 1. / self.lengthscale
+            return np.array([[-rate]]), np.array([[variance]])
+        rate = np.sqrt(2 * self.nu) / self.lengthscale
+        if np.isclose(self.nu, 1.5):
+            feedback = np.array([[0., 1.], [-rate**2, -2 * rate]])
+            stationary_covariance = np.diag([variance, rate**2 * variance])
+        else:
+            feedback = np.array([[0., 1., 0.], [0., 0., 1.], [-rate**3, -3 * rate**2, -3 * rate]])
+            kappa = rate**2 * variance / 3
+            stationary_covariance = np.array([[variance, 0., -kappa], [0., kappa, 0.], [-kappa, 0., rate**4 * variance]])
+        return feedback, stationary_covariance
+
+    def _sample_state_space(self, time_vector, state, previous_time, n_series=1):
+        """Internal method to sample zero-mean series from the state-space form.
+
+        Parameters
+        ----------
+        time_vector : numpy array
+            Timestamps for signal generation
+        state : numpy array or None
+            State of shape (n_series, d) at previous_time. If None, the first
+            state is drawn from the stationary distribution.
+        previous_time : float or None
+            Time of state
+        n_series : int
+            Number of independent series
+
+        Returns
+        -------
+        samples, state : tuple (array, array)
+            Samples of shape (n_series, len(time_vector)) and the last state
+        """
+        feedback, stationary_covariance = self._state_space_model()
+        dimension = feedback.shape[0]
+        n_samples = len(time_vector)
+        if n_samples == 0:
+            return np.zeros((n_series, 0)), state
+
+        noise = self.random_state.normal(size=(n_series, n_samples, dimension))
+        if state is None:
+            # Draw the first state from the stationary distribution
+            state = noise[:, 0, :] @ np.linalg.cholesky(stationary_covariance).T
+            noise = noise[:, 1:, :]
+            step_times = time_vector[1:]
+            previous_time = time_vector[0]
+        else:
+            step_times = time_vector
+
+        # Discretize once per distinct time difference
+        with stage('covariance', n_samples, 'state_space', self):
+            time_diff, inverse = np.unique(np.diff(step_times, prepend=previous_time), return_inverse=True)
+            transition = scipy.linalg.expm(feedback * time_diff[:, None, None])
+            process_covariance = (stationary_covariance -
+                                  transition @ stationary_covariance @ np.swapaxes(transition, -1, -2))
+            eigenvalues, eigenvectors = np.linalg.eigh(process_covariance)
+            process_factor = eigenvectors * np.sqrt(np.clip(eigenvalues, 0., None))[:, None, :]
+
+        increment = np.einsum('kij,skj->ski', process_factor[inverse], noise)
+        states = matrix_linear_recurrence(transition[inverse], increment, state)
+        if len(step_times) < n_samples:
+            states = np.concatenate((state[:, None, :], states), axis=1)
+        return states[..., 0], states[:, -1, :]
+
+    def _circulant_eigenvalues(self, time_vector, max_doublings=3):
+        """Internal method to diagonalize the circulant embedding of a Toeplitz covariance.
+
+        Returns the eigenvalues of the smallest power-of-two embedding (padded up to
+        max_doublings times) that is positive semidefinite, or None if the time vector is
+        irregular, the kernel is not stationary or no embedding is positive semidefinite.
+        Eigenvalues are cached like the dense factors.
+        """
+        time_vector = np.ascontiguousarray(time_vector, dtype=float)
+        n_samples = len(time_vector)
+        if self.kernel == "Linear" or n_samples < 2:
+            return None
+        step = time_vector[1] - time_vector[0]
+        if step <= 0 or not np.allclose(np.diff(time_vector), step, rtol=1e-6, atol=0.):
+            return None
+
+        key = ("circulant", self._kernel_parameters(), n_samples, step)
+        eigenvalues = self._cache_get(key)
+        if eigenvalues is not None:
+            return eigenvalues
+
+        size = int(2 ** np.ceil(np.log2(2 * (n_samples - 1))))
+        with stage('covariance', n_samples, 'circulant', self):
+            for _ in range(max_doublings + 1):
+                # First row of the circulant matrix: lags 0..size/2, mirrored
+                lags = (step * np.arange(size // 2 + 1)).astype(self.dtype)
+                covariances = self._stationary_kernel(lags).astype(float)
+                first_row = np.concatenate((covariances, covariances[-2:0:-1]))
+                eigenvalues = np.fft.fft(first_row).real
+                if eigenvalues.min() >= -1e-8 * eigenvalues.max():
+                    eigenvalues = np.clip(eigenvalues, 0., None)
+                    break
+                size *= 2
+            else:
+                return None
+        self._cache_put(key, eigenvalues)
+        return eigenvalues
+
+    def _sample_circulant(self, eigenvalues, n_samples, n_series):
+        """Internal method to draw zero-mean samples from a circulant embedding.
+
+        The real and imaginary parts of every complex draw are independent samples,
+        so only half as many FFTs as series are needed.
+        """
+        size = len(eigenvalues)
+        n_draws = (n_series + 1) // 2
+        noise = self.random_state.normal(size=(n_draws, size)) + 1j * self.random_state.normal(size=(n_draws, size))
+        draws = np.fft.fft(np.sqrt(eigenvalues / size) * noise, axis=-1)[:, :n_samples]
+        return np.concatenate((draws.real, draws.imag))[:n_series]
+
+    def _covariance_matrix(self, time_vector):
+        """Internal method to build the covariance matrix for a time vector.
+
+        Time differences are computed once by broadcasting, in float64 so large
+        absolute times keep their precision, and written straight into a matrix
+        of type dtype, on which the kernel is evaluated in place.
+        """
+        time_vector = np.asarray(time_vector, dtype=float)
+        covariance_matrix = np.empty((len(time_vector), len(time_vector)), dtype=self.dtype)
+        if self.kernel == "Linear":
+            shifted_time = time_vector - self.c
+            np.multiply.outer(shifted_time, shifted_time, out=covariance_matrix)
+            covariance_matrix *= self.variance
+            covariance_matrix += self.offset
+        else:
+            np.subtract(time_vector[:, None], time_vector[None, :], out=covariance_matrix)
+            covariance_matrix = self._stationary_kernel(covariance_matrix)
         covariance_matrix[np.diag_indices_from(covariance_matrix)] += 1e-12  # Add small value to diagonal for numerical stability
-        return np.random.multivariate_normal(mean=np.full(shape=(time_vector.shape[0],), fill_value=self.mean), cov=covariance_matrix)
+        return covariance_matrix
+
+    def _covariance_factor(self, time_vector):
+        """Internal method to factorize the covariance matrix as L @ L.T.
+
+        Uses the Cholesky factor and falls back to an eigendecomposition for
+        numerically singular matrices. Factors are cached per time vector and
+        kernel parameters.
+        """
+        time_vector = np.ascontiguousarray(time_vector, dtype=float)
+        key = (self._kernel_parameters(), time_vector.shape, hashlib.sha1(time_vector.tobytes()).hexdigest())
+        factor = self._cache_get(key)
+        if factor is not None:
+            return factor
+
+        with stage('covariance', len(time_vector), 'dense', self):
+            covariance_matrix = self._covariance_matrix(time_vector)
+            try:
+                factor = np.linalg.cholesky(covariance_matrix)
+            except np.linalg.LinAlgError:
+                eigenvalues, eigenvectors = np.linalg.eigh(covariance_matrix)
+                factor = eigenvectors * np.sqrt(np.clip(eigenvalues, 0., None))
+        self._cache_put(key, factor)
+        return factor
+
+    def _cache_get(self, key):
+        """Internal method to look up a cached factorization, or None."""
+        if key not in self._factor_cache:
+            return None
+        self._factor_cache.move_to_end(key)
+        return self._factor_cache[key]
+
+    def _cache_put(self, key, value):
+        """Internal method to cache a factorization, evicting the least recently used."""
+        if self.cache_size > 0:
+            self._factor_cache[key] = value
+            while len(self._factor_cache) > self.cache_size:
+                self._factor_cache.popitem(last=False)
+
+    def _kernel_parameters(self):
+        """Internal method returning all parameters that determine the covariance matrix."""
+        return (self.kernel, self.lengthscale, self.variance, self.c, self.gamma, self.alpha,
+                self.offset, self.nu, self.p, np.dtype(self.dtype).str)
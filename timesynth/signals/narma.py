@@ -1,5 +1,10 @@
 import numpy as np
 from .base_signal import BaseSignal
+from .._utils import check_random_state
+try:
+    import numba
+except ImportError:
+    numba = None
 
 
 __all__ = ['NARMA']
@@ -13,6 +18,12 @@ class NARMA(BaseSignal):
     
     where u is generated from Uniform(0, 0.5).
     
+    The recursion keeps a running sum over the window of the last n values and is
+    compiled with numba when it is installed, falling back to NumPy otherwise.
+    
+    Consecutive calls to `sample_vectorized` continue the same series from the
+    last n values and random distortions.
+    
     NOTE: Only supports regular time samples.
     
     Parameters
@@ -23,13 +34,19 @@ class NARMA(BaseSignal):
         The coefficients denoted by iterable `a` in the formula above. As in [1]_.
     initial_condition : iterable or None (default None)
         An array of starting values of y(k-n) until y(k). The default is an aray of zeros.
-    seed : int
-        Use this seed to recreate any of the internal errors.
+    seed : int (default 42)
+        Use this seed to recreate any of the internal errors (with a legacy RandomState).
+    random_state : None, int, Generator or RandomState (default None)
+        Source of the internal errors, used instead of seed if given.
         
     Attributes
     ----------
+    random_state : numpy Generator or RandomState
+        Source of the internal errors (also available as `random`).
     errors : numpy array or None
         Random number sequence that was used to generate last NARMA sequence.
+    previous_values, previous_errors : numpy array or None
+        Last n values and random distortions, from which the next call continues.
     
     References
     ----------
@@ -37,12 +54,17 @@ class NARMA(BaseSignal):
     
     """
     
+    stateful = True
+
     def __init__(self, order=10, coefficients=[0.3, 0.05, 1.5, 0.1], initial_condition=None,
-                 error_initial_condition=None, seed=42):
+                 error_initial_condition=None, seed=42, random_state=None):
         self.vectorizable = True
         self.order = order
         self.coefficients = np.array(coefficients)
-        self.random = np.random.RandomState(seed)
+        if random_state is None:
+            self.random_state = np.random.RandomState(seed)
+        else:
+            self.random_state = check_random_state(random_state)
         
         # Store initial conditions
         if initial_condition is None:
@@ -51,25 +73,19 @@ class NARMA(BaseSignal):
             self.initial_condition = np.array(initial_condition)
         
         # You may provide an error initial condition
+        self._draw_error_initial_condition = error_initial_condition is None
         if error_initial_condition is None:
-            self.error_initial_condition = self.random.uniform(0, 0.5, size=order)
+            self.error_initial_condition = self.random_state.uniform(0, 0.5, size=order)
         else:
-            self.error_initial_condition = error_initial_condition
-        
-    def _next_value(self, values, rands, index):
-        """Internal short-hand method to calculate next value."""
-        # Short-hand parameters
-        n = self.order
-        a = self.coefficients
-        
-        # Get value arrays
-        i = index
-        y = values
-        u = rands
-        
-        # Compute next value
-        return a[0] * y[i-1] + a[1] * y[i-1] * np.sum(y[i-n:n]) + a[2] * u[i-n] * u[i] + a[3]
+            self.error_initial_condition = np.array(error_initial_condition)
+        self.errors = None
+        self.previous_values = None
+        self.previous_errors = None
         
+    @property
+    def random(self):
+        return self.random_state
+
     def sample_next(self, time, samples, errors):
         """This method is not available for NARMA, due to internal error sampling."""
         raise NotImplementedError("NARMA can only be sampled vectorized.")
@@ -93,20 +109,116 @@ class NARMA(BaseSignal):
         # Set bounds
         start = self.initial_condition.shape[0]
         
-        # Get relevant arrays
-        inits = self.initial_condition
-        rand_inits = self.error_initial_condition
-        rands = np.concatenate((rand_inits, self.random.uniform(0, .5, size=times.shape[0])))
+        # Get relevant arrays, continuing from the previous call
+        if self.previous_values is None:
+            inits = self.initial_condition
+            rand_inits = self.error_initial_condition
+        else:
+            inits = self.previous_values
+            rand_inits = self.previous_errors
+        rands = np.concatenate((rand_inits, self.random_state.uniform(0, .5, size=times.shape[0])))
         values = np.concatenate((inits, np.zeros(times.shape[0])))
         
         # Sample step-wise
-        end = values.shape[0]
-        for t in range(start, end):
-            values[t] = self._next_value(values, rands, t)
+        _narma_recursion(values[None, :], rands[None, :], self.order, self.coefficients)
         
-        # Store valus for later retrieval
+        # Store valus for later retrieval, copying the state so that changes to the samples do not affect it
         self.errors = rands[start:]
+        self.previous_values = values[len(values) - start:].copy()
+        self.previous_errors = rands[len(rands) - start:].copy()
         
         # Return trimmed values (exclude initial condition)
         samples = values[start:]
         return samples
+
+    def sample_batch(self, times, n_series, seeds=None):
+        """Samples independent series for all time points in input
+        
+        The recursion runs across the batch dimension at once. All series start
+        from the same initial conditions and use their own random distortions.
+        The state of the generator (errors, previous_values, previous_errors)
+        is left untouched.
+
+        Parameters
+        ----------
+        times: array like
+            all time stamps to be sampled
+        n_series : int
+            number of independent series
+        seeds : iterable of int or None (default None)
+            One seed per series. If given, series i uses its own
+            RandomState(seeds[i]) for u, and for the error initial condition
+            unless one was passed to the constructor, so it equals the first
+            sample_vectorized output of a NARMA with seed=seeds[i] and the same
+            other parameters. Otherwise all random numbers are drawn from this
+            generator.
+        
+        Returns
+        -------
+        samples : numpy array
+            samples of shape (n_series, len(times))
+
+        Raises
+        ------
+        ValueError
+            if the number of seeds differs from n_series
+
+        """
+        start = self.order
+        n_samples = len(times)
+        rands = np.empty((n_series, start + n_samples))
+        rands[:, :start] = self.error_initial_condition
+        if seeds is None:
+            rands[:, start:] = self.random_state.uniform(0, .5, size=(n_series, n_samples))
+        else:
+            if len(seeds) != n_series:
+                raise ValueError("Expected {} seeds, one per series, got {}".format(n_series, len(seeds)))
+            # Draw the error initial condition like the constructor of NARMA(seed=seed)
+            first = 0 if self._draw_error_initial_condition else start
+            for k, seed in enumerate(seeds):
+                rands[k, first:] = np.random.RandomState(seed).uniform(0, .5, size=start + n_samples - first)
+        values = np.zeros((n_series, start + n_samples))
+        values[:, :start] = self.initial_condition
+        
+        _narma_recursion(values, rands, self.order, self.coefficients)
+        
+        return values[:, start:]
+
+
+def _narma_loops(values, rands, order, coefficients):
+    """Internal function running the NARMA recursion in place with explicit loops, for compilation."""
+    a0, a1, a2, a3 = coefficients[0], coefficients[1], coefficients[2], coefficients[3]
+    for k in range(values.shape[0]):
+        window_sum = 0.
+        for t in range(order):
+            window_sum += values[k, t]
+        for t in range(order, values.shape[1]):
+            previous = values[k, t-1]
+            values[k, t] = a0 * previous + a1 * previous * window_sum + a2 * rands[k, t-order] * rands[k, t] + a3
+            window_sum += values[k, t] - values[k, t-order]
+
+
+def _narma_batch(values, rands, order, coefficients):
+    """Internal function running the NARMA recursion in place, vectorized over the batch dimension."""
+    a0, a1, a2, a3 = coefficients
+    window_sum = values[:, :order].sum(axis=1)
+    for t in range(order, values.shape[1]):
+        previous = values[:, t-1]
+        values[:, t] = a0 * previous + a1 * previous * window_sum + a2 * rands[:, t-order] * rands[:, t] + a3
+        window_sum += values[:, t] - values[:, t-order]
+
+
+def _narma_recursion(values, rands, order, coefficients):
+    """Internal function running the NARMA recursion in place on arrays of shape (n_series, order + n_samples).
+
+    The first `order` columns of values hold the initial condition; y(k+1) uses the running
+    sum of y(k-n+1), ..., y(k).
+    """
+    if numba is not None:
+        _narma_compiled(values, rands, order, np.asarray(coefficients, dtype=float))
+    else:
+        _narma_batch(values, rands, order, coefficients)
+
+
+if numba is not None:
+    _narma_compiled = numba.njit(cache=True)(_narma_loops)
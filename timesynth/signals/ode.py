@@ -1 +1,293 @@
-# Stub for Ordinary Differential Equations
+import numpy as np
+import scipy.integrate
+from .base_signal import BaseSignal
+
+__all__ = ['Lorenz', 'Rossler', 'VanDerPol']
+
+
+class BaseODE(BaseSignal):
+    """Base class for signals generated by ordinary differential equations (ODEs).
+
+    Subclasses define the system through `derivative`. The signal is one
+    component of the solution, sampled at burn_in + t. Consecutive calls
+    continue the same trajectory.
+
+    Parameters
+    ----------
+    initial_condition : array-like
+        State of the system at time 0
+    component : int (default 0)
+        Index of the state component that is returned as the signal
+    burn_in : float (default 0)
+        Amount of time after which samples will be taken and returned
+    method : {'dense', 'rk4'} (default 'dense')
+        - `dense`. Adaptive integration with scipy.integrate.solve_ivp, evaluating its
+          dense output at all requested times.
+        - `rk4`. Classical fixed-step Runge-Kutta, vectorized over many initial conditions
+          in sample_batch.
+    step : float (default 0.01)
+        Maximum step size of the `rk4` method
+    rtol, atol : float (default 1e-6, 1e-9)
+        Tolerances of the `dense` method
+
+    """
+
+    stateful = True
+
+    def __init__(self, initial_condition, component=0, burn_in=0., method='dense', step=0.01, rtol=1e-6, atol=1e-9):
+        if method not in ('dense', 'rk4'):
+            raise ValueError("Unknown integration method: {}".format(method))
+        self.vectorizable = True
+        self.initial_condition = np.array(initial_condition, dtype=float)
+        self.component = component
+        self.burn_in = burn_in
+        self.method = method
+        self.step = step
+        self.rtol = rtol
+        self.atol = atol
+        self.previous_time = None
+        self.previous_state = None
+
+    def derivative(self, time, state):
+        """Right-hand side of the ODE
+
+        Parameters
+        ----------
+        time : float
+            time
+        state : numpy array
+            states of shape (..., dimension)
+
+        Returns
+        -------
+        numpy array
+            time derivatives of shape (..., dimension)
+
+        """
+        raise NotImplementedError
+
+    def sample_next(self, time, samples, errors):
+        """Sample a single time point
+
+        Parameters
+        ----------
+        time : number
+            Time at which a sample was required
+
+        Returns
+        -------
+        float
+            sampled signal for time t
+
+        """
+        return self.sample_vectorized(np.array([time], dtype=float))[0]
+
+    def sample_vectorized(self, time_vector):
+        """Sample entire series based off of time vector
+
+        Continues the trajectory from the last sampled time.
+
+        Parameters
+        ----------
+        time_vector : array-like
+            Increasing timestamps for signal generation
+
+        Returns
+        -------
+        array-like
+            sampled signal for time vector
+
+        """
+        times = self.burn_in + np.asarray(time_vector, dtype=float)
+        if len(times) == 0:
+            return np.zeros(0)
+        if self.previous_time is None:
+            start_time, start_state = 0., self.initial_condition
+        else:
+            start_time, start_state = self.previous_time, self.previous_state
+
+        states = self._integrate(times, start_state[None, :], start_time)[0]
+        self.previous_time = times[-1]
+        self.previous_state = states[-1].copy()
+        return states[:, self.component]
+
+    def sample_batch(self, time_vector, n_series, initial_conditions=None):
+        """Sample trajectories for many initial conditions at once
+
+        All trajectories are integrated from time 0 in a single pass; the
+        state used by sample_next and sample_vectorized is left untouched.
+
+        Parameters
+        ----------
+        time_vector : array-like
+            Increasing timestamps for signal generation
+        n_series : int
+            Number of series
+        initial_conditions : array-like or None (default None)
+            Initial states of shape (n_series, dimension). If None, every series
+            starts from initial_condition.
+
+        Returns
+        -------
+        array-like
+            sampled signals of shape (n_series, len(time_vector))
+
+        Raises
+        ------
+        ValueError
+            if initial_conditions is not of shape (n_series, dimension)
+
+        """
+        if initial_conditions is None:
+            initial_conditions = np.tile(self.initial_condition, (n_series, 1))
+        else:
+            initial_conditions = np.asarray(initial_conditions, dtype=float)
+            expected = (n_series, len(self.initial_condition))
+            if initial_conditions.shape != expected:
+                raise ValueError("initial_conditions must have shape {}, got {}".format(
+                    expected, initial_conditions.shape))
+        times = self.burn_in + np.asarray(time_vector, dtype=float)
+        if len(times) == 0:
+            return np.zeros((n_series, 0))
+        states = self._integrate(times, initial_conditions, 0.)
+        return states[..., self.component]
+
+    def _integrate(self, times, states, start_time):
+        """Internal method to integrate states of shape (n_series, dimension) to all times.
+
+        Returns states of shape (n_series, len(times), dimension).
+        """
+        if self.method == 'rk4':
+            return self._integrate_rk4(times, states, start_time)
+
+        shape = states.shape
+        end_time = max(times[-1], start_time)
+        if end_time == start_time:
+            return np.repeat(states[:, None, :], len(times), axis=1)
+        fun = lambda time, y: self.derivative(time, y.reshape(shape)).ravel()
+        solution = scipy.integrate.solve_ivp(fun, (start_time, end_time), states.ravel(), dense_output=True,
+                                             rtol=self.rtol, atol=self.atol)
+        if not solution.success:
+            raise RuntimeError(solution.message)
+        return solution.sol(times).T.reshape(len(times), *shape).swapaxes(0, 1)
+
+    def _integrate_rk4(self, times, states, start_time):
+        """Internal method for fixed-step RK4 integration, vectorized over the initial conditions."""
+        output = np.empty((states.shape[0], len(times), states.shape[1]))
+        time = start_time
+        for i, target in enumerate(times):
+            n_steps = int(np.ceil((target - time) / self.step - 1e-9))
+            if n_steps > 0:
+                h = (target - time) / n_steps
+                for _ in range(n_steps):
+                    k1 = self.derivative(time, states)
+                    k2 = self.derivative(time + h/2, states + h/2 * k1)
+                    k3 = self.derivative(time + h/2, states + h/2 * k2)
+                    k4 = self.derivative(time + h, states + h * k3)
+                    states = states + h/6 * (k1 + 2*k2 + 2*k3 + k4)
+                    time += h
+                time = target
+            output[:, i, :] = states
+        return output
+
+
+class Lorenz(BaseODE):
+    """Signal generator for the Lorenz system.
+
+    .. math::
+
+        \\frac{dx}{dt} = \\sigma (y - x), \\quad
+        \\frac{dy}{dt} = x (\\rho - z) - y, \\quad
+        \\frac{dz}{dt} = x y - \\beta z
+
+    Chaotic behavior occurs for the default parameters.
+
+    Parameters
+    ----------
+    sigma : float (default 10)
+        The parameter sigma
+    rho : float (default 28)
+        The parameter rho
+    beta : float (default 8/3)
+        The parameter beta
+    initial_condition : array-like (default (1, 1, 1))
+        Initial state (x, y, z)
+    **kwargs
+        component, burn_in, method, step, rtol and atol as described in BaseODE
+
+    """
+
+    def __init__(self, sigma=10., rho=28., beta=8./3, initial_condition=(1., 1., 1.), **kwargs):
+        super().__init__(initial_condition, **kwargs)
+        self.sigma = sigma
+        self.rho = rho
+        self.beta = beta
+
+    def derivative(self, time, state):
+        x, y, z = state[..., 0], state[..., 1], state[..., 2]
+        return np.stack((self.sigma * (y - x), x * (self.rho - z) - y, x * y - self.beta * z), axis=-1)
+
+
+class Rossler(BaseODE):
+    """Signal generator for the Rössler system.
+
+    .. math::
+
+        \\frac{dx}{dt} = -y - z, \\quad
+        \\frac{dy}{dt} = x + a y, \\quad
+        \\frac{dz}{dt} = b + z (x - c)
+
+    Chaotic behavior occurs for the default parameters.
+
+    Parameters
+    ----------
+    a : float (default 0.2)
+        The parameter a
+    b : float (default 0.2)
+        The parameter b
+    c : float (default 5.7)
+        The parameter c
+    initial_condition : array-like (default (1, 1, 1))
+        Initial state (x, y, z)
+    **kwargs
+        component, burn_in, method, step, rtol and atol as described in BaseODE
+
+    """
+
+    def __init__(self, a=0.2, b=0.2, c=5.7, initial_condition=(1., 1., 1.), **kwargs):
+        super().__init__(initial_condition, **kwargs)
+        self.a = a
+        self.b = b
+        self.c = c
+
+    def derivative(self, time, state):
+        x, y, z = state[..., 0], state[..., 1], state[..., 2]
+        return np.stack((-y - z, x + self.a * y, self.b + z * (x - self.c)), axis=-1)
+
+
+class VanDerPol(BaseODE):
+    """Signal generator for the Van der Pol oscillator.
+
+    .. math::
+
+        \\frac{dx}{dt} = y, \\quad
+        \\frac{dy}{dt} = \\mu (1 - x^2) y - x
+
+    Parameters
+    ----------
+    mu : float (default 1)
+        Strength of the non-linear damping
+    initial_condition : array-like (default (1, 0))
+        Initial state (x, y)
+    **kwargs
+        component, burn_in, method, step, rtol and atol as described in BaseODE
+
+    """
+
+    def __init__(self, mu=1., initial_condition=(1., 0.), **kwargs):
+        super().__init__(initial_condition, **kwargs)
+        self.mu = mu
+
+    def derivative(self, time, state):
+        x, y = state[..., 0], state[..., 1]
+        return np.stack((y, self.mu * (1 - x**2) * y - x), axis=-1)
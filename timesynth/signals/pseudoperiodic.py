@@ -1,5 +1,6 @@
 import numpy as np
 from .base_signal import BaseSignal
+from .._utils import as_parameter, broadcast_time, check_random_state
 
 __all__ = ['PseudoPeriodic']
 
@@ -12,26 +13,32 @@ class PseudoPeriodic(BaseSignal):
 
     Parameters
     ----------
-    amplitude : number (default 1.0)
+    amplitude : number or array-like (default 1.0)
         Amplitude of the harmonic series
-    frequency : number (default 1.0)
+    frequency : number or array-like (default 1.0)
         Frequency of the harmonic series
-    ampSD : number (default 0.1)
+    ampSD : number or array-like (default 0.1)
         Amplitude standard deviation
-    freqSD : number (default 0.1)
+    freqSD : number or array-like (default 0.1)
         Frequency standard deviation
     ftype : function(default np.sin)
         Harmonic function
+    random_state : None, int, Generator or RandomState (default None)
+        Source of random numbers; None uses the global np.random state
+
+    Array-valued parameters (e.g. one per channel) are broadcast against each
+    other, and samples get shape (len(time_vector), *channels).
         
     """
     
     def __init__(self, amplitude=1.0, frequency=100, ampSD=0.1, freqSD=0.4,
-                 ftype=np.sin):
+                 ftype=np.sin, random_state=None):
         self.vectorizable = True
-        self.amplitude = amplitude
-        self.frequency = frequency
-        self.freqSD = freqSD
-        self.ampSD = ampSD
+        self.random_state = check_random_state(random_state)
+        self.amplitude = as_parameter(amplitude)
+        self.frequency = as_parameter(frequency)
+        self.freqSD = as_parameter(freqSD)
+        self.ampSD = as_parameter(ampSD)
         self.ftype = ftype
 
     def sample_next(self, time, samples, errors):
@@ -48,9 +55,11 @@ class PseudoPeriodic(BaseSignal):
             sampled signal for time t
 
         """
-        freq_val = np.random.normal(loc=self.frequency, scale=self.freqSD, size=1)
-        amplitude_val = np.random.normal(loc=self.amplitude, scale=self.ampSD, size=1)
-        return float(amplitude_val * np.sin(freq_val * time))
+        if self._channels():
+            return self.sample_vectorized(np.array([time]))[0]
+        freq_val = self.random_state.normal(loc=self.frequency, scale=self.freqSD, size=1)
+        amplitude_val = self.random_state.normal(loc=self.amplitude, scale=self.ampSD, size=1)
+        return float(amplitude_val[0] * np.sin(freq_val[0] * time))
 
     def sample_vectorized(self, time_vector):
         """Sample entire series based off of time vector
@@ -66,8 +75,41 @@ class PseudoPeriodic(BaseSignal):
             sampled signal for time vector
 
         """
-        n_samples = len(time_vector)
-        freq_arr = np.random.normal(loc=self.frequency, scale=self.freqSD, size=n_samples)
-        amp_arr = np.random.normal(loc=self.amplitude, scale=self.ampSD, size=n_samples)
+        time_vector = broadcast_time(time_vector, *self._parameters())
+        size = (len(time_vector),) + self._channels()
+        freq_arr = self.random_state.normal(loc=self.frequency, scale=self.freqSD, size=size)
+        amp_arr = self.random_state.normal(loc=self.amplitude, scale=self.ampSD, size=size)
         signal = np.multiply(amp_arr, self.ftype(np.multiply(freq_arr, time_vector)))
         return signal
+
+    def sample_batch(self, time_vector, n_series):
+        """Sample independent series based off of time vector
+
+        Frequencies and amplitudes of all series are drawn in one call each.
+
+        Parameters
+        ----------
+        time_vector : array-like
+            Timestamps for signal generation
+        n_series : int
+            Number of series
+
+        Returns
+        -------
+        array-like
+            sampled signals of shape (n_series, len(time_vector), *channels)
+
+        """
+        time_vector = broadcast_time(time_vector, *self._parameters())
+        size = (n_series, len(time_vector)) + self._channels()
+        freq_arr = self.random_state.normal(loc=self.frequency, scale=self.freqSD, size=size)
+        amp_arr = self.random_state.normal(loc=self.amplitude, scale=self.ampSD, size=size)
+        return np.multiply(amp_arr, self.ftype(np.multiply(freq_arr, time_vector)))
+
+    def _parameters(self):
+        """Internal method returning the parameters that may be array-valued."""
+        return self.amplitude, self.frequency, self.ampSD, self.freqSD
+
+    def _channels(self):
+        """Internal method returning the shape of the channels, () for a single channel."""
+        return np.broadcast(*self._parameters()).shape
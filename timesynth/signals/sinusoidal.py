@@ -1,5 +1,6 @@
 import numpy as np
 from .base_signal import BaseSignal
+from .._utils import as_parameter, broadcast_time
 
 
 __all__ = ['Sinusoidal']
@@ -10,20 +11,23 @@ class Sinusoidal(BaseSignal):
 
     Parameters
     ----------
-    amplitude : number (default 1.0)
+    amplitude : number or array-like (default 1.0)
         Amplitude of the harmonic series
-    frequency : number (default 1.0)
+    frequency : number or array-like (default 1.0)
         Frequency of the harmonic series
     ftype : function (default np.sin)
         Harmonic function
 
+    Array-valued amplitude and frequency (e.g. one per channel) are broadcast
+    against each other, and samples get shape (len(time_vector), *channels).
+
     """
 
     def __init__(self, amplitude=1.0, frequency=1.0, ftype=np.sin):
         self.vectorizable = True
-        self.amplitude = amplitude
+        self.amplitude = as_parameter(amplitude)
         self.ftype = ftype
-        self.frequency = frequency
+        self.frequency = as_parameter(frequency)
 
     def sample_next(self, time, samples, errors):
         """Sample a single time point
@@ -56,8 +60,43 @@ class Sinusoidal(BaseSignal):
 
         """
         if self.vectorizable is True:
+            time_vector = broadcast_time(time_vector, self.amplitude, self.frequency)
             signal = self.amplitude * self.ftype(2*np.pi*self.frequency *
                                                  time_vector)
             return signal
         else:
             raise ValueError("Signal type not vectorizable")
+
+    def sample_batch(self, time_vector, n_series):
+        """Sample independent series based off of time vector
+
+        The signal is deterministic, so all series are identical.
+
+        Parameters
+        ----------
+        time_vector : array-like
+            Timestamps for signal generation
+        n_series : int
+            Number of series
+
+        Returns
+        -------
+        array-like
+            sampled signals of shape (n_series, len(time_vector), *channels)
+
+        """
+        signal = self.sample_vectorized(time_vector)
+        return np.array(np.broadcast_to(signal, (n_series,) + signal.shape))
+
+    def _evaluate(self, context):
+        """Internal method to sample within an expression, sharing 2*pi*t with all other sinusoids."""
+        if np.ndim(self.amplitude) or np.ndim(self.frequency):
+            return super()._evaluate(context)
+        angular_time = context.derived('angular_time', lambda time_vector: 2*np.pi*time_vector)
+        signal = np.multiply(angular_time, self.frequency)
+        if isinstance(self.ftype, np.ufunc):
+            self.ftype(signal, out=signal)
+        else:
+            signal = self.ftype(signal)
+        signal *= self.amplitude
+        return signal
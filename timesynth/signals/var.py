@@ -0,0 +1,138 @@
+import numpy as np
+from .base_signal import BaseSignal
+from .._utils import check_random_state, covariance_factor, matrix_linear_recurrence
+
+__all__ = ['VectorAutoRegressive']
+
+
+class VectorAutoRegressive(BaseSignal):
+    """Sample generator for vector autoregressive (VAR) signals with several channels.
+
+    .. math:: x_t = A_1 x_{t-1} + ... + A_p x_{t-p} + e_t, \\quad e_t \\sim N(0, \\Sigma)
+
+    Samples have shape (len(time_vector), n_channels).
+    NOTE: Only use this for regularly sampled signals
+
+    Parameters
+    ----------
+    ar_param : array-like
+        Coefficient matrices of the VAR(p) process, of shape (p, n_channels, n_channels)
+        [A_1, A_2, ..., A_p], or a single matrix for p = 1
+    covariance : number or array-like (default 1.0)
+        Covariance of the innovations e_t: a variance for all channels, one variance
+        per channel, or a full (n_channels, n_channels) matrix. It is factorized once.
+    start_value : array-like or None (default None)
+        Starting values x_{-p}, ..., x_{-1} of shape (p, n_channels); zeros if None
+    random_state : None, int, Generator or RandomState (default None)
+        Source of random numbers; None uses the global np.random state
+
+    """
+
+    stateful = True
+
+    def __init__(self, ar_param, covariance=1.0, start_value=None, random_state=None):
+        self.vectorizable = True
+        ar_param = np.asarray(ar_param, dtype=float)
+        if ar_param.ndim == 2:
+            ar_param = ar_param[None]
+        if ar_param.ndim != 3 or ar_param.shape[1] != ar_param.shape[2]:
+            raise ValueError("VAR parameters must have shape (p, n_channels, n_channels)")
+        self.ar_param = ar_param
+        self.order, self.n_channels = ar_param.shape[:2]
+        self.covariance = covariance
+        self.covariance_factor = covariance_factor(covariance, self.n_channels)
+        if start_value is None:
+            self.start_value = np.zeros((self.order, self.n_channels))
+        else:
+            self.start_value = np.array(start_value, dtype=float).reshape(self.order, self.n_channels)
+        self.previous_value = self.start_value
+        self.random_state = check_random_state(random_state)
+
+    def sample_next(self, time, samples, errors):
+        """Sample a single time point
+
+        Parameters
+        ----------
+        time : number
+            Time at which a sample was required
+
+        Returns
+        -------
+        numpy array
+            sampled signal of shape (n_channels,) for time t
+
+        """
+        return self.sample_vectorized(np.array([time]))[0]
+
+    def sample_vectorized(self, time_vector):
+        """Sample entire series based off of time vector
+
+        Continues the series from the last p sampled values.
+
+        Parameters
+        ----------
+        time_vector : array-like
+            Timestamps for signal generation
+
+        Returns
+        -------
+        numpy array
+            sampled signal of shape (len(time_vector), n_channels)
+
+        """
+        n_samples = len(time_vector)
+        innovations = self.random_state.normal(size=(n_samples, self.n_channels)) @ self.covariance_factor.T
+        values = self._recursion(innovations, self.previous_value)
+        self.previous_value = np.concatenate((self.previous_value, values))[-self.order:]
+        return values
+
+    def sample_batch(self, time_vector, n_series):
+        """Sample independent series based off of time vector
+
+        All series start from start_value and are solved together.
+
+        Parameters
+        ----------
+        time_vector : array-like
+            Timestamps for signal generation
+        n_series : int
+            Number of series
+
+        Returns
+        -------
+        numpy array
+            sampled signals of shape (n_series, len(time_vector), n_channels)
+
+        """
+        size = (n_series, len(time_vector), self.n_channels)
+        innovations = self.random_state.normal(size=size) @ self.covariance_factor.T
+        return self._recursion(innovations, np.broadcast_to(self.start_value, (n_series,) + self.start_value.shape))
+
+    def _recursion(self, innovations, previous_value):
+        """Internal method solving the VAR recursion along axis -2 for given innovations.
+
+        Systems with a state of at most two values use the companion form with a
+        vectorized scan over time. The scan costs O(n (pk)^3) time and O(n (pk)^2)
+        memory, so larger systems step through time with one matrix product per
+        step, which was faster from pk = 3 on (benchmarked at 1e5 points).
+        """
+        n_samples = innovations.shape[-2]
+        p, k = self.order, self.n_channels
+        if p * k <= 2:
+            # Companion form: the state stacks x_t, ..., x_{t-p+1}
+            transition = np.zeros((p * k, p * k))
+            transition[:k] = np.concatenate(self.ar_param, axis=1)
+            transition[k:, :-k] = np.eye((p - 1) * k)
+            increment = np.zeros(innovations.shape[:-1] + (p * k,))
+            increment[..., :k] = innovations
+            state = previous_value[..., ::-1, :].reshape(previous_value.shape[:-2] + (p * k,))
+            return matrix_linear_recurrence(transition, increment, state)[..., :k]
+
+        values = np.concatenate((previous_value, np.empty_like(innovations)), axis=-2)
+        batch_shape = values.shape[:-2]
+        # Coefficients for the lags in chronological order, x_{t-p}, ..., x_{t-1}
+        coefficients = np.concatenate(self.ar_param[::-1], axis=1)
+        for t in range(n_samples):
+            lags = values[..., t:p + t, :].reshape(batch_shape + (p * k,))
+            values[..., p + t, :] = lags @ coefficients.T + innovations[..., t, :]
+        return values[..., p:, :]
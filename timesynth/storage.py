@@ -0,0 +1,130 @@
+import json
+import os
+import numpy as np
+
+__all__ = ['ChunkedStore', 'open_npy']
+
+
+def open_npy(filename, shape, dtype=np.float64):
+    """Creates a .npy file and returns it as a writable memory map.
+
+    Parameters
+    ----------
+    filename : str
+        Path of the .npy file
+    shape : int or tuple of int
+        Shape of the array
+    dtype : numpy dtype (default np.float64)
+        Type of the array
+
+    Returns
+    -------
+    numpy memmap
+
+    """
+    shape = tuple(shape) if np.iterable(shape) else (shape,)
+    return np.lib.format.open_memmap(filename, mode='w+', dtype=dtype, shape=shape)
+
+
+class ChunkedStore:
+    """Array stored on disk in chunks along its first axis.
+
+    The store is a directory in a format of its own (not Zarr): rows start to
+    start + chunk_length are kept in the .npy file `<start // chunk_length>.npy`
+    in the directory `path`, next to `metadata.json` with the shape, chunk
+    length, type and fill value. Chunks are created when they are first
+    written, and only the chunks overlapping a slice are read or written, so
+    arrays larger than memory can be filled piece by piece (e.g. with
+    TimeSeries.write).
+
+    Parameters
+    ----------
+    path : str
+        Directory of the store
+    shape : int, tuple of int or None (default None)
+        Shape of a new store. If None, the existing store at path is opened.
+    chunk_length : int (default 2**20)
+        Number of rows (along the first axis) per chunk of a new store
+    dtype : numpy dtype (default np.float64)
+        Type of a new store
+    fill_value : number (default 0)
+        Value of the entries that were never written
+
+    """
+
+    def __init__(self, path, shape=None, chunk_length=2**20, dtype=np.float64, fill_value=0):
+        self.path = path
+        metadata_file = os.path.join(path, 'metadata.json')
+        if shape is None:
+            with open(metadata_file) as f:
+                metadata = json.load(f)
+            self.shape = tuple(metadata['shape'])
+            self.chunk_length = metadata['chunk_length']
+            self.dtype = np.dtype(metadata['dtype'])
+            self.fill_value = metadata['fill_value']
+        else:
+            if chunk_length < 1:
+                raise ValueError("chunk_length must be positive")
+            self.shape = tuple(shape) if np.iterable(shape) else (shape,)
+            self.chunk_length = chunk_length
+            self.dtype = np.dtype(dtype)
+            self.fill_value = fill_value
+            os.makedirs(path, exist_ok=True)
+            with open(metadata_file, 'w') as f:
+                json.dump({'shape': self.shape, 'chunk_length': chunk_length,
+                           'dtype': self.dtype.str, 'fill_value': fill_value}, f)
+
+    def __len__(self):
+        return self.shape[0]
+
+    @property
+    def n_chunks(self):
+        return -(-self.shape[0] // self.chunk_length)
+
+    def __setitem__(self, key, value):
+        start, stop = self._rows(key)
+        value = np.broadcast_to(np.asarray(value, dtype=self.dtype), (stop - start,) + self.shape[1:])
+        for chunk, chunk_start, chunk_stop in self._chunks(start, stop):
+            offset = chunk * self.chunk_length
+            self._chunk(chunk, 'r+')[chunk_start - offset:chunk_stop - offset] = value[chunk_start - start:chunk_stop - start]
+
+    def __getitem__(self, key):
+        start, stop = self._rows(key)
+        output = np.empty((stop - start,) + self.shape[1:], dtype=self.dtype)
+        for chunk, chunk_start, chunk_stop in self._chunks(start, stop):
+            offset = chunk * self.chunk_length
+            output[chunk_start - start:chunk_stop - start] = self._chunk(chunk, 'r')[chunk_start - offset:
+                                                                                    chunk_stop - offset]
+        return output
+
+    def __array__(self, dtype=None, copy=None):
+        array = self[:]
+        return array if dtype is None else array.astype(dtype, copy=False)
+
+    def _rows(self, key):
+        """Internal method turning a slice over the first axis into a (start, stop) pair."""
+        if not isinstance(key, slice):
+            raise TypeError("ChunkedStore only supports slices over the first axis")
+        start, stop, step = key.indices(self.shape[0])
+        if step != 1:
+            raise ValueError("ChunkedStore only supports contiguous slices")
+        return start, max(start, stop)
+
+    def _chunks(self, start, stop):
+        """Internal generator over the chunks overlapping rows start to stop."""
+        for chunk in range(start // self.chunk_length, -(-stop // self.chunk_length)):
+            offset = chunk * self.chunk_length
+            yield chunk, max(start, offset), min(stop, offset + self.chunk_length)
+
+    def _chunk(self, chunk, mode):
+        """Internal method returning a chunk as a memory map, creating it if needed."""
+        filename = os.path.join(self.path, '{}.npy'.format(chunk))
+        if not os.path.exists(filename):
+            length = min(self.chunk_length, self.shape[0] - chunk * self.chunk_length)
+            if mode == 'r':
+                return np.full((length,) + self.shape[1:], self.fill_value, dtype=self.dtype)
+            array = np.lib.format.open_memmap(filename, mode='w+', dtype=self.dtype,
+                                              shape=(length,) + self.shape[1:])
+            array[...] = self.fill_value
+            return array
+        return np.load(filename, mmap_mode=mode)
@@ -0,0 +1,58 @@
+import numpy as np
+from . import signals as _signals, noise as _noise
+from .dataset import _normalize_spec
+
+__all__ = ['parameter_sweep']
+
+
+def parameter_sweep(time_vector, generator, parameters, grid=False):
+    """Samples a generator for many parameter values in one call.
+
+    A single generator is constructed with array-valued parameters, one
+    entry per combination, and sampled once with sample_vectorized, so every
+    combination becomes a channel that is broadcast against time_vector.
+    Supported by the generators with array-valued parameters, e.g.
+    Sinusoidal, PseudoPeriodic, AutoRegressive, CAR and GaussianNoise.
+
+    Parameters
+    ----------
+    time_vector : numpy array or TimeGrid
+        Times at which to generate a sample
+    generator : str, class or tuple
+        Spec of the generator: a class from timesynth.signals or
+        timesynth.noise, its name, or a (class or name, keyword arguments)
+        tuple for the parameters that are not swept
+    parameters : dict
+        Values of the swept parameters, mapping each name to a sequence. A
+        value may itself be a sequence, e.g. the coefficients of
+        AutoRegressive.ar_param.
+    grid : bool (default False)
+        If False, the i-th values of all parameters form the i-th combination
+        and all sequences must have the same length. If True, all
+        combinations of the values are swept, ordered like itertools.product
+        (the last parameter varies fastest).
+
+    Returns
+    -------
+    numpy array
+        samples of shape (n_params, len(time_vector)), one row per combination
+
+    """
+    spec = generator[0] if isinstance(generator, tuple) else generator
+    module = _noise if isinstance(spec, str) and hasattr(_noise, spec) else _signals
+    generator_class, kwargs = _normalize_spec(generator, module)
+    if not parameters:
+        raise ValueError("No parameters to sweep")
+
+    values = {name: np.asarray(value, dtype=float) for name, value in parameters.items()}
+    lengths = [len(value) for value in values.values()]
+    if grid:
+        indices = np.indices(lengths).reshape(len(lengths), -1)
+        values = {name: value[index] for (name, value), index in zip(values.items(), indices)}
+    elif len(set(lengths)) > 1:
+        raise ValueError("All parameters need the same number of values, unless grid is True")
+    kwargs.update(values)
+
+    samples = generator_class(**kwargs).sample_vectorized(time_vector)
+    # Combinations are the trailing axis of the samples, (len(time_vector), n_params)
+    return np.ascontiguousarray(np.moveaxis(samples, 0, -1))
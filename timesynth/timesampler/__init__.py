@@ -1 +1,2 @@
 from .timesampler import *
+from .time_grid import *
@@ -0,0 +1,154 @@
+import numbers
+import numpy as np
+from numpy.lib.mixins import NDArrayOperatorsMixin
+
+
+__all__ = ['TimeGrid']
+
+
+class TimeGrid(NDArrayOperatorsMixin):
+    """Lazy regularly spaced time axis.
+
+    Describes the timestamps start + i * step for i = 0, ..., count - 1 without
+    storing them. Slicing returns another TimeGrid, and adding or multiplying by
+    scalars maps the grid without evaluating it, so that e.g. the phase of a
+    Sinusoidal is computed in a single pass per chunk. Any other use as a numpy
+    array (ufuncs, np.asarray, fancy indexing) evaluates the timestamps.
+
+    Parameters
+    ----------
+    start: float
+        First timestamp
+    step: float
+        Spacing between consecutive timestamps
+    count: int
+        Number of timestamps
+
+    """
+
+    def __init__(self, start, step, count):
+        if count < 0:
+            raise ValueError("count must be non-negative")
+        self.start = start
+        self.step = step
+        self.count = int(count)
+
+    @property
+    def stop(self):
+        """End of the grid, one step after the last timestamp"""
+        return self.start + self.step * self.count
+
+    @property
+    def shape(self):
+        return (self.count,)
+
+    @property
+    def ndim(self):
+        return 1
+
+    @property
+    def size(self):
+        return self.count
+
+    @property
+    def dtype(self):
+        return np.result_type(self.start, self.step, float)
+
+    def __len__(self):
+        return self.count
+
+    def __repr__(self):
+        return "TimeGrid(start={!r}, step={!r}, count={!r})".format(self.start, self.step, self.count)
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self.start + self.step * i
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            indices = range(*key.indices(self.count))
+            return TimeGrid(self.start + self.step * indices.start, self.step * indices.step, len(indices))
+        if isinstance(key, numbers.Integral):
+            if not -self.count <= key < self.count:
+                raise IndexError("index {} is out of bounds for TimeGrid of size {}".format(key, self.count))
+            return self.start + self.step * (key % self.count)
+        return self.to_array()[key]
+
+    def __array__(self, dtype=None, copy=None):
+        return self.to_array(dtype)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method == '__call__' and not kwargs and len(inputs) == 2:
+            mapped = self._affine(ufunc, *inputs)
+            if mapped is not None:
+                return mapped
+        inputs = tuple(x.to_array() if isinstance(x, TimeGrid) else x for x in inputs)
+        if 'out' in kwargs:
+            kwargs['out'] = tuple(x.to_array() if isinstance(x, TimeGrid) else x for x in kwargs['out'])
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+    def _affine(self, ufunc, left, right):
+        """Internal method mapping the grid by a scalar without evaluating it, or None if not possible."""
+        grid_first = isinstance(left, TimeGrid)
+        grid, other = (left, right) if grid_first else (right, left)
+        if not isinstance(other, numbers.Real):
+            return None
+        if ufunc is np.add:
+            return TimeGrid(grid.start + other, grid.step, grid.count)
+        if ufunc is np.subtract:
+            if grid_first:
+                return TimeGrid(grid.start - other, grid.step, grid.count)
+            return TimeGrid(other - grid.start, -grid.step, grid.count)
+        if ufunc is np.multiply:
+            return TimeGrid(grid.start * other, grid.step * other, grid.count)
+        if ufunc is np.true_divide and grid_first:
+            return TimeGrid(grid.start / other, grid.step / other, grid.count)
+        return None
+
+    def to_array(self, dtype=None):
+        """Evaluate the timestamps
+
+        Parameters
+        ----------
+        dtype: numpy dtype or None (default None)
+            Type of the returned array
+
+        Returns
+        -------
+        numpy array
+            timestamps of the grid
+
+        """
+        time_vector = np.arange(self.count, dtype=self.dtype)
+        time_vector *= self.step
+        time_vector += self.start
+        return time_vector if dtype is None else time_vector.astype(dtype, copy=False)
+
+    def min(self):
+        if self.count == 0:
+            raise ValueError("zero-size TimeGrid has no minimum")
+        return min(self.start, self[-1])
+
+    def max(self):
+        if self.count == 0:
+            raise ValueError("zero-size TimeGrid has no maximum")
+        return max(self.start, self[-1])
+
+    def chunks(self, chunk_size):
+        """Evaluate the grid in consecutive chunks
+
+        Parameters
+        ----------
+        chunk_size: int
+            Number of timestamps per chunk
+
+        Returns
+        -------
+        generator
+            yields numpy arrays of at most chunk_size timestamps
+
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        for start in range(0, self.count, chunk_size):
+            yield self[start:start + chunk_size].to_array()
@@ -1,4 +1,6 @@
 import numpy as np
+from .time_grid import TimeGrid
+from .._utils import check_random_state
 
 
 __all__ = ['TimeSampler']
@@ -14,13 +16,16 @@ class TimeSampler:
                 Time sampling of time series starts
     stop_time: float/int (default 10)
                 Time sampling of time series stops
+    random_state: None, int, Generator or RandomState (default None)
+                Source of random numbers; None uses the global np.random state
 
     """
-    def __init__(self, start_time=0, stop_time=10):
+    def __init__(self, start_time=0, stop_time=10, random_state=None):
         self.start_time = start_time
         self.stop_time = stop_time
+        self.random_state = check_random_state(random_state)
 
-    def sample_regular_time(self, num_points=None, resolution=None):
+    def sample_regular_time(self, num_points=None, resolution=None, lazy=False):
         """
         Samples regularly spaced time using the number of points or the
         resolution of the signal. Only one of the parameters is to be
@@ -32,15 +37,23 @@ class TimeSampler:
             Number of points in time series
         resolution: float/int (default None)
             Resolution of the time series
+        lazy: bool (default False)
+            Return a TimeGrid describing the timestamps instead of allocating them
 
         Returns
         -------
-        numpy array
+        numpy array or TimeGrid
             Regularly sampled timestamps
 
         """
         if num_points is None and resolution is None:
             raise ValueError("One of the keyword arguments must be initialized.")
+        if lazy:
+            if resolution is not None:
+                count = max(int(np.ceil((self.stop_time - self.start_time) / resolution)), 0)
+                return TimeGrid(self.start_time, resolution, count)
+            step = (self.stop_time - self.start_time) / (num_points - 1) if num_points > 1 else 0.
+            return TimeGrid(self.start_time, step, num_points)
         if resolution is not None:
             time_vector = np.arange(self.start_time, self.stop_time,
                                     resolution)
@@ -85,6 +98,145 @@ class TimeSampler:
                                                   keep_percentage)
         return self._create_perturbations(time_vector, resolution)
 
+    def sample_bernoulli_time(self, num_points=None, resolution=None,
+                              keep_percentage=100, jitter=0., chunk_size=None):
+        """
+        Samples irregular time by keeping every point of a regular grid
+        independently with probability keep_percentage/100. The kept points
+        are found in O(N) by skipping geometrically distributed gaps, so
+        neither the full grid nor a sort is needed. The number of points is
+        binomial rather than fixed.
+
+        Parameters
+        ----------
+        num_points: int (default None)
+            Number of points in the regular grid
+        resolution: float/int (default None)
+            Resolution of the regular grid
+        keep_percentage: float/int (default 100)
+            Expected percentage of points to be retained
+        jitter: float (default 0)
+            Width of uniform perturbations in units of the resolution. Points
+            stay within their own grid cell, so values up to 1 keep them ordered.
+            Perturbations of the first and last grid points beyond the grid are
+            reflected back, so all points lie within the grid.
+        chunk_size: int (default None)
+            If given, return a generator of arrays with at most chunk_size points
+
+        Returns
+        -------
+        numpy array or generator
+            Irregularly sampled timestamps
+
+        """
+        if not 0 <= jitter <= 1:
+            raise ValueError("jitter must lie in [0, 1] to keep the points ordered.")
+        grid = self.sample_regular_time(num_points=num_points, resolution=resolution, lazy=True)
+        probability = keep_percentage / 100.
+        last = len(grid) - 1
+
+        def chunks(size):
+            if probability <= 0:
+                return
+            # Grid indices of kept points are partial sums of geometric skips
+            for index in _renewal_process(lambda n: self.random_state.geometric(probability, size=n), -1,
+                                          len(grid), size):
+                if jitter:
+                    index = index + self.random_state.uniform(-jitter / 2, jitter / 2, size=len(index))
+                    # Reflect the perturbations off the ends of the grid
+                    index = last - np.abs(last - np.abs(index))
+                yield grid.start + grid.step * index
+
+        return self._collect(chunks, probability * len(grid), chunk_size)
+
+    def sample_poisson_time(self, rate, chunk_size=None):
+        """
+        Samples irregular time from a homogeneous Poisson process between
+        start_time and stop_time, with exponentially distributed waiting times.
+
+        Parameters
+        ----------
+        rate: float
+            Expected number of points per unit of time
+        chunk_size: int (default None)
+            If given, return a generator of arrays with at most chunk_size points
+
+        Returns
+        -------
+        numpy array or generator
+            Irregularly sampled timestamps
+
+        """
+        def chunks(size):
+            return _renewal_process(lambda n: self.random_state.exponential(1. / rate, size=n), self.start_time,
+                                    self.stop_time, size)
+
+        return self._collect(chunks, rate * (self.stop_time - self.start_time), chunk_size)
+
+    def sample_burst_time(self, rate, burst_length, gap_length, chunk_size=None):
+        """
+        Samples irregular time in bursts separated by gaps, as for a sensor
+        that drops out. Bursts and gaps have exponentially distributed
+        durations, the first burst starts at start_time, and points within
+        bursts follow a Poisson process.
+
+        Parameters
+        ----------
+        rate: float
+            Expected number of points per unit of time within bursts
+        burst_length: float
+            Mean duration of bursts
+        gap_length: float
+            Mean duration of gaps
+        chunk_size: int (default None)
+            If given, return a generator of arrays with at most chunk_size points
+
+        Returns
+        -------
+        numpy array or generator
+            Irregularly sampled timestamps
+
+        """
+        def chunks(size):
+            # Points are drawn on the time axis with gaps removed, then shifted by
+            # the total duration of the gaps before their burst
+            burst_ends = np.zeros(0)
+            offsets = np.zeros(0)
+            total_end, total_gap = 0., 0.
+            for active_time in _renewal_process(lambda n: self.random_state.exponential(1. / rate, size=n), 0.,
+                                                np.inf, size):
+                while total_end <= active_time[-1]:
+                    n_bursts = int(size / (rate * burst_length)) + 16
+                    ends = total_end + np.cumsum(self.random_state.exponential(burst_length, size=n_bursts))
+                    gaps = total_gap + np.cumsum(self.random_state.exponential(gap_length, size=n_bursts))
+                    burst_ends = np.concatenate((burst_ends, ends))
+                    offsets = np.concatenate((offsets, [total_gap], gaps[:-1]))
+                    total_end, total_gap = ends[-1], gaps[-1]
+                burst = np.searchsorted(burst_ends, active_time, side='right')
+                time_vector = self.start_time + active_time + offsets[burst]
+                # Only keep the bursts that later chunks can reach
+                burst_ends, offsets = burst_ends[burst[-1]:], offsets[burst[-1]:]
+                n_valid = np.searchsorted(time_vector, self.stop_time)
+                if n_valid:
+                    yield time_vector[:n_valid]
+                if n_valid < len(time_vector):
+                    return
+
+        duration = self.stop_time - self.start_time
+        return self._collect(chunks, rate * duration * burst_length / (burst_length + gap_length), chunk_size)
+
+    def _collect(self, chunks, expected_points, chunk_size):
+        """
+        Internal function to return the chunks of a sampler, or all of them
+        in a single array sized by the expected number of points
+        """
+        if chunk_size is not None:
+            if chunk_size < 1:
+                raise ValueError("chunk_size must be positive.")
+            return chunks(chunk_size)
+        size = int(expected_points + 5 * np.sqrt(expected_points)) + 16
+        return np.concatenate([np.zeros(0)] + list(chunks(size)))
+
     def _create_perturbations(self, time_vector, resolution):
         """
         Internal functions to create perturbations in timestamps
@@ -103,7 +255,7 @@ class TimeSampler:
             Irregularly sampled timestamps with perturbations
 
         """
-        sample_perturbations = np.random.normal(loc=0.0, scale=resolution,
+        sample_perturbations = self.random_state.normal(loc=0.0, scale=resolution,
                                                 size=len(time_vector))
         time_vector = time_vector + sample_perturbations
         return np.sort(time_vector)
@@ -128,6 +280,22 @@ class TimeSampler:
         """
         num_points = len(time_vector)
         num_select_points = int(keep_percentage*num_points/100)
-        index = np.sort(np.random.choice(num_points, size=num_select_points,
+        index = np.sort(self.random_state.choice(num_points, size=num_select_points,
                         replace=False))
         return time_vector[index]
+
+
+def _renewal_process(draw_increments, start, limit, chunk_size):
+    """
+    Internal generator for the increasing partial sums start + cumsum(increments)
+    that lie below limit, in chunks of at most chunk_size values
+    """
+    position = start
+    while True:
+        positions = position + np.cumsum(draw_increments(chunk_size))
+        n_valid = np.searchsorted(positions, limit)
+        if n_valid:
+            yield positions[:n_valid]
+        if n_valid < chunk_size:
+            return
+        position = positions[-1]
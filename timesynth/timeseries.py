@@ -1,6 +1,46 @@
+import copy
 import numpy as np
+from ._utils import spawn_random_states
+from .profiling import stage
 
-__all__ = ['TimeSeries']
+__all__ = ['TimeSeries', 'MultiChannelTimeSeries']
+
+
+def _plan(generator):
+    """Internal function to pick the fastest execution path for a generator.
+
+    Returns 'vectorized' for generators sampled in a single call, 'chunked' for
+    stateful generators whose consecutive calls continue one series, 'iterative'
+    for generators that need the history of samples and errors, and None if
+    there is no generator.
+    """
+    if generator is None:
+        return None
+    if not generator.vectorizable:
+        return 'iterative'
+    if generator.stateful:
+        return 'chunked'
+    return 'vectorized'
+
+
+def _random_leaves(generator):
+    """Internal function listing the generators with a random_state in generator, including the leaves of expressions."""
+    leaves, stack, seen = [], [generator], set()
+    while stack:
+        node = stack.pop()
+        if node is None or id(node) in seen:
+            continue
+        seen.add(id(node))
+        if hasattr(node, 'random_state'):
+            leaves.append(node)
+        stack.extend(reversed(getattr(node, 'children', ())))
+    return leaves
+
+
+def _fresh_copy(generator):
+    """Internal function copying a generator in its current state, sharing its sources of random numbers."""
+    memo = {id(leaf.random_state): leaf.random_state for leaf in _random_leaves(generator)}
+    return copy.deepcopy(generator, memo)
 
 
 class TimeSeries:
@@ -14,57 +54,464 @@ class TimeSeries:
         signal object for time series
     noise_generator : Noise object
         noise object for time series
+    random_state : None, int, SeedSequence, Generator or RandomState (default None)
+        If given, the signal and noise generators draw from two independent
+        streams spawned from it (see spawn_random_states), replacing their own
+        random_state. In expressions (see timesynth.signals.composite), the
+        stream is split further between the random leaves. Otherwise the
+        generators are left as they are.
+
+    Warnings
+    --------
+    The generators are not copied: with random_state, the random_state
+    attributes of the generator objects passed in are overwritten, which
+    also affects any other use of them. Pass copies (copy.deepcopy) to keep
+    the originals untouched.
 
     """
-    def __init__(self, signal_generator, noise_generator=None):
+    def __init__(self, signal_generator, noise_generator=None, random_state=None):
         self.signal_generator = signal_generator
         self.noise_generator = noise_generator
+        if random_state is not None:
+            streams = spawn_random_states(random_state, 2)
+            for generator, stream in zip((signal_generator, noise_generator), streams):
+                leaves = _random_leaves(generator)
+                if len(leaves) > 1:
+                    for leaf, leaf_stream in zip(leaves, spawn_random_states(stream, len(leaves))):
+                        leaf.random_state = leaf_stream
+                elif leaves:
+                    leaves[0].random_state = stream
+
+    def execution_plan(self):
+        """Execution path that sample uses for the signal and the noise.
+
+        Returns
+        -------
+        dict
+            maps 'signal' and 'noise' to 'vectorized', 'chunked' or 'iterative'
+            ('noise' is None without a noise generator)
 
+        """
+        return {'signal': _plan(self.signal_generator),
+                'noise': _plan(self.noise_generator)}
 
-    def sample(self, time_vector):
+    def sample(self, time_vector, out=None, chunk_size=None):
         """Samples from the specified TimeSeries.
-        
+
+        Each component is sampled on its own execution path (see execution_plan);
+        only components that depend on the history of samples and errors are
+        sampled step by step.
+
         Parameters
         ----------
         time_vector : numpy array
             Times at which to generate a sample
-            
+        out : tuple of three numpy arrays or None (default None)
+            Buffers for samples, signals and errors, each with the length of
+            time_vector. Fresh arrays are allocated if None.
+        chunk_size : int or None (default None)
+            Number of points per call for chunked (stateful) generators.
+            If None, they are sampled in a single call.
+
         Returns
         -------
         samples, signals, errors, : tuple (array, array, array)
             Returns samples, and the signals and errors they were constructed from
         """
-        
-        # Vectorize if possible
-        if self.signal_generator.vectorizable and not self.noise_generator is None and self.noise_generator.vectorizable:
-            signals = self.signal_generator.sample_vectorized(time_vector)
-            errors = self.noise_generator.sample_vectorized(time_vector)
-            samples = signals + errors
-        elif self.signal_generator.vectorizable and self.noise_generator is None:
-            signals = self.signal_generator.sample_vectorized(time_vector)
-            errors = np.zeros(len(time_vector))
-            samples = signals
-        else:
-            n_samples = len(time_vector)
-            samples = np.zeros(n_samples)  # Signal and errors combined
-            signals = np.zeros(n_samples)  # Signal samples
-            errors = np.zeros(n_samples)  # Handle errors seprately
-            times = np.arange(n_samples)
-
-            # Sample iteratively, while providing access to all previously sampled steps
-            for i in range(n_samples):
-                # Get time
-                t = time_vector[i]
-                # Sample error
-                if not self.noise_generator is None:
-                    errors[i] = self.noise_generator.sample_next(t, samples[:i - 1], errors[:i - 1])
-
-                # Sample signal
-                signal = self.signal_generator.sample_next(t, samples[:i - 1], errors[:i - 1])
-                signals[i] = signal
-
-                # Compound signal and noise
-                samples[i] = signals[i] + errors[i]
+        n_samples = len(time_vector)
+        plan = self.execution_plan()
+
+        with stage('sample', n_samples):
+            # Set up output buffers
+            if out is None:
+                signals = np.empty(n_samples)  # Signal samples
+                errors = np.zeros(n_samples) if self.noise_generator is None else np.empty(n_samples)
+                # Without noise, samples are the signals
+                samples = signals if self.noise_generator is None else np.empty(n_samples)
+            else:
+                samples, signals, errors = out
+                if self.noise_generator is None:
+                    errors[...] = 0.
+
+            # Sample non-iterative components
+            self._sample_component('signal', self.signal_generator, plan['signal'], time_vector, signals, chunk_size)
+            self._sample_component('noise', self.noise_generator, plan['noise'], time_vector, errors, chunk_size)
+
+            sample_signal = plan['signal'] == 'iterative'
+            sample_noise = plan['noise'] == 'iterative'
+            if sample_signal or sample_noise:
+                with stage('iterative', n_samples, 'iterative', self._iterative_generator(plan)):
+                    self._sample_iterative(time_vector, samples, signals, errors,
+                                           self.signal_generator if sample_signal else None,
+                                           self.noise_generator if sample_noise else None)
+            elif samples is not signals:
+                np.add(signals, errors, out=samples)
 
         # Return both times and samples, as well as signals and errors
         return samples, signals, errors
+
+    def stream(self, time_vector, chunk_size):
+        """Samples from the specified TimeSeries in chunks of fixed size.
+
+        Stateful generators carry their state across chunk boundaries, so the
+        concatenated chunks form a single series and memory stays bounded by
+        the chunk size. Iterative generators only see the samples and errors
+        of the current chunk.
+
+        Parameters
+        ----------
+        time_vector : numpy array
+            Times at which to generate a sample
+        chunk_size : int
+            Number of points per chunk
+
+        Returns
+        -------
+        generator
+            yields samples, signals, errors tuples for consecutive chunks of time_vector
+
+        Raises
+        ------
+        ValueError
+            if a generator is not streamable, e.g. a GaussianProcess with a dense
+            covariance, which can only be sampled jointly
+
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        for name, generator in (('signal', self.signal_generator), ('noise', self.noise_generator)):
+            if generator is not None and not generator.streamable:
+                raise ValueError("The {} generator {} cannot be streamed".format(name, type(generator).__name__))
+        return self._stream(time_vector, chunk_size)
+
+    def _stream(self, time_vector, chunk_size):
+        """Internal generator yielding the chunks of stream."""
+        for start in range(0, len(time_vector), chunk_size):
+            yield self.sample(time_vector[start:start + chunk_size])
+
+    def write(self, time_vector, out, chunk_size=2**16):
+        """Samples from the specified TimeSeries straight into (on-disk) arrays.
+
+        The series is streamed (see stream), so besides out only one chunk is
+        held in memory. This fills arrays larger than memory, e.g. a np.memmap,
+        a .npy file from timesynth.storage.open_npy or a ChunkedStore.
+
+        Parameters
+        ----------
+        time_vector : numpy array
+            Times at which to generate a sample
+        out : array-like or tuple of three array-likes
+            Array for the samples, or arrays for samples, signals and errors (any
+            of which may be None), supporting assignment to slices
+        chunk_size : int (default 2**16)
+            Number of points per chunk
+
+        Returns
+        -------
+        out
+        """
+        stores = out if isinstance(out, tuple) else (out, None, None)
+        start = 0
+        for chunk in self.stream(time_vector, chunk_size):
+            stop = start + len(chunk[0])
+            for store, values in zip(stores, chunk):
+                if store is not None:
+                    store[start:stop] = values
+            start = stop
+        return out
+
+    def write_batch(self, time_vector, n_series, out, series_per_chunk=64):
+        """Samples independent series straight into (on-disk) arrays.
+
+        Blocks of series_per_chunk series are sampled with sample_batch and
+        written one after the other, so besides out only one block is held in
+        memory.
+
+        Parameters
+        ----------
+        time_vector : numpy array
+            Times at which to generate a sample
+        n_series : int
+            Number of independent series
+        out : array-like or tuple of three array-likes
+            Array of shape (n_series, len(time_vector)) for the samples, or arrays
+            for samples, signals and errors (any of which may be None), supporting
+            assignment to slices over the first axis
+        series_per_chunk : int (default 64)
+            Number of series per block
+
+        Returns
+        -------
+        out
+        """
+        stores = out if isinstance(out, tuple) else (out, None, None)
+        for start in range(0, n_series, series_per_chunk):
+            stop = min(start + series_per_chunk, n_series)
+            for store, values in zip(stores, self.sample_batch(time_vector, stop - start)):
+                if store is not None:
+                    store[start:stop] = values
+        return out
+
+    def sample_batch(self, time_vector, n_series, out=None):
+        """Samples independent series from the specified TimeSeries.
+
+        Vectorized and chunked generators draw all series at once (see the
+        generators' sample_batch); iterative generators are sampled series by
+        series, each from a copy of the generator in its current state (sharing
+        its random_state), so the series are independent and the generator
+        itself is left untouched.
+
+        Parameters
+        ----------
+        time_vector : numpy array
+            Times at which to generate a sample
+        n_series : int
+            Number of independent series
+        out : tuple of three numpy arrays or None (default None)
+            Buffers for samples, signals and errors, each of shape
+            (n_series, len(time_vector)). Fresh arrays are allocated if None.
+
+        Returns
+        -------
+        samples, signals, errors, : tuple (array, array, array)
+            Arrays of shape (n_series, len(time_vector))
+        """
+        shape = (n_series, len(time_vector))
+        n_points = n_series * len(time_vector)
+        plan = self.execution_plan()
+
+        with stage('sample_batch', n_points):
+            # Set up output buffers
+            if out is None:
+                signals = np.empty(shape)
+                errors = np.zeros(shape) if self.noise_generator is None else np.empty(shape)
+                samples = signals if self.noise_generator is None else np.empty(shape)
+            else:
+                samples, signals, errors = out
+                if self.noise_generator is None:
+                    errors[...] = 0.
+
+            sample_signal = plan['signal'] == 'iterative'
+            sample_noise = plan['noise'] == 'iterative'
+            if not sample_signal:
+                with stage('signal', n_points, plan['signal'], self.signal_generator):
+                    signals[...] = self.signal_generator.sample_batch(time_vector, n_series)
+            if self.noise_generator is not None and not sample_noise:
+                with stage('noise', n_points, plan['noise'], self.noise_generator):
+                    errors[...] = self.noise_generator.sample_batch(time_vector, n_series)
+
+            if sample_signal or sample_noise:
+                with stage('iterative', n_points, 'iterative', self._iterative_generator(plan)):
+                    # Every series starts from a copy of the generators in their current state
+                    for k in range(n_series):
+                        self._sample_iterative(time_vector, samples[k], signals[k], errors[k],
+                                               _fresh_copy(self.signal_generator) if sample_signal else None,
+                                               _fresh_copy(self.noise_generator) if sample_noise else None)
+            elif samples is not signals:
+                np.add(signals, errors, out=samples)
+
+        return samples, signals, errors
+
+    def _sample_component(self, name, generator, plan, time_vector, buffer, chunk_size):
+        """Internal method to sample a vectorized or chunked component into buffer."""
+        if plan not in ('vectorized', 'chunked'):
+            return
+        n_samples = len(time_vector)
+        with stage(name, n_samples, plan, generator):
+            if plan == 'vectorized':
+                buffer[:] = generator.sample_vectorized(time_vector)
+            else:
+                step = n_samples if chunk_size is None else chunk_size
+                for start in range(0, n_samples, max(step, 1)):
+                    stop = start + step
+                    buffer[start:stop] = generator.sample_vectorized(time_vector[start:stop])
+
+    def _iterative_generator(self, plan):
+        """Internal method returning the generator sampled step by step, the signal if both are."""
+        return self.signal_generator if plan['signal'] == 'iterative' else self.noise_generator
+
+    def _sample_iterative(self, time_vector, samples, signals, errors, signal_generator, noise_generator):
+        """Internal method to sample the given iterative generators (or None) step by step into the buffers."""
+        # Sample iteratively, while providing access to all previously sampled steps.
+        # Generators may return a scalar or a single-element array, so assign through slices.
+        for i in range(len(time_vector)):
+            # Get time
+            t = time_vector[i]
+            # Sample error
+            if noise_generator is not None:
+                errors[i:i + 1] = noise_generator.sample_next(t, samples[:i - 1], errors[:i - 1])
+
+            # Sample signal
+            if signal_generator is not None:
+                signals[i:i + 1] = signal_generator.sample_next(t, samples[:i - 1], errors[:i - 1])
+
+            # Compound signal and noise
+            samples[i] = signals[i] + errors[i]
+
+
+class MultiChannelTimeSeries(TimeSeries):
+    """A TimeSeries with several channels, sampled as a (n_points, n_channels) block.
+
+    Generators provide the channels in their last axis, e.g. VectorAutoRegressive,
+    CorrelatedGaussianNoise, or Sinusoidal and PseudoPeriodic with one parameter
+    per channel. Single-channel generators are broadcast to all channels. Every
+    component is sampled on its vectorized or chunked execution path (see
+    TimeSeries.execution_plan), so all generators must be vectorizable.
+
+    Parameters
+    ----------
+    signal_generator : Signal object
+        signal object for time series
+    noise_generator : Noise object
+        noise object for time series
+    random_state : None, int, SeedSequence, Generator or RandomState (default None)
+        If given, the signal and noise generators draw from two independent
+        streams spawned from it, replacing the random_state of the generator
+        objects passed in (see TimeSeries)
+
+    """
+
+    def __init__(self, signal_generator, noise_generator=None, random_state=None):
+        super().__init__(signal_generator, noise_generator, random_state=random_state)
+        for generator in (signal_generator, noise_generator):
+            if generator is not None and not generator.vectorizable:
+                raise ValueError("Multichannel series need vectorizable generators")
+
+    def sample(self, time_vector, out=None, chunk_size=None):
+        """Samples from the specified TimeSeries.
+
+        Each component is sampled on its own execution path (see execution_plan).
+
+        Parameters
+        ----------
+        time_vector : numpy array
+            Times at which to generate a sample
+        out : tuple of three numpy arrays or None (default None)
+            Buffers for samples, signals and errors, each of shape
+            (len(time_vector), n_channels). Fresh arrays are allocated if None.
+        chunk_size : int or None (default None)
+            Number of points per call for chunked (stateful) generators.
+            If None, they are sampled in a single call.
+
+        Returns
+        -------
+        samples, signals, errors, : tuple (array, array, array)
+            Arrays of shape (len(time_vector), n_channels)
+        """
+        n_samples = len(time_vector)
+        plan = self.execution_plan()
+
+        with stage('sample', n_samples):
+            if out is not None:
+                samples, signals, errors = out
+                self._sample_component('signal', self.signal_generator, plan['signal'], time_vector, signals,
+                                       chunk_size)
+                if self.noise_generator is None:
+                    errors[...] = 0.
+                else:
+                    self._sample_component('noise', self.noise_generator, plan['noise'], time_vector, errors,
+                                           chunk_size)
+            else:
+                signals = self._sample_channels('signal', self.signal_generator, plan['signal'], time_vector,
+                                                chunk_size)
+                if self.noise_generator is None:
+                    # Without noise, samples are the signals
+                    return signals, signals, np.zeros(signals.shape)
+                errors = self._sample_channels('noise', self.noise_generator, plan['noise'], time_vector,
+                                               chunk_size)
+                signals, errors = self._broadcast_channels(signals, errors)
+                samples = np.empty(signals.shape)
+            if samples is not signals:
+                np.add(signals, errors, out=samples)
+        return samples, signals, errors
+
+    def sample_batch(self, time_vector, n_series, out=None):
+        """Samples independent series from the specified TimeSeries.
+
+        All series are drawn at once with the generators' sample_batch.
+
+        Parameters
+        ----------
+        time_vector : numpy array
+            Times at which to generate a sample
+        n_series : int
+            Number of independent series
+        out : tuple of three numpy arrays or None (default None)
+            Buffers for samples, signals and errors, each of shape
+            (n_series, len(time_vector), n_channels). Fresh arrays are allocated
+            if None.
+
+        Returns
+        -------
+        samples, signals, errors, : tuple (array, array, array)
+            Arrays of shape (n_series, len(time_vector), n_channels)
+        """
+        n_samples = len(time_vector)
+        n_points = n_series * n_samples
+        plan = self.execution_plan()
+
+        with stage('sample_batch', n_points):
+            with stage('signal', n_points, plan['signal'], self.signal_generator):
+                signal_values = self._channels(self.signal_generator.sample_batch(time_vector, n_series),
+                                               (n_series, n_samples))
+            if self.noise_generator is None:
+                error_values = None
+            else:
+                with stage('noise', n_points, plan['noise'], self.noise_generator):
+                    error_values = self._channels(self.noise_generator.sample_batch(time_vector, n_series),
+                                                  (n_series, n_samples))
+
+            if out is not None:
+                samples, signals, errors = out
+                signals[...] = signal_values
+                errors[...] = 0. if error_values is None else error_values
+            elif error_values is None:
+                return signal_values, signal_values, np.zeros(signal_values.shape)
+            else:
+                signals, errors = self._broadcast_channels(signal_values, error_values)
+                samples = np.empty(signals.shape)
+            if samples is not signals:
+                np.add(signals, errors, out=samples)
+        return samples, signals, errors
+
+    def _sample_component(self, name, generator, plan, time_vector, buffer, chunk_size):
+        """Internal method to sample a vectorized or chunked component into the (n_samples, n_channels) buffer."""
+        n_samples = len(time_vector)
+        with stage(name, n_samples, plan, generator):
+            step = n_samples if chunk_size is None or plan == 'vectorized' else chunk_size
+            for start in range(0, n_samples, max(step, 1)):
+                chunk = time_vector[start:start + step]
+                buffer[start:start + step] = self._channels(generator.sample_vectorized(chunk), (len(chunk),))
+
+    def _sample_channels(self, name, generator, plan, time_vector, chunk_size):
+        """Internal method to sample a vectorized or chunked component into a fresh array, without copying
+        the samples of a single call, which generators return as new arrays."""
+        n_samples = len(time_vector)
+        step = n_samples if chunk_size is None or plan == 'vectorized' else max(chunk_size, 1)
+        with stage(name, n_samples, plan, generator):
+            # The first chunk gives the number of channels
+            values = self._channels(generator.sample_vectorized(time_vector[:step]), (min(step, n_samples),))
+            if step >= n_samples:
+                return values
+            buffer = np.empty((n_samples,) + values.shape[1:])
+            buffer[:step] = values
+            for start in range(step, n_samples, step):
+                chunk = time_vector[start:start + step]
+                buffer[start:start + step] = self._channels(generator.sample_vectorized(chunk), (len(chunk),))
+        return buffer
+
+    @staticmethod
+    def _broadcast_channels(signals, errors):
+        """Internal method to broadcast single-channel signals or errors to the channels of the other."""
+        shape = np.broadcast_shapes(signals.shape, errors.shape)
+        if signals.shape != shape:
+            signals = np.broadcast_to(signals, shape).copy()
+        if errors.shape != shape:
+            errors = np.broadcast_to(errors, shape).copy()
+        return signals, errors
+
+    @staticmethod
+    def _channels(values, shape):
+        """Internal method to view single-channel samples of the given shape with a trailing channel axis."""
+        values = np.asarray(values)
+        return values.reshape(shape + (1,)) if values.ndim <= len(shape) else values